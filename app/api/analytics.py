@@ -0,0 +1,74 @@
+from fastapi import APIRouter, HTTPException, Query, Response, Depends
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.api.params import parse_list
+from app.models.analytics import AggregatesResponse
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.core.cache import aggregates_key, get_cache
+from app.core.config import settings
+from app.core.database import get_db
+from datetime import datetime, timezone
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+AGGREGATES_ADAPTER = TypeAdapter(AggregatesResponse)
+
+@router.get("/aggregates", response_model=AggregatesResponse)
+def get_aggregates(
+    group_by: str = Query("sector", description="Company column to group by: sector, industry, exchange, country or currency"),
+    metrics: str = Query(..., description="Comma-separated metric columns, e.g. pe_ratio,roe,net_margin"),
+    stat: str = Query("median", description="Comma-separated statistics: count, mean, median, p25, p75, min, max, stddev"),
+    period_type: str = Query("annual", description="Period type of each company's latest period"),
+    db: Session = Depends(get_db)
+):
+    """
+    Statistics of metrics per sector, exchange, country, industry or currency.
+    
+    Every company contributes its latest period of `period_type`; companies
+    without a value for a metric are left out of that metric's statistics.
+    Computed in the database (percentile_cont on PostgreSQL) so dashboards
+    get a few rows instead of every company's metrics. Responses are cached
+    until the next metrics write.
+    
+    Args:
+        group_by: Company column to group by
+        metrics: Comma-separated metric columns
+        stat: Comma-separated statistics
+        period_type: Period type of the latest periods
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        AggregatesResponse: One entry per group, largest first
+    
+    Raises:
+        HTTPException: 400 if the grouping column, a metric or a statistic is unknown
+    """
+    metric_list = parse_list(metrics)
+    stat_list = parse_list(stat)
+    try:
+        AnalyticsRepository.validate(group_by, metric_list, stat_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Every variant is a field of one cache entry, so a metrics write drops them all
+    cache = get_cache()
+    variant = f"{group_by}:{period_type}:{','.join(metric_list)}:{','.join(stat_list)}"
+    cached = cache.get(aggregates_key(), variant)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    try:
+        groups = AnalyticsRepository(db).aggregates(group_by, metric_list, stat_list, period_type)
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal server error")
+    
+    body = AGGREGATES_ADAPTER.dump_json(AggregatesResponse(
+        group_by=group_by,
+        period_type=period_type,
+        metrics=metric_list,
+        stats=stat_list,
+        generated_at=datetime.now(timezone.utc),
+        groups=groups
+    ))
+    cache.set(aggregates_key(), variant, body, settings.CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json")
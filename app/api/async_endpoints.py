@@ -0,0 +1,223 @@
+"""
+Async versions of the read endpoints, served through AsyncSession.
+
+When DATABASE_ASYNC is enabled, main.py registers these routers before the
+sync ones so they take over the matching GET routes; every other route
+(writes, bulk operations) keeps using the sync routers. ID parameters use
+the :int path convertor so e.g. /financial-metrics/export does not match
+/{metrics_id} here and falls through to the sync router.
+
+Each route only awaits its repository call: parameter parsing, queries and
+response building are shared with the sync routes, so the two modes return
+the same bytes.
+"""
+
+from fastapi import APIRouter, HTTPException, Query, Response, Depends
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.companies import (
+    companies_page_response,
+    companies_with_metrics_page_response,
+    company_batch_response,
+    company_to_json,
+    parse_batch_keys,
+)
+from app.api.financial_metrics import (
+    company_metrics_page_entry,
+    company_metrics_page_field,
+    company_metrics_page_response,
+    metrics_page_response,
+    metrics_row_to_json,
+    metrics_to_json,
+    parse_fields,
+    parse_period_cursor,
+)
+from app.api.params import parse_id_cursor
+from app.models.company import Company, CompanyWithMetrics
+from app.models.financial_metrics import FinancialMetrics
+from app.repositories.async_company_repository import AsyncCompanyRepository
+from app.repositories.async_financial_metrics_repository import AsyncFinancialMetricsRepository
+from app.core.cache import RedisCache, company_key, company_metrics_key, get_cache, ticker_key
+from app.core.config import settings
+from app.core.database import get_async_db
+
+companies_router = APIRouter(prefix="/companies", tags=["companies"])
+financial_metrics_router = APIRouter(prefix="/financial-metrics", tags=["financial-metrics"])
+
+# redis-py blocks for up to its socket timeout on every call while Redis is
+# unreachable, so Redis calls run in the threadpool instead of on the event
+# loop; the in-process caches answer without IO and are called directly
+
+async def _cache_get(key: str, field: str) -> Optional[bytes]:
+    cache = get_cache()
+    if isinstance(cache, RedisCache):
+        return await run_in_threadpool(cache.get, key, field)
+    return cache.get(key, field)
+
+async def _cache_set(key: str, field: str, value: bytes) -> None:
+    cache = get_cache()
+    if isinstance(cache, RedisCache):
+        await run_in_threadpool(cache.set, key, field, value, settings.CACHE_TTL_SECONDS)
+    else:
+        cache.set(key, field, value, settings.CACHE_TTL_SECONDS)
+
+@companies_router.get("/", response_model=List[Company])
+async def list_companies(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
+    tickers: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve a list of companies ordered by ID, or look up companies by
+    `ids`/`tickers`. See companies.list_companies.
+    """
+    repo = AsyncCompanyRepository(db)
+    
+    if ids is not None or tickers is not None:
+        company_ids, company_tickers = parse_batch_keys(ids, tickers)
+        db_companies = await repo.get_by_ids(company_ids) + await repo.get_by_tickers(company_tickers)
+        return company_batch_response(db_companies, company_ids, company_tickers)
+    
+    after_id = parse_id_cursor(cursor)
+    
+    db_companies = await repo.get_all(skip=skip, limit=limit, after_id=after_id)
+    
+    return companies_page_response(db_companies, limit)
+
+@companies_router.get("/with-metrics", response_model=List[CompanyWithMetrics])
+async def list_companies_with_metrics(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    period_type: Optional[str] = None,
+    last_n: int = Query(4, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve a page of companies with their last `last_n` periods embedded.
+    See companies.list_companies_with_metrics.
+    """
+    after_id = parse_id_cursor(cursor)
+    
+    db_companies = await AsyncCompanyRepository(db).get_all(skip=skip, limit=limit, after_id=after_id)
+    db_metrics = await AsyncFinancialMetricsRepository(db).get_recent_by_companies(
+        [company.id for company in db_companies], last_n, period_type=period_type
+    )
+    
+    return companies_with_metrics_page_response(db_companies, db_metrics, limit)
+
+@companies_router.get("/{company_id:int}", response_model=Company)
+async def get_company(company_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve a specific company by ID. See companies.get_company.
+    """
+    cached = await _cache_get(company_key(company_id), "body")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    db_company = await AsyncCompanyRepository(db).get_by_id(company_id)
+    
+    if not db_company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    body = company_to_json(db_company)
+    await _cache_set(company_key(company_id), "body", body)
+    return Response(content=body, media_type="application/json")
+
+@companies_router.get("/ticker/{ticker}", response_model=Company)
+async def get_company_by_ticker(ticker: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve a specific company by its ticker symbol. See companies.get_company_by_ticker.
+    """
+    cached = await _cache_get(ticker_key(ticker), "body")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    db_company = await AsyncCompanyRepository(db).get_by_ticker(ticker)
+    
+    if not db_company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    body = company_to_json(db_company)
+    await _cache_set(ticker_key(ticker), "body", body)
+    return Response(content=body, media_type="application/json")
+
+@financial_metrics_router.get("/", response_model=List[FinancialMetrics])
+async def list_financial_metrics(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve a list of financial metrics ordered by ID. See financial_metrics.list_financial_metrics.
+    """
+    after_id = parse_id_cursor(cursor)
+    selected = parse_fields(fields)
+    
+    db_metrics = await AsyncFinancialMetricsRepository(db).get_all(skip=skip, limit=limit, after_id=after_id, fields=selected)
+    
+    return metrics_page_response(db_metrics, limit, selected)
+
+@financial_metrics_router.get("/latest", response_model=List[FinancialMetrics])
+async def get_latest_financial_metrics(
+    company_id: Optional[List[int]] = Query(None),
+    period_type: str = "annual",
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve the most recent financial metrics of many companies in one query.
+    See financial_metrics.get_latest_financial_metrics.
+    """
+    selected = parse_fields(fields)
+    
+    db_metrics = await AsyncFinancialMetricsRepository(db).get_latest(company_id, period_type=period_type, fields=selected)
+    
+    return Response(content=metrics_to_json(db_metrics, selected), media_type="application/json")
+
+@financial_metrics_router.get("/{metrics_id:int}", response_model=FinancialMetrics)
+async def get_financial_metrics(metrics_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve specific financial metrics by ID. See financial_metrics.get_financial_metrics.
+    """
+    db_metrics = await AsyncFinancialMetricsRepository(db).get_by_id(metrics_id)
+    
+    if not db_metrics:
+        raise HTTPException(status_code=404, detail="Financial metrics not found")
+    
+    return Response(content=metrics_row_to_json(db_metrics), media_type="application/json")
+
+@financial_metrics_router.get("/company/{company_id:int}", response_model=List[FinancialMetrics])
+async def get_company_financial_metrics(
+    company_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieve all financial metrics for a company, newest period first.
+    See financial_metrics.get_company_financial_metrics.
+    """
+    before = parse_period_cursor(cursor)
+    selected = parse_fields(fields)
+    
+    page_field = company_metrics_page_field(skip, limit, cursor, selected)
+    cached = await _cache_get(company_metrics_key(company_id), page_field)
+    if cached is not None:
+        return company_metrics_page_response(cached)
+    
+    db_metrics = await AsyncFinancialMetricsRepository(db).get_by_company(
+        company_id, skip=skip, limit=limit, before=before, fields=selected
+    )
+    
+    entry = company_metrics_page_entry(db_metrics, limit, selected)
+    await _cache_set(company_metrics_key(company_id), page_field, entry)
+    return company_metrics_page_response(entry)
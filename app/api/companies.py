@@ -1,67 +1,310 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
+from typing import Dict, List, Optional, Tuple
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from app.models.company import Company, CompanyCreate, CompanyUpdate
-from app.models.database_models import CompanyDB
+from app.api.financial_metrics import METRICS_LIST_ADAPTER
+from app.api.params import id_page_headers, parse_id_cursor, parse_list
+from app.models.company import Company, CompanyCreate, CompanyUpdate, CompanyBulkResult, CompanyFulltextResponse, CompanySearchResult, CompanyWithMetrics
+from app.models.factors import CompanyFactors
+from app.models.database_models import CompanyDB, FinancialMetricsDB
 from app.repositories.company_repository import CompanyRepository
+from app.repositories.factor_repository import FactorRepository, group_factor_rows
+from app.repositories.financial_metrics_repository import FinancialMetricsRepository
+from app.core.cache import company_key, get_cache, ticker_key
+from app.core.config import settings
 from app.core.database import get_db
+from app.services.company_search import get_search_index
+from app.services.fulltext_search import get_fulltext_index
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
-# Helper function to convert CompanyDB to Company Pydantic model
-def db_to_company_model(db_company: CompanyDB) -> Company:
-    """
-    Convert SQLAlchemy CompanyDB model to Pydantic Company model.
-    This is needed because our API returns Pydantic models, but our repository works with SQLAlchemy models.
-    
-    The conversion handles:
-    - Field mapping between database and API models
-    - Type conversions if needed
-    - Any additional transformations
-    """
-    return Company(
-        id=db_company.id,
-        name=db_company.name,
-        ticker=db_company.ticker,
-        sector=db_company.sector,
-        industry=db_company.industry,
-        description=db_company.description,
-        website=db_company.website,
-        country=db_company.country,
-        exchange=db_company.exchange,
-        currency=db_company.currency,
-        created_at=db_company.created_at,
-        updated_at=db_company.updated_at,
-        is_active=db_company.is_active,
-        last_data_update=db_company.last_data_update# does this have to be done manually? Can it be done automatically by some mapper?
+# Validates and serializes a row or a whole page in Rust, one call each
+COMPANY_ADAPTER = TypeAdapter(Company)
+
+COMPANY_LIST_ADAPTER = TypeAdapter(List[Company])
+
+COMPANY_WITH_METRICS_LIST_ADAPTER = TypeAdapter(List[CompanyWithMetrics])
+
+COMPANY_SEARCH_LIST_ADAPTER = TypeAdapter(List[CompanySearchResult])
+
+COMPANY_FULLTEXT_ADAPTER = TypeAdapter(CompanyFulltextResponse)
+
+COMPANY_FACTORS_LIST_ADAPTER = TypeAdapter(List[CompanyFactors])
+
+def company_to_json(db_company: CompanyDB) -> bytes:
+    """
+    Serialize one CompanyDB row to the JSON body of a Company response.
+    
+    Fields are read straight from the ORM attributes (from_attributes=True)
+    and validated once through COMPANY_ADAPTER; endpoints return the bytes
+    in a Response so FastAPI does not validate the company again through
+    response_model.
+    """
+    return COMPANY_ADAPTER.dump_json(COMPANY_ADAPTER.validate_python(db_company, from_attributes=True))
+
+def companies_to_json(db_companies: List[CompanyDB]) -> bytes:
+    """
+    Serialize a page of CompanyDB rows to JSON bytes.
+    
+    The rows are validated once through COMPANY_LIST_ADAPTER and dumped
+    directly; endpoints return the bytes in a Response so FastAPI does not
+    validate and encode the page a second time through response_model.
+    """
+    return COMPANY_LIST_ADAPTER.dump_json(COMPANY_LIST_ADAPTER.validate_python(db_companies, from_attributes=True))
+
+def companies_with_metrics_to_json(db_companies: List[CompanyDB], db_metrics: List[FinancialMetricsDB]) -> bytes:
+    """
+    Serialize companies with their metrics embedded to JSON bytes.
+    
+    The metrics are passed in separately (loaded in bulk) rather than read
+    from CompanyDB.financial_metrics, which would lazy-load one query per company.
+    """
+    by_company = {}
+    for metrics in METRICS_LIST_ADAPTER.validate_python(db_metrics, from_attributes=True):
+        by_company.setdefault(metrics.company_id, []).append(metrics)
+    
+    # Fields are already validated, so the combined models are only constructed
+    companies = [
+        CompanyWithMetrics.model_construct(**dict(company), financial_metrics=by_company.get(company.id, []))
+        for company in COMPANY_LIST_ADAPTER.validate_python(db_companies, from_attributes=True)
+    ]
+    return COMPANY_WITH_METRICS_LIST_ADAPTER.dump_json(companies)
+
+# Batch lookups report the keys that matched no company in these headers (comma-separated)
+MISSING_IDS_HEADER = "X-Missing-Ids"
+MISSING_TICKERS_HEADER = "X-Missing-Tickers"
+
+def parse_batch_keys(ids: Optional[str], tickers: Optional[str]) -> Tuple[List[int], List[str]]:
+    """
+    Parse the comma-separated ?ids= and ?tickers= values of a batch lookup.
+    
+    Raises:
+        HTTPException: 400 if an ID is not an integer
+    """
+    try:
+        company_ids = [int(value) for value in ids.split(",") if value.strip()] if ids else []
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid company ids")
+    company_tickers = [value.strip() for value in tickers.split(",") if value.strip()] if tickers else []
+    return company_ids, company_tickers
+
+def order_batch(
+    db_companies: List[CompanyDB],
+    ids: List[int],
+    tickers: List[str]
+) -> Tuple[List[CompanyDB], Dict[str, str]]:
+    """
+    Put batch lookup results in request order (IDs first, then tickers),
+    each company once, and build the missing-key headers.
+    """
+    by_id = {company.id: company for company in db_companies}
+    by_ticker = {company.ticker: company for company in db_companies}
+    
+    ordered = {}
+    for company in [by_id.get(company_id) for company_id in ids] + [by_ticker.get(ticker) for ticker in tickers]:
+        if company is not None:
+            ordered.setdefault(company.id, company)
+    
+    headers = {}
+    missing_ids = [str(company_id) for company_id in dict.fromkeys(ids) if company_id not in by_id]
+    missing_tickers = [ticker for ticker in dict.fromkeys(tickers) if ticker not in by_ticker]
+    if missing_ids:
+        headers[MISSING_IDS_HEADER] = ",".join(missing_ids)
+    if missing_tickers:
+        headers[MISSING_TICKERS_HEADER] = ",".join(missing_tickers)
+    return list(ordered.values()), headers
+
+# Response builders shared by the sync routes below and their async twins in async_endpoints
+
+def company_batch_response(db_companies: List[CompanyDB], ids: List[int], tickers: List[str]) -> Response:
+    """
+    Response of an ?ids=/?tickers= lookup: the companies in request order
+    plus the missing-key headers.
+    """
+    db_companies, headers = order_batch(db_companies, ids, tickers)
+    return Response(content=companies_to_json(db_companies), media_type="application/json", headers=headers)
+
+def companies_page_response(db_companies: List[CompanyDB], limit: int) -> Response:
+    """
+    Response of a page of companies ordered by ID, with the next-page cursor header.
+    """
+    return Response(
+        content=companies_to_json(db_companies),
+        media_type="application/json",
+        headers=id_page_headers(db_companies, limit)
+    )
+
+def companies_with_metrics_page_response(db_companies: List[CompanyDB], db_metrics: List[FinancialMetricsDB], limit: int) -> Response:
+    """
+    Response of a page of companies with their metrics embedded, with the next-page cursor header.
+    """
+    return Response(
+        content=companies_with_metrics_to_json(db_companies, db_metrics),
+        media_type="application/json",
+        headers=id_page_headers(db_companies, limit)
     )
 
 @router.get("/", response_model=List[Company])
 def list_companies(
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
+    tickers: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve a list of companies with pagination support.
+    Retrieve a list of companies ordered by ID with pagination support.
+    
+    Pass the X-Next-Cursor header of a page back as `cursor` to get the next
+    page; this stays fast on deep pages, unlike `skip`.
+    
+    With `ids` and/or `tickers` (comma-separated), the endpoint instead looks
+    up exactly those companies in one request and returns them in request
+    order; keys with no company are listed in the X-Missing-Ids and
+    X-Missing-Tickers headers.
     
     Args:
-        skip: Number of records to skip (for pagination)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor returned by the previous page
+        ids: Comma-separated company IDs to look up
+        tickers: Comma-separated ticker symbols to look up
         db: Database session injected by FastAPI dependency
         
     Returns:
         List[Company]: List of companies
+        
+    Raises:
+        HTTPException: 400 if the cursor or an ID is invalid
     """
     # Create repository instance with the database session
     repo = CompanyRepository(db)
     
+    if ids is not None or tickers is not None:
+        company_ids, company_tickers = parse_batch_keys(ids, tickers)
+        db_companies = repo.get_by_ids(company_ids) + repo.get_by_tickers(company_tickers)
+        return company_batch_response(db_companies, company_ids, company_tickers)
+    
+    after_id = parse_id_cursor(cursor)
+    
     # Get companies from database using repository
-    db_companies = repo.get_all(skip=skip, limit=limit)
+    db_companies = repo.get_all(skip=skip, limit=limit, after_id=after_id)
+    
+    # Convert database models straight to the JSON body
+    return companies_page_response(db_companies, limit)
+
+@router.get("/with-metrics", response_model=List[CompanyWithMetrics])
+def list_companies_with_metrics(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    period_type: Optional[str] = None,
+    last_n: int = Query(4, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve a page of companies with their last `last_n` periods embedded.
+    
+    The page costs two queries whatever its size: one for the companies and
+    one windowed query for the metrics of all of them.
+    
+    Args:
+        skip: Number of records to skip (ignored when cursor is given)
+        limit: Maximum number of companies to return
+        cursor: Opaque cursor returned by the previous page
+        period_type: Only embed periods of this type (all types if omitted)
+        last_n: Number of most recent periods to embed per company
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        List[CompanyWithMetrics]: Companies ordered by ID with their metrics
+        
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    after_id = parse_id_cursor(cursor)
+    
+    db_companies = CompanyRepository(db).get_all(skip=skip, limit=limit, after_id=after_id)
+    db_metrics = FinancialMetricsRepository(db).get_recent_by_companies(
+        [company.id for company in db_companies], last_n, period_type=period_type
+    )
+    
+    return companies_with_metrics_page_response(db_companies, db_metrics, limit)
+
+@router.get("/search", response_model=List[CompanySearchResult])
+def search_companies(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Type-ahead search over company tickers and names.
+    
+    Matching ignores case, punctuation and diacritics ("zaklad" finds
+    "Zakład"), and results are ranked: exact ticker, ticker prefix, name
+    prefix, word prefix, substring, then close misspellings. Served from the
+    in-memory index, or from PostgreSQL with COMPANY_SEARCH_BACKEND=postgres.
+    
+    Args:
+        q: Partial ticker or name
+        limit: Maximum number of results
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        List[CompanySearchResult]: Best matches first
+    """
+    if settings.COMPANY_SEARCH_BACKEND == "postgres":
+        hits = CompanyRepository(db).search(q, limit)
+    else:
+        hits = get_search_index().search(q, limit)
+    return Response(
+        content=COMPANY_SEARCH_LIST_ADAPTER.dump_json(COMPANY_SEARCH_LIST_ADAPTER.validate_python(hits, from_attributes=True)),
+        media_type="application/json"
+    )
+
+@router.get("/fulltext", response_model=CompanyFulltextResponse)
+def fulltext_search_companies(
+    q: str = Query(..., min_length=1, max_length=200),
+    sector: Optional[str] = Query(None, description="Only companies in this sector"),
+    exchange: Optional[str] = Query(None, description="Only companies listed on this exchange"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000)
+):
+    """
+    Full-text search over company descriptions, names and tickers.
+    
+    Every word of the query must match (case and diacritics are ignored);
+    results are ranked by relevance, with name and ticker matches above
+    description matches. Facets count the matching companies per sector and
+    exchange. Served by Elasticsearch when ELASTICSEARCH_URL is set, by the
+    in-process index otherwise.
+    
+    Args:
+        q: Search words
+        sector: Sector filter
+        exchange: Exchange filter
+        limit: Page size
+        offset: Number of matches to skip
+    
+    Returns:
+        CompanyFulltextResponse: Total, the page of hits and the facets
     
-    # Convert database models to API models
-    return [db_to_company_model(company) for company in db_companies]
+    Raises:
+        HTTPException: 500 if the search backend fails
+    """
+    try:
+        result = get_fulltext_index().search(q, sector=sector, exchange=exchange, limit=limit, offset=offset)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    return Response(
+        content=COMPANY_FULLTEXT_ADAPTER.dump_json(COMPANY_FULLTEXT_ADAPTER.validate_python(result, from_attributes=True)),
+        media_type="application/json"
+    )
 
 @router.get("/{company_id}", response_model=Company)
 def get_company(company_id: int, db: Session = Depends(get_db)):
@@ -78,13 +321,88 @@ def get_company(company_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: 404 if company not found
     """
+    # Serve the cached JSON body if a previous request already built it
+    cache = get_cache()
+    cached = cache.get(company_key(company_id), "body")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     repo = CompanyRepository(db)
     db_company = repo.get_by_id(company_id)
     
     if not db_company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    return db_to_company_model(db_company)
+    body = company_to_json(db_company)
+    cache.set(company_key(company_id), "body", body, settings.CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json")
+
+@router.get("/{company_id}/factors", response_model=List[CompanyFactors])
+def get_company_factors(
+    company_id: int,
+    period_type: Optional[str] = Query(None, description="Only periods of this type"),
+    metrics: Optional[str] = Query(None, description="Comma-separated metrics; all scored metrics if omitted"),
+    db: Session = Depends(get_db)
+):
+    """
+    Factor scores of a company: for every scored period, the percentile
+    rank and z-score of each ratio within the company's sector.
+    
+    Args:
+        company_id: The unique identifier of the company
+        period_type: Period type filter
+        metrics: Comma-separated metrics to return
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        List[CompanyFactors]: One entry per period, newest first
+    
+    Raises:
+        HTTPException: 404 if company not found, 400 if a metric is not scored
+    """
+    if not CompanyRepository(db).get_by_id(company_id):
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    try:
+        rows = FactorRepository(db).get_by_company(
+            company_id, period_type=period_type, metrics=parse_list(metrics) if metrics else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(
+        content=COMPANY_FACTORS_LIST_ADAPTER.dump_json(list(group_factor_rows(rows))),
+        media_type="application/json"
+    )
+
+@router.get("/ticker/{ticker}", response_model=Company)
+def get_company_by_ticker(ticker: str, db: Session = Depends(get_db)):
+    """
+    Retrieve a specific company by its ticker symbol.
+    
+    Args:
+        ticker: The stock ticker symbol
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        Company: The company data
+        
+    Raises:
+        HTTPException: 404 if company not found
+    """
+    cache = get_cache()
+    cached = cache.get(ticker_key(ticker), "body")
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    repo = CompanyRepository(db)
+    db_company = repo.get_by_ticker(ticker)
+    
+    if not db_company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    body = company_to_json(db_company)
+    cache.set(ticker_key(ticker), "body", body, settings.CACHE_TTL_SECONDS)
+    return Response(content=body, media_type="application/json")
 
 @router.post("/", response_model=Company, status_code=status.HTTP_201_CREATED)
 def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
@@ -106,7 +424,7 @@ def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
     try:
         # Create company using repository
         db_company = repo.create(company)
-        return db_to_company_model(db_company)
+        return Response(content=company_to_json(db_company), status_code=status.HTTP_201_CREATED, media_type="application/json")
     except ValueError as e:
         # Handle business logic errors (e.g., duplicate name/ticker)
         raise HTTPException(status_code=400, detail=str(e))
@@ -114,6 +432,33 @@ def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
         # Handle unexpected errors
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/bulk", response_model=CompanyBulkResult)
+def bulk_create_companies(companies: List[CompanyCreate], db: Session = Depends(get_db)):
+    """
+    Create many companies in one request and one database transaction.
+    
+    Rows whose ticker already exists (in the table or earlier in the batch)
+    are skipped and reported in `conflicts` instead of failing the whole batch.
+    
+    Args:
+        companies: List of company data from request body
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        CompanyBulkResult: IDs of created companies and per-row conflicts
+        
+    Raises:
+        HTTPException: 409 if the batch hit a constraint violation while inserting
+    """
+    repo = CompanyRepository(db)
+    
+    try:
+        return repo.bulk_create(companies)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.put("/{company_id}", response_model=Company)
 def update_company(company_id: int, company: CompanyUpdate, db: Session = Depends(get_db)):
     """
@@ -139,7 +484,7 @@ def update_company(company_id: int, company: CompanyUpdate, db: Session = Depend
         if not db_company:
             raise HTTPException(status_code=404, detail="Company not found")
         
-        return db_to_company_model(db_company)
+        return Response(content=company_to_json(db_company), media_type="application/json")
     except ValueError as e:
         # Handle business logic errors
         raise HTTPException(status_code=400, detail=str(e))
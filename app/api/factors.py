@@ -0,0 +1,84 @@
+from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+from sqlalchemy.orm import Session
+from app.api.params import parse_list
+from app.models.factors import CompanyFactors, FactorRecomputeResult
+from app.repositories.factor_repository import FactorRepository, group_factor_rows
+from app.services.factor_engine import FactorEngine
+from app.core.config import settings
+from app.core.database import get_db
+from datetime import date
+
+router = APIRouter(prefix="/factors", tags=["factors"])
+
+def stream_company_factors(items: Iterator[CompanyFactors]) -> Iterator[str]:
+    """
+    Serialize CompanyFactors into a JSON array while rows are read from the cursor,
+    BULK_BATCH_SIZE companies per chunk.
+    """
+    yield "["
+    chunk = []
+    for index, item in enumerate(items):
+        chunk.append(("," if index else "") + item.model_dump_json())
+        if len(chunk) == settings.BULK_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    yield "".join(chunk) + "]"
+
+@router.get("", response_model=List[CompanyFactors])
+def get_factors_by_period(
+    period_end: date = Query(..., description="Day the scored periods end on (YYYY-MM-DD)"),
+    period_type: Optional[str] = Query(None, description="Only periods of this type"),
+    sector: Optional[str] = Query(None, description="Only companies of this sector"),
+    metrics: Optional[str] = Query(None, description="Comma-separated metrics; all scored metrics if omitted"),
+    db: Session = Depends(get_db)
+):
+    """
+    Factor scores of every company for the periods ending on a day.
+    
+    Each company's ratios come with their percentile rank and z-score
+    within the company's sector for that period, as computed by
+    `python -m app.services.factor_engine` (or POST /factors/recompute).
+    The result is streamed as it is read.
+    
+    Args:
+        period_end: Day the periods end on
+        period_type: Period type filter
+        sector: Sector filter
+        metrics: Comma-separated metrics to return
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        StreamingResponse: JSON array of CompanyFactors, by company ID
+    
+    Raises:
+        HTTPException: 400 if a metric is not scored
+    """
+    try:
+        rows = FactorRepository(db).iter_by_period(
+            period_end, period_type=period_type, sector=sector, metrics=parse_list(metrics) if metrics else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(stream_company_factors(group_factor_rows(rows)), media_type="application/json")
+
+@router.post("/recompute", response_model=FactorRecomputeResult)
+def recompute_factors(
+    period_type: Optional[str] = Query(None, description="Only periods of this type"),
+    period_end: Optional[date] = Query(None, description="Only periods ending on this day"),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute and store the sector percentile ranks and z-scores of the
+    selected periods (all periods if no filter is given).
+    
+    Args:
+        period_type: Period type filter
+        period_end: Period end filter
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        FactorRecomputeResult: Periods, rows and scores written
+    """
+    return FactorEngine(db).recompute(period_type, period_end)
@@ -1,69 +1,291 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
+from fastapi.responses import StreamingResponse
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple
+from pydantic import ConfigDict, TypeAdapter, create_model
 from sqlalchemy.orm import Session
-from app.models.financial_metrics import FinancialMetrics, FinancialMetricsCreate, FinancialMetricsUpdate
+from app.api.params import id_page_headers, parse_id_cursor
+from app.models.financial_metrics import (
+    FinancialMetrics,
+    FinancialMetricsCreate,
+    FinancialMetricsUpdate,
+    FinancialMetricsBulkUpsertResult,
+    FinancialMetricsBatchItem,
+    FinancialMetricsBatchRequest,
+    FinancialMetricsBatchResult,
+    RatioRecomputeResult,
+)
 from app.models.database_models import FinancialMetricsDB
-from app.repositories.financial_metrics_repository import FinancialMetricsRepository
+from app.repositories.financial_metrics_repository import FinancialMetricsRepository, PROJECTION_KEY_COLUMNS
+from app.services.financial_ratios import FinancialRatioService
+from app.services.metrics_export import EXPORT_MEDIA_TYPES, iter_csv, iter_ndjson, iter_parquet, parquet_available
+from app.core.cache import company_metrics_key, get_cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/financial-metrics", tags=["financial-metrics"])
 
-# Helper function to convert FinancialMetricsDB to FinancialMetrics Pydantic model
-def db_to_metrics_model(db_metrics: FinancialMetricsDB) -> FinancialMetrics:
-    """
-    Convert SQLAlchemy FinancialMetricsDB model to Pydantic FinancialMetrics model.
-    This handles the conversion between database and API models.
-    """
-    return FinancialMetrics(
-        id=db_metrics.id,
-        company_id=db_metrics.company_id,
-        period_end=db_metrics.period_end,
-        period_type=db_metrics.period_type,
-        revenue=db_metrics.revenue,
-        net_income=db_metrics.net_income,
-        total_assets=db_metrics.total_assets,
-        total_liabilities=db_metrics.total_liabilities,
-        total_equity=db_metrics.total_equity,
-        roe=db_metrics.roe,
-        roa=db_metrics.roa,
-        gross_margin=db_metrics.gross_margin,
-        net_margin=db_metrics.net_margin,
-        current_ratio=db_metrics.current_ratio,
-        quick_ratio=db_metrics.quick_ratio,
-        debt_to_equity=db_metrics.debt_to_equity,
-        debt_to_assets=db_metrics.debt_to_assets,
-        asset_turnover=db_metrics.asset_turnover,
-        inventory_turnover=db_metrics.inventory_turnover,
-        revenue_growth=db_metrics.revenue_growth,
-        net_income_growth=db_metrics.net_income_growth,
-        pe_ratio=db_metrics.pe_ratio,
-        pb_ratio=db_metrics.pb_ratio,
-        ev_ebitda=db_metrics.ev_ebitda,
-        created_at=db_metrics.created_at,
-        updated_at=db_metrics.updated_at
+# Validates and serializes a row or a whole page in Rust, one call each
+METRICS_ADAPTER = TypeAdapter(FinancialMetrics)
+
+METRICS_LIST_ADAPTER = TypeAdapter(List[FinancialMetrics])
+
+def metrics_row_to_json(db_metrics: FinancialMetricsDB) -> bytes:
+    """
+    Serialize one FinancialMetricsDB row to the JSON body of a FinancialMetrics response.
+    
+    Fields are read straight from the ORM attributes (from_attributes=True)
+    and validated once through METRICS_ADAPTER, as in metrics_to_json.
+    """
+    return METRICS_ADAPTER.dump_json(METRICS_ADAPTER.validate_python(db_metrics, from_attributes=True))
+
+# Fields that can be requested with ?fields=: response fields stored as table columns
+SELECTABLE_FIELDS = tuple(
+    name for name in FinancialMetrics.model_fields
+    if name in FinancialMetricsDB.__table__.columns
+)
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ?fields= value into column names.
+    
+    Returns:
+        Tuple of field names in request order, or None to return every field
+        
+    Raises:
+        HTTPException: 400 if a name is not a selectable field
+    """
+    if fields is None:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in SELECTABLE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+@lru_cache(maxsize=256)
+def projected_list_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    """
+    TypeAdapter for a list of FinancialMetrics reduced to the key columns
+    plus `fields`, reusing the field definitions (types, Decimal encoding)
+    of the full model.
+    """
+    names = dict.fromkeys(PROJECTION_KEY_COLUMNS + fields)
+    model = create_model(
+        "FinancialMetricsFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (FinancialMetrics.model_fields[name].annotation, FinancialMetrics.model_fields[name]) for name in names}
     )
+    return TypeAdapter(List[model])
+
+def metrics_to_json(db_metrics: List[FinancialMetricsDB], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Serialize a page of FinancialMetricsDB rows to JSON bytes.
+    
+    The rows are validated once through METRICS_LIST_ADAPTER and dumped
+    directly; endpoints return the bytes in a Response so FastAPI does not
+    validate and encode the page a second time through response_model.
+    With `fields`, the rows are the projected rows of a fields= query and
+    only those columns (plus the key columns) are serialized.
+    """
+    adapter = METRICS_LIST_ADAPTER if fields is None else projected_list_adapter(fields)
+    return adapter.dump_json(adapter.validate_python(db_metrics, from_attributes=True))
+
+# Response builders shared by the sync routes below and their async twins in async_endpoints
+
+def metrics_page_response(db_metrics: List[FinancialMetricsDB], limit: int, fields: Optional[Tuple[str, ...]] = None) -> Response:
+    """
+    Response of a page of financial metrics ordered by ID, with the next-page cursor header.
+    """
+    return Response(
+        content=metrics_to_json(db_metrics, fields),
+        media_type="application/json",
+        headers=id_page_headers(db_metrics, limit)
+    )
+
+def parse_period_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode the ?cursor= of a company's metrics, which are ordered by
+    (period_end, id) descending, into the last position already seen.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        position = decode_cursor(cursor)
+        return (datetime.fromisoformat(position["period_end"]), int(position["id"])) if position else None
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+# Every page of a company's metrics is a field of the same cache entry, so one
+# write drops them all. The entry stores "<next cursor>\n<JSON body>".
+
+def company_metrics_page_field(skip: int, limit: int, cursor: Optional[str], fields: Optional[Tuple[str, ...]]) -> str:
+    """
+    Cache field of one page of a company's metrics.
+    """
+    return f"{skip}:{limit}:{cursor or ''}:{','.join(fields) if fields is not None else '*'}"
+
+def company_metrics_page_entry(db_metrics: List[FinancialMetricsDB], limit: int, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """
+    Serialize a page of a company's metrics to its cache entry.
+    """
+    next_cursor = ""
+    if db_metrics and len(db_metrics) == limit:
+        last = db_metrics[-1]
+        next_cursor = encode_cursor({"period_end": last.period_end.isoformat(), "id": last.id})
+    return next_cursor.encode("ascii") + b"\n" + metrics_to_json(db_metrics, fields)
+
+def company_metrics_page_response(entry: bytes) -> Response:
+    """
+    Response of a page of a company's metrics from its cache entry.
+    """
+    next_cursor, body = entry.split(b"\n", 1)
+    headers = {NEXT_CURSOR_HEADER: next_cursor.decode("ascii")} if next_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/", response_model=List[FinancialMetrics])
 def list_financial_metrics(
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve a list of financial metrics with pagination support.
+    Retrieve a list of financial metrics ordered by ID with pagination support.
+    
+    Pass the X-Next-Cursor header of a page back as `cursor` to get the next page.
+    Pass `fields` (e.g. "roe,roa,pe_ratio") to select only those columns;
+    id, company_id, period_end and period_type are always returned.
     
     Args:
-        skip: Number of records to skip (for pagination)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor returned by the previous page
+        fields: Comma-separated list of fields to return
         db: Database session injected by FastAPI dependency
         
     Returns:
         List[FinancialMetrics]: List of financial metrics
+        
+    Raises:
+        HTTPException: 400 if the cursor or a field name is invalid
+    """
+    after_id = parse_id_cursor(cursor)
+    selected = parse_fields(fields)
+    
+    repo = FinancialMetricsRepository(db)
+    db_metrics = repo.get_all(skip=skip, limit=limit, after_id=after_id, fields=selected)
+    
+    return metrics_page_response(db_metrics, limit, selected)
+
+@router.get("/latest", response_model=List[FinancialMetrics])
+def get_latest_financial_metrics(
+    company_id: Optional[List[int]] = Query(None),
+    period_type: str = "annual",
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve the most recent financial metrics of many companies in one query,
+    e.g. to load a dashboard.
+    
+    Args:
+        company_id: Companies to return (repeatable); every company if omitted
+        period_type: Period type whose latest row is returned
+        fields: Comma-separated list of fields to return
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        List[FinancialMetrics]: One row per company that has metrics, ordered by company ID
+        
+    Raises:
+        HTTPException: 400 if a field name is invalid
     """
+    selected = parse_fields(fields)
+    
     repo = FinancialMetricsRepository(db)
-    db_metrics = repo.get_all(skip=skip, limit=limit)
-    return [db_to_metrics_model(metrics) for metrics in db_metrics]
+    db_metrics = repo.get_latest(company_id, period_type=period_type, fields=selected)
+    
+    return Response(content=metrics_to_json(db_metrics, selected), media_type="application/json")
+
+@router.post("/latest/rebuild")
+def rebuild_latest_financial_metrics(db: Session = Depends(get_db)):
+    """
+    Rebuild the latest-metrics snapshot from the financial_metrics table.
+    
+    Args:
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        dict: Number of snapshot rows written
+        
+    Raises:
+        HTTPException: 409 if the rebuild hit a constraint violation
+    """
+    repo = FinancialMetricsRepository(db)
+    
+    try:
+        return {"rows": repo.rebuild_latest()}
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/export")
+def export_financial_metrics(
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    company_id: Optional[List[int]] = Query(None),
+    period_type: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Export financial metrics as one streamed file instead of paging through
+    the list endpoint. Rows are ordered by ID and read from a server-side
+    cursor while the response is being sent, so memory use does not grow
+    with the size of the export.
+    
+    Args:
+        format: ndjson, csv or parquet
+        company_id: Only export these companies (repeatable); all if omitted
+        period_type: Only export periods of this type
+        start: First period_end to include
+        end: Last period_end to include
+        fields: Comma-separated list of fields to export; all columns if omitted
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        StreamingResponse: The export file
+        
+    Raises:
+        HTTPException: 400 if a field name is invalid or parquet is requested without pyarrow installed
+    """
+    selected = parse_fields(fields)
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+    
+    repo = FinancialMetricsRepository(db)
+    columns, batches = repo.export(company_ids=company_id, period_type=period_type, start=start, end=end, fields=selected)
+    names = [column.key for column in columns]
+    
+    if format == "ndjson":
+        body = iter_ndjson(names, batches)
+    elif format == "csv":
+        body = iter_csv(names, batches)
+    else:
+        body = iter_parquet(names, [column.type for column in columns], batches)
+    
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="financial_metrics.{format}"'}
+    )
 
 @router.get("/{metrics_id}", response_model=FinancialMetrics)
 def get_financial_metrics(metrics_id: int, db: Session = Depends(get_db)):
@@ -86,30 +308,53 @@ def get_financial_metrics(metrics_id: int, db: Session = Depends(get_db)):
     if not db_metrics:
         raise HTTPException(status_code=404, detail="Financial metrics not found")
     
-    return db_to_metrics_model(db_metrics)
+    return Response(content=metrics_row_to_json(db_metrics), media_type="application/json")
 
 @router.get("/company/{company_id}", response_model=List[FinancialMetrics])
 def get_company_financial_metrics(
     company_id: int, 
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all financial metrics for a specific company.
+    Retrieve all financial metrics for a specific company, newest period first.
+    Pages are cached until the company's metrics are next written.
+    
+    Pass the X-Next-Cursor header of a page back as `cursor` to get the next page.
+    Pass `fields` to select only those columns, as in list_financial_metrics.
     
     Args:
         company_id: The ID of the company
-        skip: Number of records to skip (for pagination)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor returned by the previous page
+        fields: Comma-separated list of fields to return
         db: Database session injected by FastAPI dependency
         
     Returns:
         List[FinancialMetrics]: List of financial metrics for the company
+        
+    Raises:
+        HTTPException: 400 if the cursor or a field name is invalid
     """
+    before = parse_period_cursor(cursor)
+    selected = parse_fields(fields)
+    
+    cache = get_cache()
+    page_field = company_metrics_page_field(skip, limit, cursor, selected)
+    cached = cache.get(company_metrics_key(company_id), page_field)
+    if cached is not None:
+        return company_metrics_page_response(cached)
+    
     repo = FinancialMetricsRepository(db)
-    db_metrics = repo.get_by_company(company_id, skip=skip, limit=limit)
-    return [db_to_metrics_model(metrics) for metrics in db_metrics]
+    db_metrics = repo.get_by_company(company_id, skip=skip, limit=limit, before=before, fields=selected)
+    
+    entry = company_metrics_page_entry(db_metrics, limit, selected)
+    cache.set(company_metrics_key(company_id), page_field, entry, settings.CACHE_TTL_SECONDS)
+    return company_metrics_page_response(entry)
 
 @router.post("/", response_model=FinancialMetrics, status_code=status.HTTP_201_CREATED)
 def create_financial_metrics(metrics: FinancialMetricsCreate, db: Session = Depends(get_db)):
@@ -130,12 +375,101 @@ def create_financial_metrics(metrics: FinancialMetricsCreate, db: Session = Depe
     
     try:
         db_metrics = repo.create(metrics)
-        return db_to_metrics_model(db_metrics)
+        return Response(content=metrics_row_to_json(db_metrics), status_code=status.HTTP_201_CREATED, media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.post("/bulk-upsert", response_model=FinancialMetricsBulkUpsertResult)
+def bulk_upsert_financial_metrics(metrics: List[FinancialMetricsCreate], db: Session = Depends(get_db)):
+    """
+    Insert or update many financial metrics rows in one request.
+    
+    Rows are matched on (company_id, period_end, period_type). Existing rows
+    are overwritten with the new values instead of failing as duplicates,
+    which makes re-importing a full earnings season idempotent.
+    
+    Args:
+        metrics: List of financial metrics data from request body
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        FinancialMetricsBulkUpsertResult: inserted/updated/unchanged counts
+        
+    Raises:
+        HTTPException: 409 if the batch hit a constraint violation
+    """
+    repo = FinancialMetricsRepository(db)
+    
+    try:
+        return repo.bulk_upsert(metrics)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/batch", response_model=FinancialMetricsBatchResult)
+def batch_financial_metrics(request: FinancialMetricsBatchRequest, db: Session = Depends(get_db)):
+    """
+    Retrieve the financial metrics of many companies in one request,
+    e.g. every holding of a portfolio.
+    
+    Items are returned in the order of `company_ids` (each company once);
+    IDs that match no company are listed in `missing_company_ids`.
+    
+    Args:
+        request: Company IDs and optional period filters
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        FinancialMetricsBatchResult: Metrics per company and missing IDs
+    """
+    repo = FinancialMetricsRepository(db)
+    
+    company_ids = list(dict.fromkeys(request.company_ids))
+    known_ids = repo.existing_company_ids(company_ids)
+    if request.latest_only:
+        db_metrics = repo.get_latest(known_ids, period_type=request.period_type or "annual")
+    else:
+        db_metrics = repo.get_by_companies(list(known_ids), period_type=request.period_type)
+    
+    by_company = {company_id: [] for company_id in known_ids}
+    for metrics in METRICS_LIST_ADAPTER.validate_python(db_metrics, from_attributes=True):
+        by_company[metrics.company_id].append(metrics)
+    
+    result = FinancialMetricsBatchResult(
+        items=[
+            FinancialMetricsBatchItem(company_id=company_id, metrics=by_company[company_id])
+            for company_id in company_ids if company_id in known_ids
+        ],
+        missing_company_ids=[company_id for company_id in company_ids if company_id not in known_ids]
+    )
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+@router.post("/recompute-ratios", response_model=RatioRecomputeResult)
+def recompute_financial_ratios(company_id: Optional[List[int]] = Query(None), db: Session = Depends(get_db)):
+    """
+    Derive ROE, ROA, net margin, debt ratios and YoY growth from the stored
+    fundamentals and update the rows whose values changed.
+    
+    Args:
+        company_id: Companies to recompute (repeatable); all companies if omitted
+        db: Database session injected by FastAPI dependency
+        
+    Returns:
+        RatioRecomputeResult: Number of rows scanned and updated
+        
+    Raises:
+        HTTPException: 409 if the update hit a constraint violation
+    """
+    try:
+        return FinancialRatioService(db).recompute(company_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.put("/{metrics_id}", response_model=FinancialMetrics)
 def update_financial_metrics(metrics_id: int, metrics: FinancialMetricsUpdate, db: Session = Depends(get_db)):
     """
@@ -160,7 +494,7 @@ def update_financial_metrics(metrics_id: int, metrics: FinancialMetricsUpdate, d
         if not db_metrics:
             raise HTTPException(status_code=404, detail="Financial metrics not found")
         
-        return db_to_metrics_model(db_metrics)
+        return Response(content=metrics_row_to_json(db_metrics), media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Optional
+from sqlalchemy.orm import Session
+from app.models.historical_data import HistoricalData, HistoricalDataBase, HistoricalDataCreate
+from app.models.database_models import HistoricalDataDB
+from app.repositories.company_repository import CompanyRepository
+from app.repositories.historical_data_repository import HistoricalDataRepository
+from app.core.database import get_db
+from datetime import date, datetime, time, timezone
+
+router = APIRouter(prefix="/companies", tags=["historical-data"])
+
+def stream_json_array(bars: Iterator[HistoricalDataDB]) -> Iterator[str]:
+    """
+    Serialize bars one by one into a JSON array, so the response body is
+    produced while rows are still being read from the database cursor.
+    """
+    yield "["
+    first = True
+    for bar in bars:
+        if not first:
+            yield ","
+        yield HistoricalData.model_validate(bar).model_dump_json()
+        first = False
+    yield "]"
+
+@router.get("/{company_id}/prices", response_model=List[HistoricalData])
+def get_company_prices(
+    company_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream daily bars for a company in a date range, oldest first.
+    
+    Args:
+        company_id: The ID of the company
+        start: First day to include, e.g. 2024-01-02 (optional)
+        end: Last day to include, the whole day (optional)
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        StreamingResponse: JSON array of HistoricalData
+    
+    Raises:
+        HTTPException: 404 if company not found
+    """
+    if not CompanyRepository(db).get_by_id(company_id):
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    # Whole UTC days, whatever time of day the bars are stamped with
+    start_at = datetime.combine(start, time.min, tzinfo=timezone.utc) if start else None
+    end_at = datetime.combine(end, time.max, tzinfo=timezone.utc) if end else None
+    
+    repo = HistoricalDataRepository(db)
+    return StreamingResponse(
+        stream_json_array(repo.iter_range(company_id, start=start_at, end=end_at)),
+        media_type="application/json"
+    )
+
+@router.post("/{company_id}/prices", status_code=status.HTTP_201_CREATED)
+def append_company_prices(company_id: int, bars: List[HistoricalDataBase], db: Session = Depends(get_db)):
+    """
+    Append daily bars for a company. Dates that are already stored are skipped.
+    
+    Args:
+        company_id: The ID of the company
+        bars: Bars from request body
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        dict: Number of bars inserted and skipped
+    
+    Raises:
+        HTTPException: 404 if company not found, 409 on constraint violation
+    """
+    if not CompanyRepository(db).get_by_id(company_id):
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    repo = HistoricalDataRepository(db)
+    
+    try:
+        inserted = repo.bulk_append([
+            HistoricalDataCreate(company_id=company_id, **bar.model_dump()) for bar in bars
+        ])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return {"inserted": inserted, "skipped": len(bars) - inserted}
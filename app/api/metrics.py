@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from typing import Dict
+from app.core.pool_metrics import pool_status
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/db-pool")
+def get_db_pool_metrics() -> Dict:
+    """
+    Report connection pool usage for this worker process.
+    
+    Gauges (size, checked_out, overflow) show the pool right now; counters
+    (checkouts, timeouts, wait_*) accumulate since the process started.
+    A growing wait_max_ms or any timeouts mean DB_POOL_SIZE/DB_MAX_OVERFLOW
+    are too small for the request concurrency of the worker.
+    
+    Returns:
+        dict: Worker pid and stats per engine ("sync", and "async" when enabled)
+    """
+    return pool_status()
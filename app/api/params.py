@@ -0,0 +1,33 @@
+"""Parsing helpers for query parameters shared by the API routers."""
+
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+
+def parse_list(value: str) -> List[str]:
+    """Split a comma-separated query parameter, dropping blanks and duplicates."""
+    return list(dict.fromkeys(item.strip() for item in value.split(",") if item.strip()))
+
+
+def parse_id_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Decode the ?cursor= of a list ordered by ID into the last ID already seen.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        position = decode_cursor(cursor)
+        return int(position["id"]) if position else None
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def id_page_headers(rows: Sequence, limit: int) -> Optional[Dict[str, str]]:
+    """X-Next-Cursor header of a page of a list ordered by ID; None on the last page."""
+    if rows and len(rows) == limit:
+        return {NEXT_CURSOR_HEADER: encode_cursor({"id": rows[-1].id})}
+    return None
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+from app.models.refresh import RefreshStatus
+from app.repositories.refresh_repository import RefreshRepository
+from app.core.database import get_db
+
+router = APIRouter(prefix="/refresh", tags=["refresh"])
+
+@router.get("/status", response_model=RefreshStatus)
+def get_refresh_status(db: Session = Depends(get_db)):
+    """
+    Report the refresh backlog and lag of the data collectors.
+    
+    For every data type and priority tier: how many active companies are
+    due (stale), never refreshed or failing, the age of the oldest refresh
+    and the estimated fetch time of the backlog. Inactive companies are
+    not counted.
+    
+    Args:
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        RefreshStatus: Backlog and lag per data type and tier
+    
+    Raises:
+        HTTPException: 500 if the status cannot be read
+    """
+    try:
+        return RefreshRepository(db).status()
+    except Exception:
+        raise HTTPException(status_code=500, detail="Internal server error")
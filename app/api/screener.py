@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterator, List
+from sqlalchemy.orm import Session
+from app.models.screener import ScreenerRequest, ScreenerRow
+from app.repositories.financial_metrics_repository import METRIC_COLUMNS
+from app.repositories.screener_repository import RESULT_COMPANY_COLUMNS, ScreenerRepository
+from app.core.config import settings
+from app.core.database import get_db
+
+router = APIRouter(prefix="/screener", tags=["screener"])
+
+def row_to_screener_model(row: Dict[str, Any], fields: List[str]) -> ScreenerRow:
+    """
+    Convert a screener result row to the ScreenerRow response model.
+    """
+    return ScreenerRow(
+        company_id=row["company_id"],
+        metrics_id=row["metrics_id"],
+        period_end=row["period_end"],
+        period_type=row["period_type"],
+        metrics={field: row[field] for field in fields},
+        **{column: row[column] for column in RESULT_COMPANY_COLUMNS}
+    )
+
+def stream_screener_rows(rows: Iterator[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    """
+    Serialize result rows into a JSON array while they are read from the cursor.
+    Rows are sent in chunks of BULK_BATCH_SIZE; each chunk is a separate
+    hop from the worker thread to the event loop.
+    """
+    yield "["
+    chunk = []
+    for index, row in enumerate(rows):
+        chunk.append(("," if index else "") + row_to_screener_model(row, fields).model_dump_json())
+        if len(chunk) == settings.BULK_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    yield "".join(chunk) + "]"
+
+@router.post("", response_model=List[ScreenerRow])
+def run_screen(request: ScreenerRequest, db: Session = Depends(get_db)):
+    """
+    Screen companies on the metrics of their latest period.
+    
+    For every company, the most recent period of `period_type` is picked;
+    companies are kept when all filters match (company columns such as
+    sector, country and exchange can be mixed with metric columns) and
+    returned in `sort` order. The whole screen runs as one SQL query and
+    the result is streamed as it is read.
+    
+    Args:
+        request: Filters, sorts, returned fields and optional limit
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        StreamingResponse: JSON array of ScreenerRow
+    
+    Raises:
+        HTTPException: 400 if a field, operator or operand is invalid
+    """
+    repo = ScreenerRepository(db)
+    
+    try:
+        rows = repo.iter_screen(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    fields = request.fields if request.fields is not None else METRIC_COLUMNS
+    return StreamingResponse(stream_screener_rows(rows, fields), media_type="application/json")
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException, Response, Depends
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.models.timeseries import TimeseriesQuery, TimeseriesResponse
+from app.services.timeseries import ARROW_MEDIA_TYPE, TimeseriesService, arrow_available, to_arrow, to_columnar
+from app.core.database import get_db
+
+router = APIRouter(prefix="/timeseries", tags=["timeseries"])
+
+TIMESERIES_ADAPTER = TypeAdapter(TimeseriesResponse)
+
+@router.post("/query", response_model=TimeseriesResponse)
+def query_timeseries(query: TimeseriesQuery, db: Session = Depends(get_db)):
+    """
+    Aligned time series of metric and price fields for many tickers in one request.
+    
+    Metrics (financial_metrics columns, of `period_type`) and prices
+    (historical_data columns) are each read with one query for all tickers,
+    pivoted onto a common date index, optionally turned into trailing
+    twelve-month sums (`aggregation=ttm`), resampled to `frequency` and
+    forward-filled.
+    
+    Example: quarterly revenue of 50 tickers as annual TTM, forward-filled:
+    `{"tickers": [...], "fields": ["revenue"], "period_type": "quarterly",
+    "frequency": "annual", "aggregation": "ttm"}`
+    
+    Args:
+        query: Tickers, fields, date range, frequency, aggregation and format
+        db: Database session injected by FastAPI dependency
+    
+    Returns:
+        TimeseriesResponse: Columnar JSON, or an Arrow IPC stream with format=arrow
+    
+    Raises:
+        HTTPException: 400 if a field is unknown, the combination is invalid,
+            the result is too large, or Arrow is requested without pyarrow installed
+    """
+    if query.format == "arrow" and not arrow_available():
+        raise HTTPException(status_code=400, detail="Arrow output requires pyarrow")
+    
+    try:
+        result = TimeseriesService(db).query(query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if query.format == "arrow":
+        return Response(content=to_arrow(result), media_type=ARROW_MEDIA_TYPE)
+    return Response(
+        content=TIMESERIES_ADAPTER.dump_json(TIMESERIES_ADAPTER.validate_python(to_columnar(result, query))),
+        media_type="application/json"
+    )
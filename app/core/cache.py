@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cached entries are Redis hashes: one key per entity, one field per response variant
+# (e.g. each page of a company's metrics), so a write invalidates all variants with one DEL.
+
+
+def company_key(company_id: int) -> str:
+    return f"company:id:{company_id}"
+
+
+def ticker_key(ticker: str) -> str:
+    return f"company:ticker:{ticker}"
+
+
+def company_metrics_key(company_id: int) -> str:
+    return f"metrics:company:{company_id}"
+
+
+def aggregates_key() -> str:
+    return "analytics:aggregates"
+
+
+class LRUCache:
+    """
+    In-process fallback used when Redis is not configured or not reachable.
+    Entries are evicted least-recently-used first and expire after their TTL.
+    Invalidation only reaches the current process, so this is meant for tests
+    and single-worker development servers.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, field: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, fields = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return fields.get(field)
+
+    def set(self, key: str, field: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            fields = entry[1] if entry and entry[0] >= time.monotonic() else {}
+            fields[field] = value
+            self._entries[key] = (time.monotonic() + ttl, fields)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCache:
+    """
+    Redis-backed cache. Any redis-py compatible client works (including fakeredis).
+    Redis errors are logged and treated as cache misses so the API keeps
+    serving from the database when Redis goes down.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key: str, field: str) -> Optional[bytes]:
+        try:
+            return self.client.hget(key, field)
+        except Exception as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return None
+
+    def set(self, key: str, field: str, value: bytes, ttl: int) -> None:
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(key, field, value)
+            pipe.expire(key, ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Redis cache write failed: %s", e)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except Exception as e:
+            logger.warning("Redis cache invalidation failed: %s", e)
+
+
+class NullCache:
+    """Cache used when CACHE_ENABLED is off: every read is a miss."""
+
+    def get(self, key: str, field: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, field: str, value: bytes, ttl: int) -> None:
+        pass
+
+    def delete(self, keys: Iterable[str]) -> None:
+        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _create_cache():
+    if not settings.CACHE_ENABLED:
+        return NullCache()
+    if settings.REDIS_URL:
+        try:
+            import redis
+            client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+            client.ping()
+            return RedisCache(client)
+        except Exception as e:
+            logger.warning("Redis not available (%s), using in-process LRU cache", e)
+    return LRUCache(settings.CACHE_MAX_ENTRIES)
+
+
+def get_cache():
+    """
+    Return the process-wide cache, connecting to Redis on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _create_cache()
+    return _cache
+
+
+def set_cache(cache) -> None:
+    """
+    Replace the process-wide cache, e.g. with RedisCache(fakeredis.FakeRedis()) in tests.
+    """
+    global _cache
+    _cache = cache
+
+
+def invalidate_companies(company_ids: Iterable[int] = (), tickers: Iterable[str] = ()) -> None:
+    """
+    Drop cached company responses after a company write.
+    """
+    keys = [company_key(company_id) for company_id in company_ids]
+    keys += [ticker_key(ticker) for ticker in tickers]
+    get_cache().delete(keys)
+
+
+def invalidate_company_metrics(company_ids: Iterable[int]) -> None:
+    """
+    Drop every cached metrics page of the given companies, and the cached
+    aggregates they feed into, after a metrics write.
+    """
+    get_cache().delete({company_metrics_key(company_id) for company_id in company_ids} | {aggregates_key()})
+
+
+def invalidate_aggregates() -> None:
+    """
+    Drop every cached aggregate response, e.g. after a company changes sector
+    or the latest metrics snapshot is rebuilt.
+    """
+    get_cache().delete([aggregates_key()])
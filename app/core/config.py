@@ -20,8 +20,26 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "postgresql://przemkowy@localhost:5432/investment_ai"
+    # Serve read endpoints through AsyncSession (asyncpg/aiosqlite) instead of the threadpool
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL when not set
+    
+    # Connection pool (per process - multiply by uvicorn workers to get the
+    # total connections a deployment can open)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout, drops stale ones after a failover
     REDIS_URL: str = "redis://localhost:6379/0"
-    ELASTICSEARCH_URL: Optional[str] = None
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 10000  # Size of the in-process LRU used when Redis is unavailable
+    ELASTICSEARCH_URL: Optional[str] = None  # Full-text search backend; in-process index when unset
+    ELASTICSEARCH_COMPANY_INDEX: str = "companies"
+    COMPANY_SEARCH_BACKEND: str = "memory"  # "memory" (per-process index) or "postgres" (pg_trgm + unaccent)
+    BULK_BATCH_SIZE: int = 1000  # Rows per executemany/IN() chunk for bulk endpoints
+    PARQUET_STORE_PATH: str = "data/parquet"  # Root of the columnar snapshot store (app.services.parquet_store)
 
     # API Keys
     OPENAI_API_KEY: str = ""  # Required, but empty by default
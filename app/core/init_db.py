@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
-from app.core.database import engine, Base
+from app.core.database import engine, Base, SessionLocal
 from app.models.database_models import CompanyDB, FinancialMetricsDB
+from app.repositories.financial_metrics_repository import FinancialMetricsRepository
 from datetime import datetime, timezone
 
 def init_db():
@@ -9,9 +10,18 @@ def init_db():
     This function should be called when the application starts for the first time.
     """
     # Create all tables defined in our models
-    # This will create the 'companies' and 'financial_metrics' tables
+    # This will create the 'companies', 'financial_metrics' and 'historical_data' tables
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")#logs instead of print?
+    
+    # Databases filled before the latest-metrics snapshot existed start with it empty
+    db = SessionLocal()
+    try:
+        rebuilt = FinancialMetricsRepository(db).ensure_latest()
+    finally:
+        db.close()
+    if rebuilt is not None:
+        print(f"Latest financial metrics snapshot rebuilt ({rebuilt} rows)")
 
 def seed_sample_data(db: Session):
     """
@@ -108,6 +118,9 @@ def seed_sample_data(db: Session):
     
     # Commit all changes
     db.commit()
+    
+    # The rows above bypass the repository, so fill the latest-metrics snapshot from them
+    FinancialMetricsRepository(db).rebuild_latest()
     print("Sample data seeded successfully!")
 
 if __name__ == "__main__":
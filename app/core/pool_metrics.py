@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolStats:
+    """
+    Cumulative connection pool counters for one engine in this process.
+    Each uvicorn worker has its own pool, so each reports its own numbers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_avg_ms": (self.wait_total / self.wait_count * 1000) if self.wait_count else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times how long each checkout waits for a free connection (including
+    opening a new one) and counts checkouts that hit pool_timeout.
+    """
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool; keep its counters and registration
+        pool = super().recreate()
+        pool.stats = self.stats
+        for name, registered in _pools.items():
+            if registered is self:
+                _pools[name] = pool
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Stats per engine name ("sync", "async"), filled by instrument_pool()
+pool_stats: Dict[str, PoolStats] = {}
+_pools: Dict[str, Pool] = {}
+
+
+def instrument_pool(name: str, pool: Pool) -> None:
+    """
+    Attach pool event listeners and register the pool for pool_status().
+    """
+    stats = pool_stats.setdefault(name, PoolStats())
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool.stats = stats
+    _pools[name] = pool
+
+    event.listen(pool, "connect", lambda *args: stats.increment("connects"))
+    event.listen(pool, "checkout", lambda *args: stats.increment("checkouts"))
+    event.listen(pool, "checkin", lambda *args: stats.increment("checkins"))
+    event.listen(pool, "invalidate", lambda *args: stats.increment("invalidations"))
+
+
+def pool_status() -> Dict[str, object]:
+    """
+    Current gauges and cumulative counters of every instrumented pool.
+    """
+    pools = {}
+    for name, pool in _pools.items():
+        status = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout_s": pool.timeout(),
+            })
+        status.update(pool_stats[name].snapshot())
+        pools[name] = status
+    return {"pid": os.getpid(), "pools": pools}
@@ -0,0 +1,116 @@
+"""
+Source interface of the data collectors.
+
+A source knows how to fetch one company's data from one provider; the
+scheduler (app.data_collectors.scheduler) decides when, how often and how
+many at a time. Sources declare their own rate limit and concurrency and
+signal transient failures with RetryableSourceError, so adding a provider
+means writing a single fetch() coroutine.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+import httpx
+
+from app.models.financial_metrics import FinancialMetricsCreate
+from app.models.historical_data import HistoricalDataCreate
+
+
+class SourceError(Exception):
+    """A fetch failed and retrying will not help (unknown ticker, malformed payload)."""
+
+
+class RetryableSourceError(SourceError):
+    """A fetch failed for a transient reason (throttled, server error)."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # Seconds the provider asked us to wait, from a Retry-After header
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class CollectorTarget:
+    """One company to refresh."""
+    company_id: int
+    ticker: str
+    # Date of the latest stored bar; sources only fetch what comes after it
+    since: Optional[datetime] = None
+
+
+@dataclass
+class CollectedData:
+    """Everything one source returned for one company."""
+    target: CollectorTarget
+    prices: List[HistoricalDataCreate] = field(default_factory=list)
+    metrics: List[FinancialMetricsCreate] = field(default_factory=list)
+
+
+class DataSource(ABC):
+    """
+    A market data provider.
+    
+    Subclasses set the class attributes to the provider's limits and
+    implement fetch(). The limits can be overridden per instance.
+    """
+    name: str = "source"
+    # What the source refreshes, a data type of the refresh planner ("prices", "metrics")
+    data_type: str = "prices"
+    # Token bucket: sustained requests per second and the burst allowed on top
+    rate_per_second: float = 5.0
+    burst: int = 10
+    # Requests in flight at once
+    max_concurrency: int = 10
+    # Seconds before a request is abandoned (and retried)
+    timeout: float = 10.0
+    
+    def __init__(
+        self,
+        rate_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        if rate_per_second is not None:
+            self.rate_per_second = rate_per_second
+        if burst is not None:
+            self.burst = burst
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+    
+    @abstractmethod
+    async def fetch(self, client: httpx.AsyncClient, target: CollectorTarget) -> CollectedData:
+        """
+        Fetch the new data of one company.
+        
+        Args:
+            client: Shared HTTP client of this source
+            target: The company to fetch
+        
+        Returns:
+            CollectedData: Price bars and/or metrics rows for the company
+        
+        Raises:
+            RetryableSourceError: On throttling or a transient provider error
+            SourceError: If the company cannot be fetched from this source
+        """
+
+
+def check_response(response: httpx.Response) -> None:
+    """
+    Raise the collector error matching an HTTP error status.
+    429 and 5xx are retryable (honouring Retry-After); other 4xx are not.
+    """
+    if response.status_code < 400:
+        return
+    message = f"HTTP {response.status_code} from {response.request.url}"
+    if response.status_code == 429 or response.status_code >= 500:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            seconds = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            seconds = None
+        raise RetryableSourceError(message, retry_after=seconds)
+    raise SourceError(message)
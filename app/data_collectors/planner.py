@@ -0,0 +1,168 @@
+"""
+Incremental refresh planner.
+
+Each cycle only fetches the companies that are due: the refresh_state row
+of every active company records when its data of a given type was last
+refreshed and which priority tier it is in, and a company is due once its
+data is older than the tier's MAX_AGE (large caps every few hours, small
+caps daily). Due companies are taken most urgent first until the cycle's
+cost budget is spent, using the fetch time measured on previous cycles, so
+a cycle has a predictable length however large the backlog is.
+
+After the cycle, refresh times, failures and fetch costs are written back
+in bulk. Inactive companies are never planned.
+
+Usage:
+    python -m app.data_collectors.planner                        # one cycle, no budget
+    python -m app.data_collectors.planner --budget 600           # at most ~600 fetch-seconds
+    python -m app.data_collectors.planner --assign-tiers         # re-tier from market caps first
+    python -m app.data_collectors.planner --loop 300             # a cycle every 5 minutes
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.data_collectors.base import CollectorTarget, DataSource
+from app.data_collectors.scheduler import CollectionReport, CollectorScheduler
+from app.data_collectors.writer import CollectorWriter
+from app.repositories.historical_data_repository import HistoricalDataRepository
+from app.repositories.refresh_repository import DEFAULT_COST_MS, RefreshRepository
+
+
+@dataclass
+class RefreshPlan:
+    """Companies picked for one cycle of one data type."""
+    data_type: str
+    targets: List[CollectorTarget] = field(default_factory=list)
+    # Estimated fetch time of the picked companies
+    estimated_cost_ms: float = 0.0
+    # Due companies left for a later cycle because the budget was spent
+    deferred: int = 0
+
+
+class RefreshPlanner:
+    """
+    Picks the due companies of a data type within a cost budget.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.refresh = RefreshRepository(db)
+    
+    def plan(self, data_type: str, budget_seconds: Optional[float] = None, limit: Optional[int] = None) -> RefreshPlan:
+        """
+        Plan one refresh cycle.
+        
+        Args:
+            data_type: Data type to refresh ("prices", "metrics")
+            budget_seconds: Total estimated fetch time of the cycle (unlimited if None)
+            limit: Maximum number of companies
+        
+        Returns:
+            RefreshPlan: Targets in priority order and what was deferred
+        """
+        self.refresh.sync_companies(data_type)
+        stale = self.refresh.get_stale(data_type, limit=limit)
+        
+        plan = RefreshPlan(data_type=data_type)
+        picked = []
+        budget_ms = budget_seconds * 1000 if budget_seconds is not None else None
+        for row in stale:
+            cost = row.cost_ms if row.cost_ms is not None else DEFAULT_COST_MS
+            # The first company always fits, so a tiny budget still makes progress
+            if budget_ms is not None and picked and plan.estimated_cost_ms + cost > budget_ms:
+                plan.deferred += 1
+                continue
+            picked.append(row)
+            plan.estimated_cost_ms += cost
+        
+        # Price sources fetch only the bars after the last stored one
+        last_dates = HistoricalDataRepository(self.db).get_last_dates([row.company_id for row in picked]) if data_type == "prices" else {}
+        plan.targets = [CollectorTarget(row.company_id, row.ticker, last_dates.get(row.company_id)) for row in picked]
+        return plan
+    
+    def record(self, plan: RefreshPlan, report: CollectionReport) -> None:
+        """
+        Write the outcome of a cycle back to refresh_state.
+        """
+        self.refresh.record(plan.data_type, report.costs_ms, report.failed_company_ids)
+
+
+async def run_cycle(
+    source: DataSource,
+    session_factory: Callable[[], Session],
+    budget_seconds: Optional[float] = None,
+    limit: Optional[int] = None
+):
+    """
+    Plan, fetch and record one refresh cycle of a source.
+    
+    Args:
+        source: Source to fetch from; its data_type selects what is planned
+        session_factory: Creates database sessions (SessionLocal)
+        budget_seconds: Total estimated fetch time of the cycle (unlimited if None)
+        limit: Maximum number of companies
+    
+    Returns:
+        Tuple[RefreshPlan, CollectionReport]: What was planned and what happened
+    """
+    db = session_factory()
+    try:
+        plan = RefreshPlanner(db).plan(source.data_type, budget_seconds, limit)
+    finally:
+        db.close()
+    
+    report = CollectionReport()
+    if plan.targets:
+        report = await CollectorScheduler([source], CollectorWriter(session_factory)).run(plan.targets)
+    
+    db = session_factory()
+    try:
+        RefreshPlanner(db).record(plan, report)
+    finally:
+        db.close()
+    return plan, report
+
+
+def main():
+    from app.core.database import SessionLocal
+    from app.data_collectors.sources import SOURCES
+    
+    parser = argparse.ArgumentParser(description="Refresh the companies whose data is due")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="yahoo")
+    parser.add_argument("--budget", type=float, help="Estimated fetch-seconds per cycle (default: unlimited)")
+    parser.add_argument("--limit", type=int, help="Maximum companies per cycle")
+    parser.add_argument("--assign-tiers", action="store_true", help="Recompute priority tiers from market caps first")
+    parser.add_argument("--loop", type=float, help="Run a cycle every LOOP seconds instead of once")
+    parser.add_argument("--base-url", help="Override the source's API base URL, e.g. a local stub server")
+    args = parser.parse_args()
+    
+    options = {"base_url": args.base_url} if args.base_url else {}
+    source = SOURCES[args.source](**options)
+    
+    if args.assign_tiers:
+        db = SessionLocal()
+        try:
+            print(f"Tiers assigned from market cap for {RefreshRepository(db).assign_tiers()} companies")
+        finally:
+            db.close()
+    
+    while True:
+        started = time.perf_counter()
+        plan, report = asyncio.run(run_cycle(source, SessionLocal, args.budget, args.limit))
+        print(
+            f"{plan.data_type}: {len(plan.targets)} due companies fetched ({plan.deferred} deferred), "
+            f"{len(report.failed)} failed, {report.written.prices_inserted} bars in {time.perf_counter() - started:.1f}s"
+        )
+        if args.loop is None:
+            break
+        time.sleep(max(0.0, args.loop - (time.perf_counter() - started)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Asyncio scheduler for the data collectors.
+
+Every source gets a pool of max_concurrency workers pulling companies from
+a queue, a token bucket enforcing its rate limit and one shared HTTP client
+(keep-alive connections). Transient failures are retried with exponential
+backoff and full jitter; a 429 with Retry-After also pauses the source's
+bucket so the other workers back off too.
+
+Results are buffered and written in bulk (see CollectorWriter) from a worker
+thread whenever FLUSH_ROWS rows or FLUSH_INTERVAL seconds have accumulated,
+so the database sees a handful of large transactions instead of one per
+company, and fetching never waits on a write.
+
+Usage:
+    python -m app.data_collectors.scheduler                     # all active companies
+    python -m app.data_collectors.scheduler --tickers AAPL MSFT
+    python -m app.data_collectors.scheduler --base-url http://127.0.0.1:8080 --rate 50
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.data_collectors.base import CollectedData, CollectorTarget, DataSource, RetryableSourceError, SourceError
+from app.data_collectors.rate_limit import TokenBucket
+from app.data_collectors.writer import CollectorWriter, WriteStats
+from app.models.database_models import CompanyDB
+from app.repositories.historical_data_repository import HistoricalDataRepository
+
+logger = logging.getLogger(__name__)
+
+# Buffered rows (bars + metrics rows) that trigger a bulk write
+FLUSH_ROWS = 5000
+# Seconds after which buffered results are written even if FLUSH_ROWS is not reached
+FLUSH_INTERVAL = 5.0
+
+
+@dataclass
+class CollectionReport:
+    """Outcome of one collection run."""
+    fetched: int = 0
+    retries: int = 0
+    # Error message by "source:ticker" for fetches that gave up
+    failed: Dict[str, str] = field(default_factory=dict)
+    failed_company_ids: Set[int] = field(default_factory=set)
+    # Milliseconds spent in fetch attempts (retries included) by company ID
+    costs_ms: Dict[int, float] = field(default_factory=dict)
+    written: WriteStats = field(default_factory=WriteStats)
+    elapsed: float = 0.0
+
+
+def load_targets(db: Session, tickers: Optional[Sequence[str]] = None) -> List[CollectorTarget]:
+    """
+    Active companies to refresh, each with the date of its latest stored bar.
+    
+    Args:
+        db: Database session
+        tickers: Only these tickers (all active companies if None)
+    
+    Returns:
+        List[CollectorTarget]: Companies ordered by ID
+    """
+    query = select(CompanyDB.id, CompanyDB.ticker).where(CompanyDB.is_active.is_not(False)).order_by(CompanyDB.id)
+    if tickers is not None:
+        query = query.where(CompanyDB.ticker.in_(list(tickers)))
+    companies = db.execute(query).all()
+    last_dates = HistoricalDataRepository(db).get_last_dates([company_id for company_id, _ in companies])
+    return [CollectorTarget(company_id, ticker, last_dates.get(company_id)) for company_id, ticker in companies]
+
+
+class CollectorScheduler:
+    """
+    Fetches every target from every source concurrently, within each
+    source's limits, and writes the results in bulk.
+    """
+    
+    def __init__(
+        self,
+        sources: Sequence[DataSource],
+        writer: CollectorWriter,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        flush_rows: int = FLUSH_ROWS,
+        flush_interval: float = FLUSH_INTERVAL
+    ):
+        self.sources = list(sources)
+        self.writer = writer
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+    
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+    
+    async def _fetch_with_retry(
+        self,
+        source: DataSource,
+        client: httpx.AsyncClient,
+        bucket: TokenBucket,
+        target: CollectorTarget,
+        report: CollectionReport
+    ) -> CollectedData:
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            started = time.perf_counter()
+            try:
+                return await source.fetch(client, target)
+            except (RetryableSourceError, httpx.TransportError) as e:
+                error = e
+            finally:
+                # Only time spent talking to the source counts, not rate-limit or backoff waits
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                report.costs_ms[target.company_id] = report.costs_ms.get(target.company_id, 0.0) + elapsed_ms
+            
+            if attempt >= self.max_retries:
+                raise error
+            retry_after = getattr(error, "retry_after", None)
+            if retry_after:
+                bucket.pause(retry_after)
+            delay = self._backoff(attempt, retry_after)
+            attempt += 1
+            report.retries += 1
+            logger.debug("%s %s: %s, retry %d in %.2fs", source.name, target.ticker, error, attempt, delay)
+            await asyncio.sleep(delay)
+    
+    async def _run_source(
+        self,
+        source: DataSource,
+        targets: Sequence[CollectorTarget],
+        results: "asyncio.Queue[CollectedData]",
+        report: CollectionReport
+    ) -> None:
+        queue: "asyncio.Queue[CollectorTarget]" = asyncio.Queue()
+        for target in targets:
+            queue.put_nowait(target)
+        bucket = TokenBucket(source.rate_per_second, source.burst)
+        limits = httpx.Limits(max_connections=source.max_concurrency, max_keepalive_connections=source.max_concurrency)
+        
+        async with httpx.AsyncClient(timeout=source.timeout, limits=limits) as client:
+            async def worker() -> None:
+                while True:
+                    try:
+                        target = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    try:
+                        data = await self._fetch_with_retry(source, client, bucket, target, report)
+                    except (SourceError, httpx.HTTPError) as e:
+                        report.failed[f"{source.name}:{target.ticker}"] = str(e) or type(e).__name__
+                        report.failed_company_ids.add(target.company_id)
+                        continue
+                    report.fetched += 1
+                    await results.put(data)
+            
+            await asyncio.gather(*(worker() for _ in range(min(source.max_concurrency, len(targets)))))
+    
+    async def _write_results(self, results: "asyncio.Queue[Optional[CollectedData]]", report: CollectionReport) -> None:
+        buffer: List[CollectedData] = []
+        buffered_rows = 0
+        deadline = time.monotonic() + self.flush_interval
+        
+        async def flush() -> None:
+            nonlocal buffer, buffered_rows, deadline
+            batch, buffer, buffered_rows = buffer, [], 0
+            deadline = time.monotonic() + self.flush_interval
+            if batch:
+                report.written.add(await asyncio.to_thread(self.writer.write, batch))
+        
+        while True:
+            try:
+                data = await asyncio.wait_for(results.get(), timeout=max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+            if data is None:
+                await flush()
+                return
+            buffer.append(data)
+            buffered_rows += len(data.prices) + len(data.metrics)
+            if buffered_rows >= self.flush_rows or time.monotonic() >= deadline:
+                await flush()
+    
+    async def run(self, targets: Sequence[CollectorTarget]) -> CollectionReport:
+        """
+        Collect every target from every source.
+        
+        Args:
+            targets: Companies to refresh
+        
+        Returns:
+            CollectionReport: Counts, failures and rows written
+        """
+        report = CollectionReport()
+        started = time.perf_counter()
+        # Bounded so fetching slows down instead of piling up rows if the database falls behind
+        results: "asyncio.Queue[Optional[CollectedData]]" = asyncio.Queue(maxsize=self.flush_rows)
+        
+        async def fetch_all() -> None:
+            await asyncio.gather(*(self._run_source(source, targets, results, report) for source in self.sources))
+            await results.put(None)
+        
+        fetching = asyncio.create_task(fetch_all())
+        writing = asyncio.create_task(self._write_results(results, report))
+        try:
+            # A failed write stops the run instead of leaving fetchers blocked on a full queue
+            await asyncio.gather(fetching, writing)
+        finally:
+            for task in (fetching, writing):
+                if not task.done():
+                    task.cancel()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+def main():
+    from app.core.database import SessionLocal
+    from app.data_collectors.sources import SOURCES
+    
+    parser = argparse.ArgumentParser(description="Refresh market data for the company universe")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="yahoo")
+    parser.add_argument("--tickers", nargs="*", help="Only these tickers (default: all active companies)")
+    parser.add_argument("--base-url", help="Override the source's API base URL, e.g. a local stub server")
+    parser.add_argument("--rate", type=float, help="Requests per second (default: the source's limit)")
+    parser.add_argument("--concurrency", type=int, help="Requests in flight (default: the source's limit)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=settings.LOG_LEVEL, format=settings.LOG_FORMAT)
+    options = {"base_url": args.base_url} if args.base_url else {}
+    source = SOURCES[args.source](rate_per_second=args.rate, max_concurrency=args.concurrency, **options)
+    
+    db = SessionLocal()
+    try:
+        targets = load_targets(db, args.tickers)
+    finally:
+        db.close()
+    
+    print(f"Collecting {len(targets)} companies from {source.name}...")
+    report = asyncio.run(CollectorScheduler([source], CollectorWriter(SessionLocal)).run(targets))
+    print(
+        f"Fetched {report.fetched}, failed {len(report.failed)}, retries {report.retries}; "
+        f"{report.written.prices_inserted} bars, {report.written.metrics_inserted + report.written.metrics_updated} metrics rows, "
+        f"{report.written.companies_updated} companies updated in {report.elapsed:.1f}s"
+    )
+    for key, error in sorted(report.failed.items()):
+        print(f"  {key}: {error}")
+
+
+if __name__ == "__main__":
+    main()
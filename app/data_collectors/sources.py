@@ -0,0 +1,95 @@
+"""
+Built-in data sources.
+
+YahooChartSource reads daily bars from the Yahoo Finance chart API (the
+endpoint yfinance uses under the hood) directly over httpx, so thousands of
+tickers can be fetched concurrently instead of one blocking yfinance call
+at a time. Point base_url at a local server to run it against a stub.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.data_collectors.base import CollectedData, CollectorTarget, DataSource, SourceError, check_response
+from app.models.historical_data import HistoricalDataCreate
+
+
+class YahooChartSource(DataSource):
+    """
+    Daily OHLCV bars from /v8/finance/chart/{ticker}.
+    """
+    name = "yahoo"
+    data_type = "prices"
+    rate_per_second = 5.0
+    burst = 10
+    max_concurrency = 20
+    
+    def __init__(self, base_url: str = "https://query1.finance.yahoo.com", history_days: int = 365, **limits):
+        super().__init__(**limits)
+        self.base_url = base_url.rstrip("/")
+        # How far back to go for companies without any stored bars
+        self.history_days = history_days
+    
+    async def fetch(self, client: httpx.AsyncClient, target: CollectorTarget) -> CollectedData:
+        now = datetime.now(timezone.utc)
+        start = target.since + timedelta(days=1) if target.since else now - timedelta(days=self.history_days)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        response = await client.get(
+            f"{self.base_url}/v8/finance/chart/{target.ticker}",
+            params={"period1": int(start.timestamp()), "period2": int(now.timestamp()), "interval": "1d"}
+        )
+        check_response(response)
+        try:
+            payload = response.json()
+        except ValueError:
+            raise SourceError(f"{target.ticker}: response is not JSON")
+        return CollectedData(target=target, prices=self.parse_chart(target.company_id, payload))
+    
+    @staticmethod
+    def parse_chart(company_id: int, payload: Dict[str, Any]) -> List[HistoricalDataCreate]:
+        """
+        Convert a chart API response to bars. Days without a close are skipped.
+        
+        Raises:
+            SourceError: If the response reports an error or has an unexpected shape
+        """
+        chart = payload.get("chart") if isinstance(payload, dict) else None
+        if not isinstance(chart, dict):
+            raise SourceError("Unexpected chart API response: no chart object")
+        if chart.get("error"):
+            raise SourceError(f"Chart API error: {chart['error']}")
+        try:
+            result = chart["result"][0]
+            timestamps = result.get("timestamp") or []
+            quote = result["indicators"]["quote"][0]
+            adjusted: Optional[List[Any]] = (result["indicators"].get("adjclose") or [{}])[0].get("adjclose")
+            
+            bars = []
+            for index, timestamp in enumerate(timestamps):
+                close = quote["close"][index]
+                if close is None:
+                    continue
+                day = datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+                bars.append(HistoricalDataCreate(
+                    company_id=company_id,
+                    date=day,
+                    open_price=quote["open"][index] if quote["open"][index] is not None else close,
+                    high_price=quote["high"][index] if quote["high"][index] is not None else close,
+                    low_price=quote["low"][index] if quote["low"][index] is not None else close,
+                    close_price=close,
+                    volume=quote["volume"][index] or 0,
+                    adjusted_close=adjusted[index] if adjusted else None
+                ))
+        # Missing keys, short value lists and values the model rejects (ValidationError is a ValueError)
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError, OverflowError, OSError) as e:
+            raise SourceError(f"Unexpected chart API response: {type(e).__name__}: {e}") from e
+        return bars
+
+
+# Sources selectable by name from the command line
+SOURCES = {
+    YahooChartSource.name: YahooChartSource,
+}
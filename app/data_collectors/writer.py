@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.data_collectors.base import CollectedData
+from app.repositories.company_repository import CompanyRepository
+from app.repositories.financial_metrics_repository import FinancialMetricsRepository
+from app.repositories.historical_data_repository import HistoricalDataRepository
+
+
+@dataclass
+class WriteStats:
+    """Rows stored by one or more flushes."""
+    prices_inserted: int = 0
+    metrics_inserted: int = 0
+    metrics_updated: int = 0
+    companies_updated: int = 0
+    
+    def add(self, other: "WriteStats") -> None:
+        self.prices_inserted += other.prices_inserted
+        self.metrics_inserted += other.metrics_inserted
+        self.metrics_updated += other.metrics_updated
+        self.companies_updated += other.companies_updated
+
+
+class CollectorWriter:
+    """
+    Stores collected data with the bulk repository methods: one
+    bulk_append for all bars of a flush, one bulk_upsert for all metrics
+    rows, then last_data_update is set for every company in the flush.
+    
+    write() is blocking; the scheduler runs it in a worker thread with its
+    own session so the event loop keeps fetching meanwhile.
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+    
+    def write(self, results: Sequence[CollectedData]) -> WriteStats:
+        """
+        Store a batch of fetch results.
+        
+        Args:
+            results: Successful fetches; companies with no new rows still get last_data_update set
+        
+        Returns:
+            WriteStats: Rows stored
+        
+        Raises:
+            ValueError: If the batch violates a database constraint
+        """
+        stats = WriteStats()
+        if not results:
+            return stats
+        prices = [bar for result in results for bar in result.prices]
+        metrics = [row for result in results for row in result.metrics]
+        
+        db = self.session_factory()
+        try:
+            if prices:
+                stats.prices_inserted = HistoricalDataRepository(db).bulk_append(prices)
+            if metrics:
+                upserted = FinancialMetricsRepository(db).bulk_upsert(metrics)
+                stats.metrics_inserted = upserted.inserted
+                stats.metrics_updated = upserted.updated
+            stats.companies_updated = CompanyRepository(db).mark_data_updated(
+                [result.target.company_id for result in results]
+            )
+        finally:
+            db.close()
+        return stats
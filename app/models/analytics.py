@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AggregateGroup(BaseModel):
+    """Statistics of one group of companies."""
+    group: Optional[str] = Field(None, description="Value of the grouping column; None for companies without one")
+    companies: int = Field(..., description="Companies in the group with a period of the requested type")
+    metrics: Dict[str, Dict[str, Optional[float]]] = Field(
+        default_factory=dict, description="Metric -> statistic -> value; None when no company has the metric"
+    )
+
+
+class AggregatesResponse(BaseModel):
+    """Cross-sectional statistics over the latest period of every company."""
+    group_by: str = Field(..., description="Company column the groups are formed on")
+    period_type: str = Field(..., description="Period type of the latest periods aggregated")
+    metrics: List[str] = Field(..., description="Aggregated metric columns")
+    stats: List[str] = Field(..., description="Computed statistics")
+    generated_at: datetime = Field(..., description="When the statistics were computed")
+    groups: List[AggregateGroup] = Field(default_factory=list, description="Groups, largest first")
@@ -1,7 +1,9 @@
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field, HttpUrl
 
+from app.models.financial_metrics import FinancialMetrics
+
 
 class CompanyBase(BaseModel):
     """Base company model."""
@@ -36,4 +38,52 @@ class Company(CompanyBase):
     last_data_update: Optional[datetime] = Field(None, description="Date of last data update")
     
     class Config:
-        from_attributes = True  # for SQLAlchemy compatibility 
\ No newline at end of file
+        from_attributes = True  # for SQLAlchemy compatibility 
+
+
+class CompanyWithMetrics(Company):
+    """Company with its most recent financial metrics embedded."""
+    financial_metrics: List[FinancialMetrics] = Field(default_factory=list, description="Most recent periods, newest first")
+
+
+class CompanyBulkConflict(BaseModel):
+    """A row from a bulk request that was not inserted."""
+    index: int = Field(..., description="Position of the row in the request body")
+    name: str = Field(..., description="Company name from the rejected row")
+    ticker: str = Field(..., description="Ticker from the rejected row")
+    reason: str = Field(..., description="Why the row was rejected")
+
+
+class CompanyBulkResult(BaseModel):
+    """Outcome of a bulk company insert."""
+    created_count: int = Field(..., description="Number of companies inserted")
+    created_ids: List[int] = Field(default_factory=list, description="IDs of inserted companies, in request order")
+    conflicts: List[CompanyBulkConflict] = Field(default_factory=list, description="Rows skipped because of conflicts")
+
+
+class CompanySearchResult(BaseModel):
+    """A company matched by the type-ahead search."""
+    id: int = Field(..., description="Company ID")
+    ticker: str = Field(..., description="Stock ticker symbol")
+    name: str = Field(..., description="Company name")
+    exchange: Optional[str] = Field(None, description="Stock exchange where the company is listed")
+    score: float = Field(..., description="Match quality, 1.0 for an exact ticker match")
+
+
+class CompanyFulltextHit(BaseModel):
+    """A company matched by the full-text search."""
+    id: int = Field(..., description="Company ID")
+    ticker: str = Field(..., description="Stock ticker symbol")
+    name: str = Field(..., description="Company name")
+    sector: Optional[str] = Field(None, description="Business sector")
+    exchange: Optional[str] = Field(None, description="Stock exchange where the company is listed")
+    score: float = Field(..., description="Relevance score (BM25), higher is better")
+
+
+class CompanyFulltextResponse(BaseModel):
+    """One page of full-text search results with facet counts over all matches."""
+    total: int = Field(..., description="Number of matching companies")
+    hits: List[CompanyFulltextHit] = Field(default_factory=list, description="Matches of this page, most relevant first")
+    facets: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict, description="Matching companies per sector and per exchange"
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Float, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -21,24 +21,31 @@ class CompanyDB(Base):
     # Company information fields
     name = Column(String(255), nullable=False, index=True)  # index=True creates a database index for faster searches
     ticker = Column(String(20), nullable=False, unique=True, index=True)  # unique=True ensures no duplicate tickers
-    sector = Column(String(100), nullable=True)
+    sector = Column(String(100), nullable=True, index=True)  # screener filters
     industry = Column(String(100), nullable=True)
     description = Column(Text, nullable=True)  # Text allows longer content than String
     website = Column(String(500), nullable=True)
-    country = Column(String(100), nullable=True)
-    exchange = Column(String(50), nullable=True)
+    country = Column(String(100), nullable=True, index=True)  # screener filters
+    exchange = Column(String(50), nullable=True, index=True)  # screener filters
     currency = Column(String(3), default="USD")  # 3-letter currency codes like USD, EUR
     
     # Metadata fields
     created_at = Column(DateTime(timezone=True), server_default=func.now())  # func.now() sets default to current timestamp
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # onupdate automatically updates this field
     is_active = Column(Boolean, default=True)
-    last_data_update = Column(DateTime(timezone=True), nullable=True)
+    last_data_update = Column(DateTime(timezone=True), nullable=True, index=True)  # refresh planner / status lag
     
     # Relationship to financial metrics - one company can have many financial metrics
     # This creates a virtual field that allows us to access related data
     financial_metrics = relationship("FinancialMetricsDB", back_populates="company", cascade="all, delete-orphan")
     
+    # Price history can be tens of thousands of rows per company, so deletes are
+    # left to the database (ON DELETE CASCADE) instead of loading every bar first
+    historical_data = relationship("HistoricalDataDB", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Snapshot rows go with the company (and with the metrics rows they point at)
+    latest_financial_metrics = relationship("LatestFinancialMetricsDB", cascade="all, delete-orphan")
+    
     # Database constraints
     __table_args__ = (
         # Composite unique constraint - ensures name + ticker combination is unique
@@ -108,4 +115,148 @@ class FinancialMetricsDB(Base):
     __table_args__ = (
         # Composite unique constraint - ensures one set of metrics per company per period
         UniqueConstraint('company_id', 'period_end', 'period_type', name='uq_metrics_company_period'),
+        # Serves "latest period of a type per company" (latest_financial_metrics refresh):
+        # rows of one period_type come out grouped by company, newest last
+        Index('ix_metrics_type_company_period', 'period_type', 'company_id', 'period_end'),
+    )
+
+class LatestFinancialMetricsDB(Base):
+    """
+    SQLAlchemy model for the latest_financial_metrics table.
+    Points at the most recent financial_metrics row of every
+    (company_id, period_type), so the latest metrics of many companies are
+    one primary key scan plus a join instead of one query per company.
+    
+    FinancialMetricsRepository keeps it in sync in the same transaction as
+    the metrics write; rebuild_latest() recomputes it from scratch.
+    """
+    __tablename__ = "latest_financial_metrics"
+    
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    period_type = Column(String(20), primary_key=True)
+    metrics_id = Column(Integer, ForeignKey("financial_metrics.id", ondelete="CASCADE"), nullable=False, unique=True)
+    period_end = Column(DateTime(timezone=True), nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    metrics = relationship("FinancialMetricsDB")
+
+class HistoricalDataDB(Base):
+    """
+    SQLAlchemy model for the historical_data table.
+    Stores daily OHLCV bars and technical indicators for companies.
+    
+    The primary key is (company_id, date) instead of a surrogate id:
+    every read is a date range for one company, so the primary key index
+    doubles as the range-scan index and no second index has to be
+    maintained for ~25M rows.
+    """
+    __tablename__ = "historical_data"
+    
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(DateTime(timezone=True), primary_key=True)
+    
+    # OHLCV data
+    open_price = Column(Float, nullable=False)
+    high_price = Column(Float, nullable=False)
+    low_price = Column(Float, nullable=False)
+    close_price = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False)
+    adjusted_close = Column(Float, nullable=True)
+    
+    # Additional market data
+    market_cap = Column(Float, nullable=True)
+    enterprise_value = Column(Float, nullable=True)
+    shares_outstanding = Column(BigInteger, nullable=True)
+    avg_volume = Column(BigInteger, nullable=True)
+    
+    # Technical indicators
+    sma_20 = Column(Float, nullable=True)
+    sma_50 = Column(Float, nullable=True)
+    sma_200 = Column(Float, nullable=True)
+    rsi_14 = Column(Float, nullable=True)
+    macd = Column(Float, nullable=True)
+    macd_signal = Column(Float, nullable=True)
+    macd_hist = Column(Float, nullable=True)
+    
+    # Metadata
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationship back to company
+    company = relationship("CompanyDB", back_populates="historical_data")
+
+class IndicatorStateDB(Base):
+    """
+    SQLAlchemy model for the indicator_state table.
+    Carries the recursive part of the technical indicators (EMA and RSI
+    averages) for the last processed bar of each company, so the nightly
+    job only has to compute newly appended bars.
+    """
+    __tablename__ = "indicator_state"
+    
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    last_date = Column(DateTime(timezone=True), nullable=False)
+    bars_seen = Column(Integer, nullable=False)
+    last_close = Column(Float, nullable=False)
+    
+    # Exponential moving averages behind MACD (12/26) and its signal line (9)
+    ema_fast = Column(Float, nullable=False)
+    ema_slow = Column(Float, nullable=False)
+    macd_signal = Column(Float, nullable=False)
+    
+    # Wilder-smoothed average gain/loss behind RSI (14)
+    avg_gain = Column(Float, nullable=True)
+    avg_loss = Column(Float, nullable=True)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class RefreshStateDB(Base):
+    """
+    SQLAlchemy model for the refresh_state table.
+    Refresh bookkeeping of the data collectors, one row per company and
+    data type ('prices', 'metrics'): when it was last refreshed, its
+    priority tier and what fetching it costs. The refresh planner picks
+    stale companies from here instead of scanning the data tables.
+    """
+    __tablename__ = "refresh_state"
+    
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    data_type = Column(String(20), primary_key=True)
+    
+    # 1 = refreshed most often (large caps); see app.repositories.refresh_repository.REFRESH_TIERS
+    tier = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)  # Last successful refresh
+    attempted_at = Column(DateTime(timezone=True), nullable=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    cost_ms = Column(Float, nullable=True)  # Moving average of the fetch time, retries included
+    
+    __table_args__ = (
+        # Stale companies of one data type and tier, oldest first
+        Index('ix_refresh_state_type_tier_refreshed', 'data_type', 'tier', 'refreshed_at'),
+    )
+
+class FactorScoreDB(Base):
+    """
+    SQLAlchemy model for the factor_scores table.
+    Cross-sectional standing of every company on every ratio of a period:
+    its percentile rank and z-score among the companies of its sector with
+    the same period_type and period_end. Written by
+    app.services.factor_engine, one period at a time.
+    """
+    __tablename__ = "factor_scores"
+    
+    # Key leads with the period, so one period's scores are a single range scan
+    period_type = Column(String(20), primary_key=True)
+    period_end = Column(DateTime(timezone=True), primary_key=True)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String(40), primary_key=True)  # financial_metrics column
+    
+    percentile = Column(Float, nullable=False)  # (0, 1], 1.0 = highest value in the sector
+    zscore = Column(Float, nullable=True)  # None when the sector has one company or no spread
+    peers = Column(Integer, nullable=False)  # Companies in the sector with a value for the metric
+    
+    __table_args__ = (
+        # All scores of one company, newest period last
+        Index('ix_factor_scores_company_period', 'company_id', 'period_type', 'period_end'),
     )
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class FactorValue(BaseModel):
+    """A company's standing on one metric among its sector peers."""
+    percentile: float = Field(..., description="Percentile rank in (0, 1], 1.0 = highest value in the sector")
+    zscore: Optional[float] = Field(None, description="Standard deviations from the sector mean; None without spread")
+    peers: int = Field(..., description="Companies in the sector with a value for the metric")
+
+
+class CompanyFactors(BaseModel):
+    """Factor scores of one company for one period."""
+    company_id: int = Field(..., description="Company ID")
+    ticker: str = Field(..., description="Stock ticker symbol")
+    sector: Optional[str] = Field(None, description="Sector the company is ranked in")
+    period_type: str = Field(..., description="Period type (quarterly/annual)")
+    period_end: datetime = Field(..., description="End of the scored period")
+    factors: Dict[str, FactorValue] = Field(default_factory=dict, description="Scores per metric")
+
+
+class FactorRecomputeResult(BaseModel):
+    """Outcome of a factor score computation."""
+    periods: int = Field(..., description="Distinct periods scored")
+    rows: int = Field(..., description="Financial metrics rows scored")
+    scores: int = Field(..., description="Factor scores written")
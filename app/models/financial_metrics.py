@@ -1,15 +1,24 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 from pydantic import BaseModel, Field
 
 
 class FinancialMetricsBase(BaseModel):
     """Base financial metrics model."""
+    # Raw fundamentals
+    revenue: Optional[Decimal] = Field(None, description="Total revenue")
+    net_income: Optional[Decimal] = Field(None, description="Net income")
+    total_assets: Optional[Decimal] = Field(None, description="Total assets")
+    total_liabilities: Optional[Decimal] = Field(None, description="Total liabilities")
+    total_equity: Optional[Decimal] = Field(None, description="Total shareholders' equity")
+    
     # Profitability ratios
     roe: Optional[Decimal] = Field(None, description="Return on Equity (ROE)")
     roa: Optional[Decimal] = Field(None, description="Return on Assets (ROA)")
+    gross_margin: Optional[Decimal] = Field(None, description="Gross margin")
     operating_margin: Optional[Decimal] = Field(None, description="Operating margin")
+    net_margin: Optional[Decimal] = Field(None, description="Net margin")
     net_profit_margin: Optional[Decimal] = Field(None, description="Net profit margin")
     
     # Liquidity ratios
@@ -29,6 +38,7 @@ class FinancialMetricsBase(BaseModel):
     
     # Growth ratios
     revenue_growth: Optional[Decimal] = Field(None, description="Revenue growth (YoY)")
+    net_income_growth: Optional[Decimal] = Field(None, description="Net income growth (YoY)")
     earnings_growth: Optional[Decimal] = Field(None, description="Earnings growth (YoY)")
     eps_growth: Optional[Decimal] = Field(None, description="EPS growth (YoY)")
     
@@ -66,4 +76,37 @@ class FinancialMetrics(FinancialMetricsBase):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     class Config:
-        from_attributes = True  # for SQLAlchemy compatibility 
\ No newline at end of file
+        from_attributes = True  # for SQLAlchemy compatibility
+
+
+class FinancialMetricsBulkUpsertResult(BaseModel):
+    """Outcome of a bulk financial metrics upsert."""
+    inserted: int = Field(0, description="Rows inserted for new company/period keys")
+    updated: int = Field(0, description="Existing rows whose values changed")
+    unchanged: int = Field(0, description="Existing rows that already had the same values")
+    missing_company_ids: List[int] = Field(default_factory=list, description="Company IDs that do not exist; their rows were skipped")
+
+
+class FinancialMetricsBatchRequest(BaseModel):
+    """Financial metrics of many companies in one request."""
+    company_ids: List[int] = Field(..., description="Companies to fetch, in the order results should be returned")
+    period_type: Optional[str] = Field(None, description="Only return periods of this type")
+    latest_only: bool = Field(False, description="Only return the most recent period (period_type defaults to annual)")
+
+
+class FinancialMetricsBatchItem(BaseModel):
+    """Financial metrics of one company in a batch response."""
+    company_id: int = Field(..., description="Company ID")
+    metrics: List[FinancialMetrics] = Field(default_factory=list, description="Metrics, newest period first")
+
+
+class FinancialMetricsBatchResult(BaseModel):
+    """Outcome of a batch financial metrics lookup."""
+    items: List[FinancialMetricsBatchItem] = Field(default_factory=list, description="One item per existing company, in request order")
+    missing_company_ids: List[int] = Field(default_factory=list, description="Requested company IDs that do not exist")
+
+
+class RatioRecomputeResult(BaseModel):
+    """Outcome of a derived-ratio recomputation."""
+    scanned: int = Field(..., description="Financial metrics rows examined")
+    updated: int = Field(..., description="Rows whose derived ratios changed")
@@ -43,7 +43,7 @@ class HistoricalDataUpdate(HistoricalDataBase):
 
 class HistoricalData(HistoricalDataBase):
     """Full historical data model with additional fields."""
-    id: int = Field(..., description="Unique identifier")
+    # Rows are identified by (company_id, date), there is no surrogate id
     company_id: int = Field(..., description="Company ID")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
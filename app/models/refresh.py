@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RefreshTierStatus(BaseModel):
+    """Refresh backlog of one data type and priority tier."""
+    data_type: str = Field(..., description="Refreshed data (prices/metrics)")
+    tier: int = Field(..., description="Priority tier, 1 is refreshed most often")
+    tier_name: str = Field(..., description="Tier name (large/mid/small)")
+    max_age_seconds: float = Field(..., description="Age after which a company of this tier is due")
+    companies: int = Field(..., description="Active companies in the tier")
+    stale: int = Field(..., description="Companies due for a refresh (backlog)")
+    never_refreshed: int = Field(..., description="Companies that have never been refreshed")
+    failing: int = Field(..., description="Companies whose last refresh failed")
+    max_lag_seconds: Optional[float] = Field(None, description="Age of the oldest refresh; None if none has happened")
+    backlog_cost_seconds: float = Field(..., description="Estimated fetch time of the backlog, from the measured per-company cost")
+
+
+class RefreshStatus(BaseModel):
+    """State of the data refresh across the company universe."""
+    generated_at: datetime = Field(..., description="Reference time of the lags")
+    active_companies: int = Field(..., description="Companies with is_active set")
+    companies_without_data: int = Field(..., description="Active companies never updated by a collector")
+    oldest_data_update: Optional[datetime] = Field(None, description="Oldest last_data_update among active companies")
+    tiers: List[RefreshTierStatus] = Field(default_factory=list, description="Backlog per data type and tier")
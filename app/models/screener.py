@@ -0,0 +1,41 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ScreenerFilter(BaseModel):
+    """One filter condition of a screen, e.g. pe_ratio lt 15."""
+    field: str = Field(..., description="Metric column or company column (sector, industry, country, exchange, currency)")
+    op: Literal["eq", "ne", "lt", "lte", "gt", "gte", "in", "between", "is_null", "not_null"] = Field(..., description="Comparison operator")
+    value: Any = Field(None, description="Operand; a list for 'in', [low, high] for 'between', unused for null checks")
+
+
+class ScreenerSort(BaseModel):
+    """One sort key of a screen."""
+    field: str = Field(..., description="Column to sort by")
+    direction: Literal["asc", "desc"] = Field("asc", description="Sort direction")
+
+
+class ScreenerRequest(BaseModel):
+    """Cross-sectional screen over each company's latest period."""
+    period_type: str = Field("annual", description="Only periods of this type are considered when picking the latest period")
+    filters: List[ScreenerFilter] = Field(default_factory=list, description="Conditions combined with AND")
+    sort: List[ScreenerSort] = Field(default_factory=list, description="Sort keys; ties are broken by company_id")
+    fields: Optional[List[str]] = Field(None, description="Metric columns to return; all metrics if omitted")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of companies to return; all matches if omitted")
+
+
+class ScreenerRow(BaseModel):
+    """A matching company with the requested metrics of its latest period."""
+    company_id: int = Field(..., description="Company ID")
+    ticker: str = Field(..., description="Stock ticker symbol")
+    name: str = Field(..., description="Company name")
+    sector: Optional[str] = Field(None, description="Economic sector")
+    country: Optional[str] = Field(None, description="Country of origin")
+    exchange: Optional[str] = Field(None, description="Stock exchange where the company is listed")
+    metrics_id: int = Field(..., description="ID of the financial metrics row that matched")
+    period_end: datetime = Field(..., description="End of the company's latest period")
+    period_type: str = Field(..., description="Period type (quarterly/annual)")
+    metrics: Dict[str, Optional[Decimal]] = Field(default_factory=dict, description="Requested metric values")
@@ -0,0 +1,32 @@
+from datetime import date, datetime
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TimeseriesQuery(BaseModel):
+    """Aligned time series of metric and price fields for many tickers."""
+    tickers: List[str] = Field(..., min_length=1, max_length=500, description="Ticker symbols; columns keep this order")
+    fields: List[str] = Field(..., min_length=1, max_length=20, description="financial_metrics and/or historical_data columns")
+    period_type: str = Field("annual", description="Period type of the financial metrics rows used")
+    start: Optional[datetime] = Field(None, description="First date of the result")
+    end: Optional[datetime] = Field(None, description="Last date of the result")
+    frequency: Optional[Literal["daily", "weekly", "monthly", "quarterly", "annual"]] = Field(
+        None, description="Resample to this frequency (bucket end dates); the union of observation dates if omitted"
+    )
+    aggregation: Literal["last", "first", "mean", "sum", "min", "max", "ttm"] = Field(
+        "last", description="How observations within a bucket are combined; ttm sums each ticker's last four quarters first (period_type=quarterly only)"
+    )
+    ffill: bool = Field(True, description="Carry the last value forward over dates without an observation")
+    format: Literal["json", "arrow"] = Field("json", description="Columnar JSON, or an Arrow IPC stream in long (date, ticker) layout")
+
+
+class TimeseriesResponse(BaseModel):
+    """Columnar result: one value list per field and ticker, aligned on `index`."""
+    index: List[date] = Field(default_factory=list, description="Common date index")
+    frequency: Optional[str] = Field(None, description="Resampling frequency, None for observation dates")
+    aggregation: str = Field(..., description="Aggregation applied within buckets")
+    columns: Dict[str, Dict[str, List[Optional[float]]]] = Field(
+        default_factory=dict, description="Field -> ticker -> values aligned with index"
+    )
+    missing_tickers: List[str] = Field(default_factory=list, description="Requested tickers without any data")
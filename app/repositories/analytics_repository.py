@@ -0,0 +1,154 @@
+import math
+from typing import Any, Dict, List, Sequence
+
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.database_models import CompanyDB, FinancialMetricsDB, LatestFinancialMetricsDB
+from app.repositories.financial_metrics_repository import METRIC_COLUMNS
+
+# Company columns companies can be grouped by
+GROUP_BY_COLUMNS = ("sector", "industry", "exchange", "country", "currency")
+
+# Statistic name -> SQL aggregate of a metric column (percentile_cont needs PostgreSQL)
+SQL_STATS = {
+    "count": lambda column: func.count(column),
+    "mean": lambda column: func.avg(column),
+    "median": lambda column: func.percentile_cont(0.5).within_group(column),
+    "p25": lambda column: func.percentile_cont(0.25).within_group(column),
+    "p75": lambda column: func.percentile_cont(0.75).within_group(column),
+    "min": lambda column: func.min(column),
+    "max": lambda column: func.max(column),
+    "stddev": lambda column: func.stddev_samp(column),
+}
+
+# The same statistics on a pandas groupby; quantile's linear interpolation matches percentile_cont
+PANDAS_STATS = {
+    "count": lambda grouped: grouped.count(),
+    "mean": lambda grouped: grouped.mean(),
+    "median": lambda grouped: grouped.median(),
+    "p25": lambda grouped: grouped.quantile(0.25),
+    "p75": lambda grouped: grouped.quantile(0.75),
+    "min": lambda grouped: grouped.min(),
+    "max": lambda grouped: grouped.max(),
+    "stddev": lambda grouped: grouped.std(),
+}
+
+STATS = tuple(SQL_STATS)
+
+
+def _number(value: Any):
+    """Plain float/int for JSON; NaN (empty group or single-value stddev) becomes None."""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+class AnalyticsRepository:
+    """
+    Repository for cross-sectional statistics over the latest period of
+    every company (latest_financial_metrics snapshot).
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def validate(group_by: str, metrics: Sequence[str], stats: Sequence[str]) -> None:
+        """
+        Raises:
+            ValueError: If the grouping column, a metric or a statistic is unknown
+        """
+        if group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"Unknown group_by column: {group_by} (one of {', '.join(GROUP_BY_COLUMNS)})")
+        if not metrics:
+            raise ValueError("At least one metric is required")
+        unknown = [metric for metric in metrics if metric not in METRIC_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+        if not stats:
+            raise ValueError("At least one statistic is required")
+        unknown = [stat for stat in stats if stat not in STATS]
+        if unknown:
+            raise ValueError(f"Unknown statistics: {', '.join(unknown)} (one of {', '.join(STATS)})")
+    
+    def _latest(self, period_type: str, *columns):
+        return select(*columns).select_from(LatestFinancialMetricsDB).join(
+            FinancialMetricsDB, FinancialMetricsDB.id == LatestFinancialMetricsDB.metrics_id
+        ).join(CompanyDB, CompanyDB.id == LatestFinancialMetricsDB.company_id).where(
+            LatestFinancialMetricsDB.period_type == period_type
+        )
+    
+    def aggregates(
+        self,
+        group_by: str,
+        metrics: Sequence[str],
+        stats: Sequence[str],
+        period_type: str = "annual"
+    ) -> List[Dict[str, Any]]:
+        """
+        Statistics of metrics per group of companies, each company counted
+        once with its latest period of `period_type`.
+        
+        On PostgreSQL this is one GROUP BY query (percentile_cont for the
+        quantiles); other databases return only the grouping and metric
+        columns in one query and the statistics are computed with a pandas
+        groupby.
+        
+        Args:
+            group_by: Company column to group by (GROUP_BY_COLUMNS)
+            metrics: financial_metrics columns to aggregate
+            stats: Statistics to compute (STATS)
+            period_type: Period type of the latest periods
+        
+        Returns:
+            List[dict]: One dict per group (group, companies, metrics -> stat -> value),
+            largest groups first; companies without a group value form the None group
+        
+        Raises:
+            ValueError: If group_by, a metric or a statistic is unknown
+        """
+        self.validate(group_by, metrics, stats)
+        group_column = getattr(CompanyDB, group_by)
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            aggregates = [
+                SQL_STATS[stat](getattr(FinancialMetricsDB, metric)) for metric in metrics for stat in stats
+            ]
+            rows = self.db.execute(
+                self._latest(period_type, group_column, func.count(), *aggregates).group_by(group_column)
+            ).all()
+            groups = []
+            for group, companies, *values in rows:
+                values = iter(values)
+                groups.append({
+                    "group": group,
+                    "companies": companies,
+                    "metrics": {metric: {stat: _number(next(values)) for stat in stats} for metric in metrics},
+                })
+        else:
+            columns = [getattr(FinancialMetricsDB, metric) for metric in metrics]
+            frame = pd.DataFrame(
+                self.db.execute(self._latest(period_type, group_column, *columns)).all(),
+                columns=["group", *metrics]
+            )
+            frame[list(metrics)] = frame[list(metrics)].astype("float64")
+            grouped = frame.groupby("group", dropna=False, sort=False)
+            companies = grouped.size()
+            results = {stat: PANDAS_STATS[stat](grouped[list(metrics)]) for stat in stats}
+            groups = [
+                {
+                    "group": None if pd.isna(group) else group,
+                    "companies": int(count),
+                    "metrics": {
+                        metric: {stat: _number(results[stat].at[group, metric]) for stat in stats}
+                        for metric in metrics
+                    },
+                }
+                for group, count in companies.items()
+            ]
+        
+        groups.sort(key=lambda group: (-group["companies"], group["group"] is None, group["group"] or ""))
+        return groups
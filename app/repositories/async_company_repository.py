@@ -0,0 +1,59 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence
+from app.models.database_models import CompanyDB
+from app.repositories.company_repository import (
+    companies_by_ids_queries,
+    companies_by_tickers_queries,
+    companies_page_query,
+    company_by_id_query,
+    company_by_ticker_query,
+)
+
+class AsyncCompanyRepository:
+    """
+    Async version of the CompanyRepository reads for use with AsyncSession.
+    
+    Queries come from the builders in company_repository, so both
+    repositories always issue the same SQL; this class only executes them
+    natively on the async connection, so they never hold a worker thread.
+    Writes go through the sync CompanyRepository.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, company_id: int) -> Optional[CompanyDB]:
+        """
+        Retrieve a company by its ID. See CompanyRepository.get_by_id.
+        """
+        return await self.db.scalar(company_by_id_query(company_id))
+    
+    async def get_by_ticker(self, ticker: str) -> Optional[CompanyDB]:
+        """
+        Retrieve a company by its ticker symbol. See CompanyRepository.get_by_ticker.
+        """
+        return await self.db.scalar(company_by_ticker_query(ticker))
+    
+    async def get_by_ids(self, company_ids: Sequence[int]) -> List[CompanyDB]:
+        """
+        Retrieve many companies by ID. See CompanyRepository.get_by_ids.
+        """
+        found = []
+        for query in companies_by_ids_queries(company_ids):
+            found.extend(await self.db.scalars(query))
+        return found
+    
+    async def get_by_tickers(self, tickers: Sequence[str]) -> List[CompanyDB]:
+        """
+        Retrieve many companies by ticker symbol. See CompanyRepository.get_by_tickers.
+        """
+        found = []
+        for query in companies_by_tickers_queries(tickers):
+            found.extend(await self.db.scalars(query))
+        return found
+    
+    async def get_all(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CompanyDB]:
+        """
+        Retrieve all companies ordered by ID with pagination support. See CompanyRepository.get_all.
+        """
+        return list(await self.db.scalars(companies_page_query(skip, limit, after_id)))
@@ -0,0 +1,94 @@
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
+from app.models.database_models import FinancialMetricsDB
+from app.repositories.financial_metrics_repository import (
+    company_metrics_query,
+    latest_metrics_queries,
+    metrics_by_id_query,
+    metrics_page_query,
+    recent_metrics_queries,
+)
+from datetime import datetime
+
+class AsyncFinancialMetricsRepository:
+    """
+    Async version of the FinancialMetricsRepository reads for use with AsyncSession.
+    Queries come from the builders in financial_metrics_repository and are
+    executed natively on the async connection; writes go through the sync
+    FinancialMetricsRepository.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, metrics_id: int) -> Optional[FinancialMetricsDB]:
+        """
+        Retrieve financial metrics by ID. See FinancialMetricsRepository.get_by_id.
+        """
+        return await self.db.scalar(metrics_by_id_query(metrics_id))
+    
+    async def get_by_company(
+        self,
+        company_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve all financial metrics for a specific company, newest period first.
+        See FinancialMetricsRepository.get_by_company.
+        """
+        return await self._fetch(company_metrics_query(company_id, skip, limit, before, fields), fields)
+    
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve all financial metrics ordered by ID with pagination.
+        See FinancialMetricsRepository.get_all.
+        """
+        return await self._fetch(metrics_page_query(skip, limit, after_id, fields), fields)
+    
+    async def get_recent_by_companies(
+        self,
+        company_ids: Sequence[int],
+        last_n: int,
+        period_type: Optional[str] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve the last `last_n` periods of many companies with a windowed query.
+        See FinancialMetricsRepository.get_recent_by_companies.
+        """
+        results = []
+        for query in recent_metrics_queries(company_ids, last_n, period_type):
+            results.extend(await self.db.scalars(query))
+        return results
+    
+    async def get_latest(
+        self,
+        company_ids: Optional[Sequence[int]] = None,
+        period_type: str = "annual",
+        fields: Optional[Sequence[str]] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve the most recent financial metrics of many companies at once.
+        See FinancialMetricsRepository.get_latest.
+        """
+        results = []
+        for query in latest_metrics_queries(company_ids, period_type, fields):
+            results.extend(await self._fetch(query, fields))
+        return results
+    
+    async def _fetch(self, query: Select, fields: Optional[Sequence[str]]) -> list:
+        """
+        Run a read built from projection_entities: entities for full reads, rows for projections.
+        """
+        if fields is None:
+            return list(await self.db.scalars(query))
+        return list((await self.db.execute(query)).all())
@@ -1,10 +1,53 @@
+from sqlalchemy import Select, case, func, insert, literal, or_, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
+from app.core.cache import invalidate_aggregates, invalidate_companies, invalidate_company_metrics
+from app.core.config import settings
 from app.models.database_models import CompanyDB
-from app.models.company import CompanyCreate, CompanyUpdate
+from app.models.company import CompanyCreate, CompanyUpdate, CompanyBulkConflict, CompanyBulkResult
+from app.services.company_search import EXACT_TICKER, NAME_PREFIX, TICKER_PREFIX, WORD_PREFIX, get_search_index, normalize
+from app.services.fulltext_search import company_document, get_fulltext_indexer
 from datetime import datetime, timezone
 
+# Read queries shared by CompanyRepository and AsyncCompanyRepository,
+# which only differ in how they execute them
+
+def company_by_id_query(company_id: int) -> Select:
+    """Select one company by ID."""
+    return select(CompanyDB).where(CompanyDB.id == company_id)
+
+def company_by_ticker_query(ticker: str) -> Select:
+    """Select one company by ticker symbol."""
+    return select(CompanyDB).where(CompanyDB.ticker == ticker)
+
+def companies_by_ids_queries(company_ids: Sequence[int]) -> List[Select]:
+    """Select many companies by ID, one IN() query per BULK_BATCH_SIZE unique IDs."""
+    unique_ids = list(dict.fromkeys(company_ids))
+    return [
+        select(CompanyDB).where(CompanyDB.id.in_(unique_ids[start:start + settings.BULK_BATCH_SIZE]))
+        for start in range(0, len(unique_ids), settings.BULK_BATCH_SIZE)
+    ]
+
+def companies_by_tickers_queries(tickers: Sequence[str]) -> List[Select]:
+    """Select many companies by ticker, one IN() query per BULK_BATCH_SIZE unique tickers."""
+    unique_tickers = list(dict.fromkeys(tickers))
+    return [
+        select(CompanyDB).where(CompanyDB.ticker.in_(unique_tickers[start:start + settings.BULK_BATCH_SIZE]))
+        for start in range(0, len(unique_tickers), settings.BULK_BATCH_SIZE)
+    ]
+
+def companies_page_query(skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> Select:
+    """
+    Select a page of companies ordered by ID: after the keyset cursor
+    `after_id` if given, which walks the primary key index instead of
+    counting skipped rows, otherwise after `skip` rows.
+    """
+    query = select(CompanyDB).order_by(CompanyDB.id).limit(limit)
+    if after_id is not None:
+        return query.where(CompanyDB.id > after_id)
+    return query.offset(skip)
+
 class CompanyRepository:
     """
     Repository class for company-related database operations.
@@ -54,6 +97,9 @@ class CompanyRepository:
             self.db.commit()
             # Refresh the object to get database-generated values (id, timestamps)
             self.db.refresh(db_company)
+            invalidate_companies(tickers=[db_company.ticker])
+            get_search_index().upsert(db_company.id, db_company.ticker, db_company.name, db_company.exchange)
+            get_fulltext_indexer().submit([company_document(db_company)])
             return db_company
         except IntegrityError as e:
             # Rollback on error
@@ -63,6 +109,76 @@ class CompanyRepository:
                 raise ValueError("Company name or ticker already exists")
             raise
     
+    def bulk_create(self, companies: Sequence[CompanyCreate]) -> CompanyBulkResult:
+        """
+        Insert many companies in a single transaction.
+        
+        Rows whose ticker is already taken by an existing company (or by an
+        earlier row of the same request) are reported as conflicts and
+        skipped, as create() would reject them; names may repeat, like they
+        may in the table. The rest are inserted with executemany in chunks of
+        BULK_BATCH_SIZE.
+        
+        Args:
+            companies: CompanyCreate models to insert
+            
+        Returns:
+            CompanyBulkResult: IDs of the inserted companies and per-row conflicts
+        """
+        batch_size = settings.BULK_BATCH_SIZE
+        conflicts: List[CompanyBulkConflict] = []
+        
+        # Tickers are unique (and so is every (name, ticker) pair): one IN()
+        # lookup per chunk instead of a query per row
+        taken_tickers = set()
+        for start in range(0, len(companies), batch_size):
+            chunk = companies[start:start + batch_size]
+            taken_tickers.update(self.db.scalars(
+                select(CompanyDB.ticker).where(CompanyDB.ticker.in_({c.ticker for c in chunk}))
+            ))
+        
+        to_insert = []
+        for index, company in enumerate(companies):
+            if company.ticker in taken_tickers:
+                conflicts.append(CompanyBulkConflict(
+                    index=index,
+                    name=company.name,
+                    ticker=company.ticker,
+                    reason="Company ticker already exists"
+                ))
+                continue
+            taken_tickers.add(company.ticker)
+            
+            # mode="json" turns HttpUrl into a plain string for the String column
+            row = company.model_dump(mode="json")
+            row["currency"] = row.get("currency") or "USD"
+            to_insert.append(row)
+        
+        created_ids: List[int] = []
+        try:
+            for start in range(0, len(to_insert), batch_size):
+                created_ids.extend(self.db.scalars(
+                    insert(CompanyDB).returning(CompanyDB.id, sort_by_parameter_order=True),
+                    to_insert[start:start + batch_size]
+                ).all())
+            self.db.commit()
+        except IntegrityError as e:
+            # A concurrent writer got in between the lookup and the insert;
+            # nothing from this batch is kept, so the request can be retried as-is
+            self.db.rollback()
+            raise ValueError("Bulk insert failed due to constraint violation")
+        
+        search_index = get_search_index()
+        for company_id, row in zip(created_ids, to_insert):
+            search_index.upsert(company_id, row["ticker"], row["name"], row.get("exchange"))
+        get_fulltext_indexer().submit([company_document({**row, "id": company_id}) for company_id, row in zip(created_ids, to_insert)])
+        
+        return CompanyBulkResult(
+            created_count=len(created_ids),
+            created_ids=created_ids,
+            conflicts=conflicts
+        )
+    
     def get_by_id(self, company_id: int) -> Optional[CompanyDB]:
         """
         Retrieve a company by its ID.
@@ -73,7 +189,7 @@ class CompanyRepository:
         Returns:
             CompanyDB or None: The company if found, None otherwise
         """
-        return self.db.query(CompanyDB).filter(CompanyDB.id == company_id).first()
+        return self.db.scalar(company_by_id_query(company_id))
     
     def get_by_ticker(self, ticker: str) -> Optional[CompanyDB]:
         """
@@ -85,20 +201,116 @@ class CompanyRepository:
         Returns:
             CompanyDB or None: The company if found, None otherwise
         """
-        return self.db.query(CompanyDB).filter(CompanyDB.ticker == ticker).first()
+        return self.db.scalar(company_by_ticker_query(ticker))
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[CompanyDB]:
+    def get_by_ids(self, company_ids: Sequence[int]) -> List[CompanyDB]:
         """
-        Retrieve all companies with pagination support.
+        Retrieve many companies by ID, one IN() query per BULK_BATCH_SIZE IDs.
         
         Args:
-            skip: Number of records to skip (for pagination)
+            company_ids: IDs to look up
+            
+        Returns:
+            List[CompanyDB]: The companies found, in no particular order; unknown IDs are left out
+        """
+        found = []
+        for query in companies_by_ids_queries(company_ids):
+            found.extend(self.db.scalars(query))
+        return found
+    
+    def get_by_tickers(self, tickers: Sequence[str]) -> List[CompanyDB]:
+        """
+        Retrieve many companies by ticker symbol, one IN() query per BULK_BATCH_SIZE tickers.
+        
+        Args:
+            tickers: Ticker symbols to look up
+            
+        Returns:
+            List[CompanyDB]: The companies found, in no particular order; unknown tickers are left out
+        """
+        found = []
+        for query in companies_by_tickers_queries(tickers):
+            found.extend(self.db.scalars(query))
+        return found
+    
+    def search(self, query: str, limit: int = 10) -> List[Any]:
+        """
+        Type-ahead search in PostgreSQL (COMPANY_SEARCH_BACKEND=postgres).
+        
+        Matches the folded query as a substring of, or by pg_trgm word
+        similarity to, company_search_key(ticker || ' ' || name), both served
+        by the ix_companies_search_trgm index, and ranks like the in-memory
+        index: exact ticker, ticker prefix, name prefix, word prefix, then
+        similarity.
+        
+        Args:
+            query: What the user typed
+            limit: Maximum number of results
+        
+        Returns:
+            List[Row]: Rows with id, ticker, name, exchange and score, best first
+        """
+        folded = normalize(query)
+        if not folded:
+            return []
+        compact = folded.replace(" ", "")
+        document = func.company_search_key(CompanyDB.ticker + " " + CompanyDB.name)
+        ticker_key = func.replace(func.company_search_key(CompanyDB.ticker), " ", "")
+        name_key = func.company_search_key(CompanyDB.name)
+        term = literal(folded)
+        score = case(
+            (ticker_key == compact, EXACT_TICKER),
+            (ticker_key.startswith(compact), TICKER_PREFIX),
+            (name_key.startswith(folded), NAME_PREFIX),
+            (name_key.contains(" " + folded), WORD_PREFIX),
+            else_=func.word_similarity(term, document) * 0.5
+        ).label("score")
+        return list(self.db.execute(
+            select(CompanyDB.id, CompanyDB.ticker, CompanyDB.name, CompanyDB.exchange, score)
+            .where(or_(document.contains(folded), term.op("<%")(document)))
+            .order_by(score.desc(), func.length(CompanyDB.name), CompanyDB.ticker)
+            .limit(limit)
+        ))
+    
+    def get_all(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CompanyDB]:
+        """
+        Retrieve all companies ordered by ID with pagination support.
+        
+        Args:
+            skip: Number of records to skip (ignored when after_id is given)
             limit: Maximum number of records to return
+            after_id: Keyset cursor - return only companies with a greater ID
             
         Returns:
             List[CompanyDB]: List of companies
         """
-        return self.db.query(CompanyDB).offset(skip).limit(limit).all()
+        return list(self.db.scalars(companies_page_query(skip, limit, after_id)))
+    
+    def mark_data_updated(self, company_ids: Sequence[int], updated_at: Optional[datetime] = None) -> int:
+        """
+        Set last_data_update for many companies, one UPDATE per BULK_BATCH_SIZE IDs,
+        in a single transaction.
+        
+        Args:
+            company_ids: IDs of the companies whose data was refreshed
+            updated_at: Refresh time (defaults to now)
+            
+        Returns:
+            int: Number of companies updated
+        """
+        updated_at = updated_at or datetime.now(timezone.utc)
+        unique_ids = list(dict.fromkeys(company_ids))
+        tickers = []
+        updated = 0
+        for start in range(0, len(unique_ids), settings.BULK_BATCH_SIZE):
+            chunk = unique_ids[start:start + settings.BULK_BATCH_SIZE]
+            tickers.extend(self.db.scalars(select(CompanyDB.ticker).where(CompanyDB.id.in_(chunk))))
+            updated += self.db.execute(
+                update(CompanyDB).where(CompanyDB.id.in_(chunk)).values(last_data_update=updated_at)
+            ).rowcount
+        self.db.commit()
+        invalidate_companies(unique_ids, tickers=tickers)
+        return updated
     
     def update(self, company_id: int, company_update: CompanyUpdate) -> Optional[CompanyDB]:
         """
@@ -136,6 +348,8 @@ class CompanyRepository:
             if existing:
                 raise ValueError("Company name or ticker already exists")
         
+        old_ticker = db_company.ticker
+        
         # Update fields
         for field, value in update_data.items():
             setattr(db_company, field, value)
@@ -146,6 +360,10 @@ class CompanyRepository:
         try:
             self.db.commit()
             self.db.refresh(db_company)
+            invalidate_companies([company_id], tickers={old_ticker, db_company.ticker})
+            invalidate_aggregates()
+            get_search_index().upsert(db_company.id, db_company.ticker, db_company.name, db_company.exchange)
+            get_fulltext_indexer().submit([company_document(db_company)])
             return db_company
         except IntegrityError as e:
             self.db.rollback()
@@ -165,9 +383,15 @@ class CompanyRepository:
         if not db_company:
             return False
         
+        ticker = db_company.ticker
+        
         # Delete the company (cascade will handle related financial metrics)
         self.db.delete(db_company)
         self.db.commit()
+        invalidate_companies([company_id], tickers=[ticker])
+        invalidate_company_metrics([company_id])
+        get_search_index().remove(company_id)
+        get_fulltext_indexer().submit(deletes=[company_id])
         return True
     
     def is_unique(self, name: str, ticker: str, exclude_id: Optional[int] = None) -> bool:
@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database_models import CompanyDB, FactorScoreDB
+from app.models.factors import CompanyFactors, FactorValue
+from app.services.factor_engine import FACTOR_METRICS, day_range
+
+# Columns of every factor row read, in the order the API groups them
+FACTOR_ROW_COLUMNS = (
+    FactorScoreDB.company_id,
+    CompanyDB.ticker,
+    CompanyDB.sector,
+    FactorScoreDB.period_type,
+    FactorScoreDB.period_end,
+    FactorScoreDB.metric,
+    FactorScoreDB.percentile,
+    FactorScoreDB.zscore,
+    FactorScoreDB.peers,
+)
+
+
+def group_factor_rows(rows: Iterable[Any]) -> Iterator[CompanyFactors]:
+    """
+    Fold factor rows, ordered so each company period's metrics are adjacent,
+    into one CompanyFactors per company and period.
+    """
+    current = None
+    for row in rows:
+        key = (row.company_id, row.period_type, row.period_end)
+        if current is None or key != (current.company_id, current.period_type, current.period_end):
+            if current is not None:
+                yield current
+            current = CompanyFactors(
+                company_id=row.company_id,
+                ticker=row.ticker,
+                sector=row.sector,
+                period_type=row.period_type,
+                period_end=row.period_end
+            )
+        current.factors[row.metric] = FactorValue(percentile=row.percentile, zscore=row.zscore, peers=row.peers)
+    if current is not None:
+        yield current
+
+
+class FactorRepository:
+    """
+    Repository for reading stored factor scores (factor_scores table).
+    Scores are written by app.services.factor_engine.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def _metric_filter(metrics: Optional[Sequence[str]]):
+        """
+        Raises:
+            ValueError: If a metric is not scored
+        """
+        if metrics is None:
+            return []
+        unknown = [metric for metric in metrics if metric not in FACTOR_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown factor metrics: {', '.join(unknown)}")
+        return [FactorScoreDB.metric.in_(metrics)]
+    
+    def _query(self):
+        return select(*FACTOR_ROW_COLUMNS).join(CompanyDB, CompanyDB.id == FactorScoreDB.company_id)
+    
+    def get_by_company(
+        self,
+        company_id: int,
+        period_type: Optional[str] = None,
+        metrics: Optional[Sequence[str]] = None
+    ) -> List[Any]:
+        """
+        All scores of a company, newest period first.
+        
+        Args:
+            company_id: Company to read
+            period_type: Only periods of this type
+            metrics: Only these metrics (all if None)
+        
+        Returns:
+            List[Row]: Rows with the FACTOR_ROW_COLUMNS, grouped by period
+        
+        Raises:
+            ValueError: If a metric is not scored
+        """
+        query = self._query().where(FactorScoreDB.company_id == company_id, *self._metric_filter(metrics))
+        if period_type is not None:
+            query = query.where(FactorScoreDB.period_type == period_type)
+        return list(self.db.execute(
+            query.order_by(FactorScoreDB.period_end.desc(), FactorScoreDB.period_type, FactorScoreDB.metric)
+        ))
+    
+    def iter_by_period(
+        self,
+        period_end: date,
+        period_type: Optional[str] = None,
+        sector: Optional[str] = None,
+        metrics: Optional[Sequence[str]] = None
+    ) -> Iterator[Any]:
+        """
+        Scores of every company for periods ending on a day, streamed
+        BULK_BATCH_SIZE rows at a time.
+        
+        Args:
+            period_end: Day the periods end on
+            period_type: Only periods of this type
+            sector: Only companies of this sector
+            metrics: Only these metrics (all if None)
+        
+        Returns:
+            Iterator[Row]: Rows with the FACTOR_ROW_COLUMNS, grouped by company and period
+        
+        Raises:
+            ValueError: If a metric is not scored (raised before any row is read)
+        """
+        start, end = day_range(period_end)
+        query = self._query().where(
+            FactorScoreDB.period_end >= start, FactorScoreDB.period_end < end, *self._metric_filter(metrics)
+        )
+        if period_type is not None:
+            query = query.where(FactorScoreDB.period_type == period_type)
+        if sector is not None:
+            query = query.where(CompanyDB.sector == sector)
+        query = query.order_by(
+            FactorScoreDB.period_type, FactorScoreDB.company_id, FactorScoreDB.period_end, FactorScoreDB.metric
+        ).execution_options(yield_per=settings.BULK_BATCH_SIZE)
+        return iter(self.db.execute(query))
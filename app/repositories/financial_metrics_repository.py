@@ -1,10 +1,195 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, delete, func, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
-from app.models.database_models import FinancialMetricsDB
-from app.models.financial_metrics import FinancialMetricsCreate, FinancialMetricsUpdate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from app.core.cache import invalidate_aggregates, invalidate_company_metrics
+from app.core.config import settings
+from app.models.database_models import CompanyDB, FinancialMetricsDB, LatestFinancialMetricsDB
+from app.models.financial_metrics import (
+    FinancialMetricsBase,
+    FinancialMetricsCreate,
+    FinancialMetricsUpdate,
+    FinancialMetricsBulkUpsertResult,
+)
 from datetime import datetime, timezone
 
+# Columns of the financial_metrics table that can be written from API models
+METRIC_COLUMNS: List[str] = [
+    name for name in FinancialMetricsBase.model_fields
+    if name in FinancialMetricsDB.__table__.columns
+]
+
+# Natural key backed by the uq_metrics_company_period constraint
+PERIOD_KEY_COLUMNS = ("company_id", "period_end", "period_type")
+
+# Columns always returned by projected (fields=...) reads: row identity plus what cursors need
+PROJECTION_KEY_COLUMNS = ("id",) + PERIOD_KEY_COLUMNS
+
+
+def projection_entities(fields: Optional[Sequence[str]]):
+    """
+    Query entities for a read: the full FinancialMetricsDB entity, or only the
+    key columns plus the requested columns when `fields` is given.
+    Column queries return plain rows and skip the ORM identity map.
+    
+    Raises:
+        ValueError: If a field is not a financial_metrics column
+    """
+    if fields is None:
+        return (FinancialMetricsDB,)
+    unknown = [field for field in fields if field not in FinancialMetricsDB.__table__.columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    columns = list(PROJECTION_KEY_COLUMNS) + [field for field in fields if field not in PROJECTION_KEY_COLUMNS]
+    return tuple(getattr(FinancialMetricsDB, column) for column in dict.fromkeys(columns))
+
+
+def _period_key(company_id: int, period_end: datetime, period_type: str) -> Tuple[int, datetime, str]:
+    """
+    Build a comparable (company_id, period_end, period_type) key.
+    Postgres returns timezone-aware datetimes and SQLite naive ones,
+    so period_end is normalised to naive UTC.
+    """
+    if period_end.tzinfo is not None:
+        period_end = period_end.astimezone(timezone.utc).replace(tzinfo=None)
+    return company_id, period_end, period_type
+
+
+def latest_rows_query(company_ids: Optional[Sequence[int]] = None):
+    """
+    Select (company_id, period_type, metrics_id, period_end) of the most
+    recent financial_metrics row per company and period type, i.e. the
+    content of latest_financial_metrics. The GROUP BY is answered from
+    ix_metrics_type_company_period.
+    """
+    newest = select(
+        FinancialMetricsDB.company_id,
+        FinancialMetricsDB.period_type,
+        func.max(FinancialMetricsDB.period_end).label("period_end")
+    ).group_by(FinancialMetricsDB.period_type, FinancialMetricsDB.company_id)
+    if company_ids is not None:
+        newest = newest.where(FinancialMetricsDB.company_id.in_(company_ids))
+    newest = newest.subquery("newest")
+    
+    return select(
+        FinancialMetricsDB.company_id,
+        FinancialMetricsDB.period_type,
+        FinancialMetricsDB.id,
+        FinancialMetricsDB.period_end
+    ).join(newest, and_(
+        FinancialMetricsDB.company_id == newest.c.company_id,
+        FinancialMetricsDB.period_type == newest.c.period_type,
+        FinancialMetricsDB.period_end == newest.c.period_end
+    ))
+
+
+def _chunks(items: List[Any], size: int):
+    """Yield successive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Read queries shared by FinancialMetricsRepository and AsyncFinancialMetricsRepository,
+# which only differ in how they execute them. Queries built with `fields` select
+# plain rows instead of entities, see projection_entities.
+
+def metrics_by_id_query(metrics_id: int) -> Select:
+    """Select one financial metrics row by ID."""
+    return select(FinancialMetricsDB).where(FinancialMetricsDB.id == metrics_id)
+
+
+def metrics_page_query(
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Select:
+    """
+    Select a page of financial metrics ordered by ID, after the keyset
+    cursor `after_id` if given, otherwise after `skip` rows.
+    """
+    query = select(*projection_entities(fields)).order_by(FinancialMetricsDB.id).limit(limit)
+    if after_id is not None:
+        return query.where(FinancialMetricsDB.id > after_id)
+    return query.offset(skip)
+
+
+def company_metrics_query(
+    company_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime, int]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Select:
+    """
+    Select a page of one company's financial metrics, newest period first,
+    after the keyset cursor `before` = (period_end, id) if given, otherwise
+    after `skip` rows.
+    """
+    query = select(*projection_entities(fields)).where(
+        FinancialMetricsDB.company_id == company_id
+    ).order_by(FinancialMetricsDB.period_end.desc(), FinancialMetricsDB.id.desc()).limit(limit)
+    if before is not None:
+        period_end, metrics_id = before
+        return query.where(or_(
+            FinancialMetricsDB.period_end < period_end,
+            and_(FinancialMetricsDB.period_end == period_end, FinancialMetricsDB.id < metrics_id)
+        ))
+    return query.offset(skip)
+
+
+def recent_metrics_queries(
+    company_ids: Sequence[int],
+    last_n: int,
+    period_type: Optional[str] = None
+) -> List[Select]:
+    """
+    Select the last `last_n` periods of many companies, one windowed query
+    (ROW_NUMBER() per company, newest first) per BULK_BATCH_SIZE companies.
+    """
+    queries = []
+    for chunk in _chunks(list(dict.fromkeys(company_ids)), settings.BULK_BATCH_SIZE):
+        ranked = select(
+            FinancialMetricsDB,
+            func.row_number().over(
+                partition_by=FinancialMetricsDB.company_id,
+                order_by=(FinancialMetricsDB.period_end.desc(), FinancialMetricsDB.id.desc())
+            ).label("period_rank")
+        ).where(FinancialMetricsDB.company_id.in_(chunk))
+        if period_type is not None:
+            ranked = ranked.where(FinancialMetricsDB.period_type == period_type)
+        ranked = ranked.subquery("ranked")
+        
+        recent = aliased(FinancialMetricsDB, ranked)
+        queries.append(select(recent).where(ranked.c.period_rank <= last_n).order_by(
+            recent.company_id, recent.period_end.desc(), recent.id.desc()
+        ))
+    return queries
+
+
+def latest_metrics_queries(
+    company_ids: Optional[Sequence[int]] = None,
+    period_type: str = "annual",
+    fields: Optional[Sequence[str]] = None
+) -> List[Select]:
+    """
+    Select the most recent financial metrics per company through the
+    latest_financial_metrics snapshot, ordered by company ID: one query for
+    every company, or one per BULK_BATCH_SIZE of `company_ids`.
+    """
+    query = select(*projection_entities(fields)).join(
+        LatestFinancialMetricsDB, LatestFinancialMetricsDB.metrics_id == FinancialMetricsDB.id
+    ).where(
+        LatestFinancialMetricsDB.period_type == period_type
+    ).order_by(LatestFinancialMetricsDB.company_id)
+    if company_ids is None:
+        return [query]
+    return [
+        query.where(LatestFinancialMetricsDB.company_id.in_(chunk))
+        for chunk in _chunks(sorted(set(company_ids)), settings.BULK_BATCH_SIZE)
+    ]
+
 class FinancialMetricsRepository:
     """
     Repository class for financial metrics database operations.
@@ -62,16 +247,227 @@ class FinancialMetricsRepository:
         self.db.add(db_metrics)
         
         try:
+            self.db.flush()
+            self._refresh_latest([db_metrics.company_id])
             # Commit the transaction
             self.db.commit()
             # Refresh to get database-generated values
             self.db.refresh(db_metrics)
+            invalidate_company_metrics([db_metrics.company_id])
             return db_metrics
         except IntegrityError as e:
             # Rollback on error
             self.db.rollback()
             raise ValueError("Failed to create financial metrics")
     
+    def bulk_upsert(self, metrics: Sequence[FinancialMetricsCreate]) -> FinancialMetricsBulkUpsertResult:
+        """
+        Insert or update many financial metrics rows keyed on
+        (company_id, period_end, period_type).
+        
+        Each chunk of BULK_BATCH_SIZE rows costs one SELECT to classify rows as
+        new/changed/unchanged and one INSERT ... ON CONFLICT DO UPDATE for the
+        rows that need writing. All chunks run in a single transaction.
+        An upserted row replaces every metric column, so fields left out of
+        the request are stored as NULL.
+        
+        Args:
+            metrics: FinancialMetricsCreate models to upsert
+            
+        Returns:
+            FinancialMetricsBulkUpsertResult: inserted/updated/unchanged counts
+            
+        Raises:
+            ValueError: If the batch violates a database constraint
+        """
+        result = FinancialMetricsBulkUpsertResult()
+        
+        company_ids = {m.company_id for m in metrics}
+        known_ids = self.existing_company_ids(company_ids)
+        result.missing_company_ids = sorted(company_ids - known_ids)
+        
+        # Later rows for the same key win; ON CONFLICT cannot touch a row twice per statement
+        rows: Dict[Tuple[int, datetime, str], Dict[str, Any]] = {}
+        for m in metrics:
+            if m.company_id not in known_ids:
+                continue
+            row = {column: getattr(m, column) for column in PERIOD_KEY_COLUMNS}
+            for column in METRIC_COLUMNS:
+                value = getattr(m, column)
+                row[column] = float(value) if value is not None else None
+            rows[_period_key(m.company_id, m.period_end, m.period_type)] = row
+        
+        written_company_ids = set()
+        try:
+            for chunk in _chunks(list(rows.items()), settings.BULK_BATCH_SIZE):
+                existing = self._load_existing([key for key, _ in chunk])
+                to_write = []
+                for key, row in chunk:
+                    current = existing.get(key)
+                    if current is None:
+                        result.inserted += 1
+                    elif all(current[column] == row[column] for column in METRIC_COLUMNS):
+                        result.unchanged += 1
+                        continue
+                    else:
+                        result.updated += 1
+                    to_write.append(row)
+                if to_write:
+                    self._upsert_rows(to_write)
+                    written_company_ids.update(row["company_id"] for row in to_write)
+            self._refresh_latest(list(written_company_ids))
+            self.db.commit()
+            invalidate_company_metrics(written_company_ids)
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError("Bulk upsert failed due to constraint violation")
+        
+        return result
+    
+    def existing_company_ids(self, company_ids: Iterable[int]) -> Set[int]:
+        """
+        Return which of the given company IDs exist, one IN() query per BULK_BATCH_SIZE IDs.
+        """
+        known_ids = set()
+        for chunk in _chunks(list(set(company_ids)), settings.BULK_BATCH_SIZE):
+            known_ids.update(self.db.scalars(select(CompanyDB.id).where(CompanyDB.id.in_(chunk))))
+        return known_ids
+    
+    def _load_existing(self, keys: List[Tuple[int, datetime, str]]) -> Dict[Tuple[int, datetime, str], Dict[str, Any]]:
+        """
+        Fetch the metric columns of existing rows for the given period keys in one query.
+        """
+        wanted = set(keys)
+        columns = [getattr(FinancialMetricsDB, column) for column in PERIOD_KEY_COLUMNS + tuple(METRIC_COLUMNS)]
+        # Coarse filter on each key component; exact matches are picked out below
+        query = select(*columns).where(
+            FinancialMetricsDB.company_id.in_({key[0] for key in keys}),
+            FinancialMetricsDB.period_type.in_({key[2] for key in keys}),
+            FinancialMetricsDB.period_end.between(
+                min(key[1] for key in keys).replace(tzinfo=timezone.utc),
+                max(key[1] for key in keys).replace(tzinfo=timezone.utc)
+            )
+        )
+        
+        existing = {}
+        for row in self.db.execute(query).mappings():
+            key = _period_key(row["company_id"], row["period_end"], row["period_type"])
+            if key in wanted:
+                existing[key] = row
+        return existing
+    
+    def _upsert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write rows with INSERT ... ON CONFLICT DO UPDATE on uq_metrics_company_period.
+        Dialects without ON CONFLICT fall back to UPDATE-then-INSERT per row.
+        """
+        dialect = self.db.get_bind().dialect.name
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            row["updated_at"] = now
+        
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = dialect_insert(FinancialMetricsDB)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(PERIOD_KEY_COLUMNS),
+                set_={column: stmt.excluded[column] for column in METRIC_COLUMNS + ["updated_at"]}
+            )
+            self.db.execute(stmt, rows)
+            return
+        
+        for row in rows:
+            updated = self.db.query(FinancialMetricsDB).filter(
+                *(getattr(FinancialMetricsDB, column) == row[column] for column in PERIOD_KEY_COLUMNS)
+            ).update({column: row[column] for column in METRIC_COLUMNS + ["updated_at"]}, synchronize_session=False)
+            if not updated:
+                self.db.execute(insert(FinancialMetricsDB), [row])
+    
+    def _refresh_latest(self, company_ids: Sequence[int]) -> None:
+        """
+        Recompute the latest_financial_metrics rows of the given companies
+        from financial_metrics. Runs in the caller's transaction (no commit),
+        so the snapshot changes together with the metrics write.
+        
+        Updates of existing rows need no refresh: they cannot change
+        company_id, period_end or period_type, and the snapshot points at
+        the row rather than copying its values.
+        """
+        for chunk in _chunks(list(company_ids), settings.BULK_BATCH_SIZE):
+            self.db.execute(delete(LatestFinancialMetricsDB).where(LatestFinancialMetricsDB.company_id.in_(chunk)))
+            self.db.execute(insert(LatestFinancialMetricsDB).from_select(
+                ["company_id", "period_type", "metrics_id", "period_end"],
+                latest_rows_query(chunk)
+            ))
+    
+    def rebuild_latest(self) -> int:
+        """
+        Rebuild the whole latest_financial_metrics table with one
+        INSERT ... SELECT, e.g. after creating the table on an existing
+        database or after writes that bypassed this repository.
+        
+        Returns:
+            int: Number of snapshot rows written
+            
+        Raises:
+            ValueError: If the rebuild hits a constraint violation
+        """
+        try:
+            self.db.execute(delete(LatestFinancialMetricsDB))
+            self.db.execute(insert(LatestFinancialMetricsDB).from_select(
+                ["company_id", "period_type", "metrics_id", "period_end"],
+                latest_rows_query()
+            ))
+            count = self.db.scalar(select(func.count()).select_from(LatestFinancialMetricsDB))
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError("Rebuild of latest financial metrics failed due to constraint violation")
+        
+        invalidate_aggregates()
+        return count
+    
+    def ensure_latest(self) -> Optional[int]:
+        """
+        Rebuild latest_financial_metrics if it is empty while financial_metrics
+        is not, i.e. on a database created or seeded before the snapshot was
+        maintained, or filled without this repository.
+        
+        Returns:
+            int or None: Snapshot rows written, None if no rebuild was needed
+        """
+        snapshot_empty = self.db.scalar(select(LatestFinancialMetricsDB.company_id).limit(1)) is None
+        if not snapshot_empty or self.db.scalar(select(FinancialMetricsDB.id).limit(1)) is None:
+            return None
+        return self.rebuild_latest()
+    
+    def get_latest(
+        self,
+        company_ids: Optional[Sequence[int]] = None,
+        period_type: str = "annual",
+        fields: Optional[Sequence[str]] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve the most recent financial metrics of many companies at once
+        through the latest_financial_metrics snapshot.
+        
+        Args:
+            company_ids: Companies to return; every company if None
+            period_type: Period type whose latest row is returned
+            fields: Only select these columns (plus PROJECTION_KEY_COLUMNS) and
+                return rows instead of ORM entities
+            
+        Returns:
+            List[FinancialMetricsDB]: At most one row per company, ordered by company ID
+            
+        Raises:
+            ValueError: If fields contains an unknown column
+        """
+        results = []
+        for query in latest_metrics_queries(company_ids, period_type, fields):
+            results.extend(self._fetch(query, fields))
+        return results
+    
     def get_by_id(self, metrics_id: int) -> Optional[FinancialMetricsDB]:
         """
         Retrieve financial metrics by ID.
@@ -82,36 +478,159 @@ class FinancialMetricsRepository:
         Returns:
             FinancialMetricsDB or None: The metrics if found, None otherwise
         """
-        return self.db.query(FinancialMetricsDB).filter(FinancialMetricsDB.id == metrics_id).first()
+        return self.db.scalar(metrics_by_id_query(metrics_id))
     
-    def get_by_company(self, company_id: int, skip: int = 0, limit: int = 100) -> List[FinancialMetricsDB]:
+    def get_by_company(
+        self,
+        company_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, int]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[FinancialMetricsDB]:
         """
-        Retrieve all financial metrics for a specific company.
+        Retrieve all financial metrics for a specific company, newest period first.
         
         Args:
             company_id: The ID of the company
-            skip: Number of records to skip (for pagination)
+            skip: Number of records to skip (ignored when before is given)
             limit: Maximum number of records to return
+            before: Keyset cursor - (period_end, id) of the last row already seen
+            fields: Only select these columns (plus PROJECTION_KEY_COLUMNS) and
+                return rows instead of ORM entities
             
         Returns:
             List[FinancialMetricsDB]: List of financial metrics for the company
+            
+        Raises:
+            ValueError: If fields contains an unknown column
         """
-        return self.db.query(FinancialMetricsDB).filter(
-            FinancialMetricsDB.company_id == company_id
-        ).order_by(FinancialMetricsDB.period_end.desc()).offset(skip).limit(limit).all()
+        return self._fetch(company_metrics_query(company_id, skip, limit, before, fields), fields)
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[FinancialMetricsDB]:
+    def get_by_companies(self, company_ids: Sequence[int], period_type: Optional[str] = None) -> List[FinancialMetricsDB]:
         """
-        Retrieve all financial metrics with pagination.
+        Retrieve the financial metrics of many companies, one IN() query per
+        BULK_BATCH_SIZE companies.
         
         Args:
-            skip: Number of records to skip (for pagination)
+            company_ids: The IDs of the companies
+            period_type: Only return periods of this type (all types if None)
+            
+        Returns:
+            List[FinancialMetricsDB]: Metrics grouped by company, newest period first
+        """
+        results = []
+        for chunk in _chunks(list(dict.fromkeys(company_ids)), settings.BULK_BATCH_SIZE):
+            query = self.db.query(FinancialMetricsDB).filter(FinancialMetricsDB.company_id.in_(chunk))
+            if period_type is not None:
+                query = query.filter(FinancialMetricsDB.period_type == period_type)
+            results.extend(query.order_by(
+                FinancialMetricsDB.company_id, FinancialMetricsDB.period_end.desc(), FinancialMetricsDB.id.desc()
+            ).all())
+        return results
+    
+    def get_recent_by_companies(
+        self,
+        company_ids: Sequence[int],
+        last_n: int,
+        period_type: Optional[str] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve the last `last_n` periods of many companies with one windowed
+        query per BULK_BATCH_SIZE companies (ROW_NUMBER() per company, newest
+        first), instead of walking CompanyDB.financial_metrics per company.
+        
+        Args:
+            company_ids: The IDs of the companies
+            last_n: Number of most recent periods to return per company
+            period_type: Only consider periods of this type (all types if None)
+            
+        Returns:
+            List[FinancialMetricsDB]: Metrics grouped by company, newest period first
+        """
+        results = []
+        for query in recent_metrics_queries(company_ids, last_n, period_type):
+            results.extend(self.db.scalars(query))
+        return results
+    
+    def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[FinancialMetricsDB]:
+        """
+        Retrieve all financial metrics ordered by ID with pagination.
+        
+        Args:
+            skip: Number of records to skip (ignored when after_id is given)
             limit: Maximum number of records to return
+            after_id: Keyset cursor - return only rows with a greater ID
+            fields: Only select these columns (plus PROJECTION_KEY_COLUMNS) and
+                return rows instead of ORM entities
             
         Returns:
             List[FinancialMetricsDB]: List of financial metrics
+            
+        Raises:
+            ValueError: If fields contains an unknown column
         """
-        return self.db.query(FinancialMetricsDB).offset(skip).limit(limit).all()
+        return self._fetch(metrics_page_query(skip, limit, after_id, fields), fields)
+    
+    def _fetch(self, query: Select, fields: Optional[Sequence[str]]) -> list:
+        """
+        Run a read built from projection_entities: entities for full reads, rows for projections.
+        """
+        if fields is None:
+            return list(self.db.scalars(query))
+        return list(self.db.execute(query).all())
+    
+    def export(
+        self,
+        company_ids: Optional[Sequence[int]] = None,
+        period_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Any], Iterator[List[Any]]]:
+        """
+        Stream financial metrics rows for an export, ordered by ID.
+        
+        Rows are read from a server-side cursor (yield_per) as plain tuples,
+        BULK_BATCH_SIZE at a time, so the export never holds more than one
+        batch in memory and skips the ORM identity map.
+        
+        Args:
+            company_ids: Only export these companies (all if None)
+            period_type: Only export periods of this type (all if None)
+            start: First period_end to include (None for no lower bound)
+            end: Last period_end to include (None for no upper bound)
+            fields: Only export these columns (plus PROJECTION_KEY_COLUMNS); all columns if None
+            
+        Returns:
+            Tuple of the selected Column objects and an iterator of row batches
+            
+        Raises:
+            ValueError: If fields contains an unknown column
+        """
+        if fields is None:
+            columns = list(FinancialMetricsDB.__table__.columns)
+        else:
+            columns = [entity.expression for entity in projection_entities(fields)]
+        
+        query = select(*columns).order_by(FinancialMetricsDB.id)
+        if company_ids is not None:
+            query = query.where(FinancialMetricsDB.company_id.in_(company_ids))
+        if period_type is not None:
+            query = query.where(FinancialMetricsDB.period_type == period_type)
+        if start is not None:
+            query = query.where(FinancialMetricsDB.period_end >= start)
+        if end is not None:
+            query = query.where(FinancialMetricsDB.period_end <= end)
+        
+        result = self.db.execute(query.execution_options(yield_per=settings.BULK_BATCH_SIZE))
+        return columns, result.partitions()
     
     def update(self, metrics_id: int, metrics_update: FinancialMetricsUpdate) -> Optional[FinancialMetricsDB]:
         """
@@ -142,6 +661,7 @@ class FinancialMetricsRepository:
         try:
             self.db.commit()
             self.db.refresh(db_metrics)
+            invalidate_company_metrics([db_metrics.company_id])
             return db_metrics
         except IntegrityError as e:
             self.db.rollback()
@@ -161,9 +681,14 @@ class FinancialMetricsRepository:
         if not db_metrics:
             return False
         
-        # Delete the metrics
+        company_id = db_metrics.company_id
+        
+        # Delete the metrics; the company's previous period becomes its latest
         self.db.delete(db_metrics)
+        self.db.flush()
+        self._refresh_latest([company_id])
         self.db.commit()
+        invalidate_company_metrics([company_id])
         return True
     
     def is_unique(self, company_id: int, period_end: datetime, period_type: str, exclude_id: Optional[int] = None) -> bool:
@@ -0,0 +1,164 @@
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import Dict, Iterator, List, Optional, Sequence
+from app.core.config import settings
+from app.models.database_models import HistoricalDataDB
+from app.models.historical_data import HistoricalDataBase, HistoricalDataCreate
+from datetime import datetime
+from decimal import Decimal
+
+# Columns of the historical_data table that can be written from API models
+PRICE_COLUMNS: List[str] = [
+    name for name in HistoricalDataBase.model_fields
+    if name in HistoricalDataDB.__table__.columns
+]
+
+class HistoricalDataRepository:
+    """
+    Repository class for historical price data (OHLCV bars and indicators).
+    All reads are range scans over the (company_id, date) primary key.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _range_query(self, company_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """
+        Build the select for one company's bars between start and end (both inclusive).
+        """
+        query = select(HistoricalDataDB).where(HistoricalDataDB.company_id == company_id)
+        if start is not None:
+            query = query.where(HistoricalDataDB.date >= start)
+        if end is not None:
+            query = query.where(HistoricalDataDB.date <= end)
+        return query.order_by(HistoricalDataDB.date)
+    
+    def get_range(
+        self,
+        company_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[HistoricalDataDB]:
+        """
+        Retrieve a company's bars in a date range, oldest first.
+        
+        Args:
+            company_id: The ID of the company
+            start: First date to include (None for no lower bound)
+            end: Last date to include (None for no upper bound)
+            limit: Maximum number of bars to return
+        
+        Returns:
+            List[HistoricalDataDB]: Bars ordered by date
+        """
+        query = self._range_query(company_id, start, end)
+        if limit is not None:
+            query = query.limit(limit)
+        return list(self.db.scalars(query))
+    
+    def iter_range(
+        self,
+        company_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[HistoricalDataDB]:
+        """
+        Stream a company's bars in a date range without loading them all in memory.
+        Rows are fetched from a server-side cursor in batches of BULK_BATCH_SIZE.
+        
+        Args:
+            company_id: The ID of the company
+            start: First date to include (None for no lower bound)
+            end: Last date to include (None for no upper bound)
+        
+        Yields:
+            HistoricalDataDB: Bars ordered by date
+        """
+        query = self._range_query(company_id, start, end).execution_options(
+            yield_per=settings.BULK_BATCH_SIZE
+        )
+        for bar in self.db.scalars(query):
+            yield bar
+    
+    def get_last_date(self, company_id: int) -> Optional[datetime]:
+        """
+        Get the date of the most recent stored bar for a company.
+        
+        Args:
+            company_id: The ID of the company
+        
+        Returns:
+            datetime or None: Date of the latest bar, None if there are no bars
+        """
+        return self.db.scalar(
+            select(func.max(HistoricalDataDB.date)).where(HistoricalDataDB.company_id == company_id)
+        )
+    
+    def get_last_dates(self, company_ids: Sequence[int]) -> Dict[int, datetime]:
+        """
+        Get the date of the most recent stored bar for many companies,
+        one grouped query per BULK_BATCH_SIZE IDs.
+        
+        Args:
+            company_ids: IDs of the companies
+        
+        Returns:
+            Dict[int, datetime]: Latest bar date by company ID; companies without bars are left out
+        """
+        last_dates: Dict[int, datetime] = {}
+        unique_ids = list(dict.fromkeys(company_ids))
+        for start in range(0, len(unique_ids), settings.BULK_BATCH_SIZE):
+            chunk = unique_ids[start:start + settings.BULK_BATCH_SIZE]
+            last_dates.update(self.db.execute(
+                select(HistoricalDataDB.company_id, func.max(HistoricalDataDB.date))
+                .where(HistoricalDataDB.company_id.in_(chunk))
+                .group_by(HistoricalDataDB.company_id)
+            ).all())
+        return last_dates
+    
+    def bulk_append(self, bars: Sequence[HistoricalDataCreate]) -> int:
+        """
+        Append many bars in a single transaction.
+        Bars whose (company_id, date) is already stored are skipped, so
+        re-sending an overlapping download is harmless.
+        
+        Args:
+            bars: HistoricalDataCreate models to insert
+        
+        Returns:
+            int: Number of bars actually inserted
+        
+        Raises:
+            ValueError: If the batch violates a database constraint
+        """
+        rows = []
+        for bar in bars:
+            row = {"company_id": bar.company_id}
+            for column in PRICE_COLUMNS:
+                value = getattr(bar, column)
+                row[column] = float(value) if isinstance(value, Decimal) else value
+            rows.append(row)
+        
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(HistoricalDataDB).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(HistoricalDataDB).on_conflict_do_nothing()
+        else:
+            stmt = insert(HistoricalDataDB)
+        stmt = stmt.returning(HistoricalDataDB.company_id)
+        
+        inserted = 0
+        batch_size = settings.BULK_BATCH_SIZE
+        try:
+            for start in range(0, len(rows), batch_size):
+                inserted += len(self.db.scalars(stmt, rows[start:start + batch_size]).all())
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError("Bulk append failed due to constraint violation")
+        
+        return inserted
@@ -0,0 +1,274 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import and_, bindparam, case, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database_models import CompanyDB, HistoricalDataDB, RefreshStateDB
+
+
+@dataclass(frozen=True)
+class RefreshTier:
+    """Companies with at least min_market_cap are refreshed on this tier's schedule."""
+    tier: int
+    name: str
+    min_market_cap: float
+
+
+# Highest market cap first; companies without a known market cap go to DEFAULT_TIER
+REFRESH_TIERS = (
+    RefreshTier(1, "large", 10e9),
+    RefreshTier(2, "mid", 2e9),
+    RefreshTier(3, "small", 0.0),
+)
+DEFAULT_TIER = 3
+
+# How old a company's data may get before it is due again, by data type and tier
+MAX_AGE: Dict[str, Dict[int, timedelta]] = {
+    "prices": {1: timedelta(hours=4), 2: timedelta(hours=12), 3: timedelta(days=1)},
+    "metrics": {1: timedelta(days=1), 2: timedelta(days=3), 3: timedelta(days=7)},
+}
+
+# A company whose last refresh failed is not retried before this delay
+FAILURE_RETRY_DELAY = timedelta(minutes=30)
+
+# Assumed fetch cost of a company that has never been fetched
+DEFAULT_COST_MS = 500.0
+# Weight of the newest measurement in the cost moving average
+COST_SMOOTHING = 0.3
+
+
+def tier_for_market_cap(market_cap: Optional[float]) -> int:
+    if market_cap is None:
+        return DEFAULT_TIER
+    for tier in REFRESH_TIERS:
+        if market_cap >= tier.min_market_cap:
+            return tier.tier
+    return DEFAULT_TIER
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite hands timezone-aware columns back naive; they are stored in UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class RefreshRepository:
+    """
+    Repository for the refresh bookkeeping of the data collectors
+    (refresh_state table).
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _cutoff(self, data_type: str, now: datetime):
+        """
+        SQL expression for the refreshed_at before which a row of `data_type` is stale,
+        depending on the row's tier.
+        """
+        ages = MAX_AGE[data_type]
+        return case(
+            *((RefreshStateDB.tier == tier, now - age) for tier, age in ages.items()),
+            else_=now - ages[DEFAULT_TIER]
+        )
+    
+    def _stale(self, data_type: str, now: datetime):
+        return or_(RefreshStateDB.refreshed_at.is_(None), RefreshStateDB.refreshed_at < self._cutoff(data_type, now))
+    
+    def sync_companies(self, data_type: str) -> int:
+        """
+        Add refresh_state rows for companies that do not have one for `data_type` yet,
+        in one INSERT ... SELECT. New rows start from the company's last_data_update.
+        
+        Args:
+            data_type: Data type key of MAX_AGE
+        
+        Returns:
+            int: Number of rows added
+        """
+        missing = select(
+            CompanyDB.id,
+            bindparam("data_type", data_type),
+            bindparam("tier", DEFAULT_TIER),
+            CompanyDB.last_data_update,
+            bindparam("failures", 0)
+        ).outerjoin(
+            RefreshStateDB,
+            and_(RefreshStateDB.company_id == CompanyDB.id, RefreshStateDB.data_type == data_type)
+        ).where(RefreshStateDB.company_id.is_(None))
+        result = self.db.execute(
+            insert(RefreshStateDB).from_select(
+                ["company_id", "data_type", "tier", "refreshed_at", "consecutive_failures"], missing
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+    
+    def assign_tiers(self) -> int:
+        """
+        Set the tier of every company from the market cap of its most
+        recent bar that has one, for all data types. Companies without a
+        known market cap keep their tier.
+        
+        Returns:
+            int: Number of companies whose market cap is known
+        """
+        for data_type in MAX_AGE:
+            self.sync_companies(data_type)
+        
+        last_dates = select(
+            HistoricalDataDB.company_id, func.max(HistoricalDataDB.date).label("date")
+        ).where(HistoricalDataDB.market_cap.is_not(None)).group_by(HistoricalDataDB.company_id).subquery()
+        market_caps = self.db.execute(
+            select(HistoricalDataDB.company_id, HistoricalDataDB.market_cap).join(
+                last_dates,
+                and_(HistoricalDataDB.company_id == last_dates.c.company_id, HistoricalDataDB.date == last_dates.c.date)
+            )
+        ).all()
+        
+        rows = [{"b_company_id": company_id, "b_tier": tier_for_market_cap(cap)} for company_id, cap in market_caps]
+        stmt = update(RefreshStateDB).where(RefreshStateDB.company_id == bindparam("b_company_id")).values(
+            tier=bindparam("b_tier")
+        ).execution_options(synchronize_session=False)
+        for start in range(0, len(rows), settings.BULK_BATCH_SIZE):
+            self.db.connection().execute(stmt, rows[start:start + settings.BULK_BATCH_SIZE])
+        self.db.commit()
+        return len(rows)
+    
+    def get_stale(self, data_type: str, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[Any]:
+        """
+        Active companies whose `data_type` data is due, most urgent first:
+        by tier, then never refreshed, then oldest refresh. Companies whose
+        last attempt failed are held back for FAILURE_RETRY_DELAY.
+        
+        Args:
+            data_type: Data type key of MAX_AGE
+            now: Reference time (defaults to now)
+            limit: Maximum number of companies to return
+        
+        Returns:
+            List[Row]: Rows with company_id, ticker, tier, refreshed_at and cost_ms
+        """
+        now = now or datetime.now(timezone.utc)
+        query = select(
+            RefreshStateDB.company_id,
+            CompanyDB.ticker,
+            RefreshStateDB.tier,
+            RefreshStateDB.refreshed_at,
+            RefreshStateDB.cost_ms
+        ).join(CompanyDB, CompanyDB.id == RefreshStateDB.company_id).where(
+            RefreshStateDB.data_type == data_type,
+            CompanyDB.is_active.is_not(False),
+            self._stale(data_type, now),
+            or_(RefreshStateDB.consecutive_failures == 0, RefreshStateDB.attempted_at < now - FAILURE_RETRY_DELAY)
+        ).order_by(
+            RefreshStateDB.tier,
+            RefreshStateDB.refreshed_at.is_not(None),
+            RefreshStateDB.refreshed_at,
+            RefreshStateDB.company_id
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        return list(self.db.execute(query))
+    
+    def record(
+        self,
+        data_type: str,
+        costs_ms: Mapping[int, float],
+        failed_company_ids: Iterable[int] = (),
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Record the outcome of a refresh cycle, one executemany UPDATE per
+        BULK_BATCH_SIZE companies.
+        
+        Args:
+            data_type: Data type that was refreshed
+            costs_ms: Fetch time in milliseconds of every attempted company
+            failed_company_ids: Companies whose fetch gave up
+            now: Time of the refresh (defaults to now)
+        """
+        now = now or datetime.now(timezone.utc)
+        failed = set(failed_company_ids)
+        cost = bindparam("b_cost")
+        measured = case(
+            (RefreshStateDB.cost_ms.is_(None), cost),
+            else_=RefreshStateDB.cost_ms * (1 - COST_SMOOTHING) + cost * COST_SMOOTHING
+        )
+        where = (RefreshStateDB.company_id == bindparam("b_company_id"), RefreshStateDB.data_type == data_type)
+        succeeded_stmt = update(RefreshStateDB).where(*where).values(
+            refreshed_at=now, attempted_at=now, consecutive_failures=0, cost_ms=measured
+        )
+        failed_stmt = update(RefreshStateDB).where(*where).values(
+            attempted_at=now, consecutive_failures=RefreshStateDB.consecutive_failures + 1, cost_ms=measured
+        )
+        
+        for stmt, ids in ((succeeded_stmt, [i for i in costs_ms if i not in failed]), (failed_stmt, [i for i in costs_ms if i in failed])):
+            rows = [{"b_company_id": company_id, "b_cost": costs_ms[company_id]} for company_id in ids]
+            for start in range(0, len(rows), settings.BULK_BATCH_SIZE):
+                self.db.connection().execute(stmt, rows[start:start + settings.BULK_BATCH_SIZE])
+        self.db.commit()
+    
+    def status(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Backlog and lag of every data type and tier, in one grouped query
+        per data type, plus the company-wide last_data_update lag.
+        
+        Args:
+            now: Reference time (defaults to now)
+        
+        Returns:
+            dict: Fields of the RefreshStatus response model
+        """
+        now = now or datetime.now(timezone.utc)
+        active = CompanyDB.is_active.is_not(False)
+        tiers = []
+        for data_type in MAX_AGE:
+            stale = self._stale(data_type, now)
+            rows = self.db.execute(
+                select(
+                    RefreshStateDB.tier,
+                    func.count(),
+                    func.sum(case((stale, 1), else_=0)),
+                    func.sum(case((RefreshStateDB.refreshed_at.is_(None), 1), else_=0)),
+                    func.sum(case((RefreshStateDB.consecutive_failures > 0, 1), else_=0)),
+                    func.min(RefreshStateDB.refreshed_at),
+                    func.sum(case((stale, func.coalesce(RefreshStateDB.cost_ms, DEFAULT_COST_MS)), else_=0))
+                ).join(CompanyDB, CompanyDB.id == RefreshStateDB.company_id).where(
+                    RefreshStateDB.data_type == data_type, active
+                ).group_by(RefreshStateDB.tier).order_by(RefreshStateDB.tier)
+            ).all()
+            names = {tier.tier: tier.name for tier in REFRESH_TIERS}
+            for tier, companies, stale_count, never, failing, oldest, backlog_cost in rows:
+                oldest = _as_utc(oldest)
+                tiers.append({
+                    "data_type": data_type,
+                    "tier": tier,
+                    "tier_name": names.get(tier, str(tier)),
+                    "max_age_seconds": MAX_AGE[data_type].get(tier, MAX_AGE[data_type][DEFAULT_TIER]).total_seconds(),
+                    "companies": companies,
+                    "stale": stale_count or 0,
+                    "never_refreshed": never or 0,
+                    "failing": failing or 0,
+                    "max_lag_seconds": (now - oldest).total_seconds() if oldest else None,
+                    "backlog_cost_seconds": (backlog_cost or 0) / 1000,
+                })
+        
+        active_companies, without_data, oldest_update = self.db.execute(
+            select(
+                func.count(),
+                func.sum(case((CompanyDB.last_data_update.is_(None), 1), else_=0)),
+                func.min(CompanyDB.last_data_update)
+            ).where(active)
+        ).one()
+        return {
+            "generated_at": now,
+            "active_companies": active_companies,
+            "companies_without_data": without_data or 0,
+            "oldest_data_update": _as_utc(oldest_update),
+            "tiers": tiers,
+        }
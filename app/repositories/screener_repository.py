@@ -0,0 +1,144 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List
+from app.core.config import settings
+from app.models.database_models import CompanyDB, FinancialMetricsDB, LatestFinancialMetricsDB
+from app.models.screener import ScreenerFilter, ScreenerRequest
+from app.repositories.financial_metrics_repository import METRIC_COLUMNS
+
+# Company columns that can be used in screen filters and sorts
+COMPANY_COLUMNS = ("sector", "industry", "country", "exchange", "currency", "ticker", "name")
+
+# Company columns returned with every result row
+RESULT_COMPANY_COLUMNS = ("ticker", "name", "sector", "country", "exchange")
+
+# Operators that take a single scalar operand
+_COMPARISONS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+}
+
+class ScreenerRepository:
+    """
+    Repository for cross-sectional screens: filter and sort companies on
+    the metrics of their latest period, in a single SQL statement.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def build_query(self, request: ScreenerRequest):
+        """
+        Compile a screen into one SELECT.
+        
+        The latest period of each company comes from the
+        latest_financial_metrics snapshot, joined to its metrics row and to
+        the company by primary key. Company and metric filters are applied
+        to that row.
+        
+        Args:
+            request: The screen definition
+        
+        Returns:
+            Select: Statement returning one row per matching company
+        
+        Raises:
+            ValueError: If a filter or sort names an unknown field or has an invalid operand
+        """
+        fields = list(request.fields) if request.fields is not None else list(METRIC_COLUMNS)
+        for field in fields:
+            if field not in METRIC_COLUMNS:
+                raise ValueError(f"Unknown metric field: {field}")
+        
+        def column_for(field: str):
+            if field in METRIC_COLUMNS:
+                return getattr(FinancialMetricsDB, field)
+            if field in COMPANY_COLUMNS:
+                return getattr(CompanyDB, field)
+            raise ValueError(f"Unknown screener field: {field}")
+        
+        query = select(
+            CompanyDB.id.label("company_id"),
+            *(getattr(CompanyDB, column) for column in RESULT_COMPANY_COLUMNS),
+            FinancialMetricsDB.id.label("metrics_id"),
+            FinancialMetricsDB.period_end,
+            FinancialMetricsDB.period_type,
+            *(getattr(FinancialMetricsDB, column) for column in fields)
+        ).select_from(LatestFinancialMetricsDB).join(
+            FinancialMetricsDB, FinancialMetricsDB.id == LatestFinancialMetricsDB.metrics_id
+        ).join(CompanyDB, CompanyDB.id == LatestFinancialMetricsDB.company_id).where(
+            LatestFinancialMetricsDB.period_type == request.period_type,
+            *(self._condition(column_for(f.field), f, numeric=f.field in METRIC_COLUMNS) for f in request.filters)
+        )
+        
+        order_by = []
+        for sort in request.sort:
+            column = column_for(sort.field)
+            # NULLs last in both directions, whatever the dialect's default
+            order_by.append(column.is_(None))
+            order_by.append(column.desc() if sort.direction == "desc" else column.asc())
+        query = query.order_by(*order_by, CompanyDB.id)
+        
+        if request.limit is not None:
+            query = query.limit(request.limit)
+        return query
+    
+    def _condition(self, column, screen_filter: ScreenerFilter, numeric: bool):
+        """
+        Translate one filter into a SQL expression on `column`.
+        Operands must match the column: numbers for metric columns, strings
+        for company columns (a mismatch would compare as text on SQLite and
+        fail on PostgreSQL).
+        """
+        op, value = screen_filter.op, screen_filter.value
+        if op == "is_null":
+            return column.is_(None)
+        if op == "not_null":
+            return column.is_not(None)
+        if op == "in":
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"Filter on {screen_filter.field}: 'in' needs a non-empty list")
+            self._check_operands(screen_filter, value, numeric)
+            return column.in_(value)
+        if op == "between":
+            if not isinstance(value, list) or len(value) != 2:
+                raise ValueError(f"Filter on {screen_filter.field}: 'between' needs [low, high]")
+            self._check_operands(screen_filter, value, numeric)
+            return column.between(value[0], value[1])
+        if value is None or isinstance(value, (list, dict)):
+            raise ValueError(f"Filter on {screen_filter.field}: '{op}' needs a single value")
+        self._check_operands(screen_filter, [value], numeric)
+        return _COMPARISONS[op](column, value)
+    
+    @staticmethod
+    def _check_operands(screen_filter: ScreenerFilter, values: List[Any], numeric: bool) -> None:
+        """
+        Raises:
+            ValueError: If an operand does not match the column type
+        """
+        for value in values:
+            if numeric and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise ValueError(f"Filter on {screen_filter.field}: '{screen_filter.op}' needs numbers, got {value!r}")
+            if not numeric and not isinstance(value, str):
+                raise ValueError(f"Filter on {screen_filter.field}: '{screen_filter.op}' needs strings, got {value!r}")
+    
+    def iter_screen(self, request: ScreenerRequest) -> Iterator[Dict[str, Any]]:
+        """
+        Run a screen and stream the matching rows from a server-side cursor,
+        BULK_BATCH_SIZE rows at a time.
+        
+        Args:
+            request: The screen definition
+        
+        Returns:
+            Iterator[dict]: Result rows keyed by column name
+        
+        Raises:
+            ValueError: If the screen is invalid (raised before any row is read)
+        """
+        query = self.build_query(request).execution_options(yield_per=settings.BULK_BATCH_SIZE)
+        return iter(self.db.execute(query).mappings())
@@ -0,0 +1,418 @@
+"""
+Bulk import of vendor dumps (companies, fundamentals, daily prices).
+
+Files are read in chunks (CSV through pandas, Parquet through pyarrow row
+batches) and each chunk is validated as a whole against the field
+definitions of the API models: every column is coerced with one pandas
+call (pd.to_numeric / pd.to_datetime), columns of other types (URLs) and
+fields with constraints are checked with one pydantic TypeAdapter call per
+column, and rows with a failed check or a missing required value are
+rejected together. Rejected rows are appended to a <file>.rejects.csv next
+to the input with the reason.
+
+Valid rows are written with COPY into a temporary table followed by
+INSERT ... SELECT ... ON CONFLICT on PostgreSQL, and with an executemany
+INSERT ... ON CONFLICT elsewhere. Companies and prices already stored are
+left alone (DO NOTHING); metrics rows are updated with the file's values
+(DO UPDATE), so re-importing corrected fundamentals replaces them.
+Python-side column defaults (is_active) are filled into the frame first,
+since COPY bypasses SQLAlchemy. Each chunk is its own transaction; after it
+commits, the number of input rows processed is saved to
+<file>.import-state.json. A rerun with the same file skips the chunks that
+were already committed, and ON CONFLICT makes replaying a chunk harmless if
+the process died between commit and checkpoint.
+
+Imported companies are added to the type-ahead and full-text search
+indexes of this process (and so to Elasticsearch when it is configured); a
+running API server rebuilds its local indexes on restart.
+
+Metrics and price files may identify companies by company_id or by ticker.
+
+Usage: see import_data.py
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from functools import lru_cache
+from typing import Annotated, Callable, Dict, Iterator, List, Optional, Tuple, Type, get_args
+
+import pandas as pd
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import String, Table, func, insert, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_company_metrics
+from app.core.config import settings
+from app.models.company import CompanyCreate
+from app.models.database_models import CompanyDB, FinancialMetricsDB, HistoricalDataDB
+from app.models.financial_metrics import FinancialMetricsCreate
+from app.models.historical_data import HistoricalDataCreate
+from app.repositories.financial_metrics_repository import FinancialMetricsRepository
+from app.services.company_search import get_search_index
+from app.services.fulltext_search import DOCUMENT_COLUMNS, get_fulltext_indexer
+
+
+@dataclass(frozen=True)
+class ImportKind:
+    """What a file contains and where it goes."""
+    model: Type[BaseModel]
+    table: Table
+    # Unique key used for ON CONFLICT
+    conflict_columns: Tuple[str, ...]
+    # Rows reference companies (company_id or ticker column)
+    by_company: bool
+    # ON CONFLICT DO UPDATE with the file's values instead of DO NOTHING
+    update_existing: bool = False
+
+
+IMPORT_KINDS: Dict[str, ImportKind] = {
+    "companies": ImportKind(CompanyCreate, CompanyDB.__table__, ("ticker",), False),
+    "metrics": ImportKind(FinancialMetricsCreate, FinancialMetricsDB.__table__, ("company_id", "period_end", "period_type"), True, True),
+    "prices": ImportKind(HistoricalDataCreate, HistoricalDataDB.__table__, ("company_id", "date"), True),
+}
+
+
+@dataclass
+class ImportProgress:
+    """Counters reported after every chunk."""
+    rows_read: int = 0
+    # Rows inserted or updated; rows skipped by ON CONFLICT DO NOTHING are not counted
+    rows_written: int = 0
+    rows_rejected: int = 0
+    rows_skipped: int = 0
+    total_rows: Optional[int] = None
+    elapsed: float = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+
+def _base_type(annotation):
+    """The type of an Optional[...] annotation, or the annotation itself."""
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    return args[0] if args else annotation
+
+
+def _field_kind(annotation) -> str:
+    """Map a model field annotation to the coercion applied to its column."""
+    base = _base_type(annotation)
+    if base is int:
+        return "int"
+    if base in (float, Decimal):
+        return "float"
+    if base is datetime:
+        return "datetime"
+    if base is bool:
+        return "bool"
+    if base is str:
+        return "str"
+    return "pydantic"
+
+
+@lru_cache(maxsize=64)
+def _list_adapter(annotation) -> TypeAdapter:
+    return TypeAdapter(List[annotation])
+
+
+def _validate_column(values: pd.Series, annotation) -> pd.Series:
+    """
+    Validate the present values of a column against a pydantic type with one
+    TypeAdapter call. Values that fail become NA; the others are returned as
+    validated, with pydantic types (HttpUrl) turned into their string form.
+    """
+    present = values.dropna()
+    if present.empty:
+        return values
+    adapter = _list_adapter(annotation)
+    items = present.tolist()
+    try:
+        validated = adapter.validate_python(items)
+        positions = range(len(items))
+    except ValidationError as exc:
+        failed = {error["loc"][0] for error in exc.errors()}
+        positions = [position for position in range(len(items)) if position not in failed]
+        validated = adapter.validate_python([items[position] for position in positions])
+    plain = (str, int, float, bool, Decimal, datetime)
+    result = pd.Series(pd.NA, index=values.index, dtype=object)
+    result[present.index[list(positions)]] = [value if isinstance(value, plain) else str(value) for value in validated]
+    return result
+
+
+def validate_frame(frame: pd.DataFrame, kind: ImportKind) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validate and coerce a chunk column by column against the model fields.
+    
+    Returns:
+        Tuple of (valid rows with only table columns, rejected rows with a `reason` column)
+    """
+    reasons = pd.Series("", index=frame.index)
+    valid = pd.DataFrame(index=frame.index)
+    
+    for name, field in kind.model.model_fields.items():
+        if name not in kind.table.columns:
+            continue
+        if name not in frame.columns:
+            if field.is_required():
+                reasons[:] += f"missing column {name}; "
+            continue
+        
+        raw = frame[name]
+        field_kind = _field_kind(field.annotation)
+        if field_kind == "int":
+            values = pd.to_numeric(raw, errors="coerce")
+            bad = values.notna() & (values % 1 != 0)
+            values = values.where(~bad).astype("Int64")
+        elif field_kind == "float":
+            values = pd.to_numeric(raw, errors="coerce").astype("float64")
+        elif field_kind == "datetime":
+            values = pd.to_datetime(raw, errors="coerce", utc=True)
+        elif field_kind == "bool":
+            values = raw.astype("string").str.strip().str.lower().map({"true": True, "false": False, "1": True, "0": False})
+        else:
+            values = raw.astype("string").str.strip().replace("", pd.NA)
+        
+        base = _base_type(field.annotation)
+        if field_kind == "pydantic":
+            values = _validate_column(values, base).astype("string")
+        elif field.metadata:
+            # Constraints such as Field(gt=0) or max_length; coerced values are kept as they are
+            checked = _validate_column(values.astype(object), Annotated[(base, *field.metadata)])
+            values = values.where(checked.notna())
+        column_type = kind.table.columns[name].type
+        if isinstance(column_type, String) and column_type.length:
+            values = values.where(values.isna() | (values.str.len() <= column_type.length))
+        
+        invalid = raw.notna() & values.isna()
+        reasons[invalid] += f"invalid {name}; "
+        if field.is_required():
+            reasons[raw.isna()] += f"missing {name}; "
+        elif field.default is not None:
+            values = values.fillna(field.default)
+        valid[name] = values
+    
+    rejected_mask = reasons != ""
+    rejected = frame[rejected_mask].assign(reason=reasons[rejected_mask].str.rstrip("; "))
+    return valid[~rejected_mask], rejected
+
+
+def read_chunks(path: Path, chunk_size: int) -> Tuple[Optional[int], Iterator[pd.DataFrame]]:
+    """
+    Open a CSV or Parquet file as an iterator of DataFrame chunks.
+    
+    Returns:
+        Tuple of (total row count if known without reading the file, chunk iterator)
+    """
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(path)
+        batches = parquet_file.iter_batches(batch_size=chunk_size)
+        return parquet_file.metadata.num_rows, (batch.to_pandas() for batch in batches)
+    return None, iter(pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=True))
+
+
+class BulkImporter:
+    """
+    Streams one file into its table, chunk by chunk, with checkpoints.
+    """
+    
+    def __init__(self, db: Session, kind: str, path: str, chunk_size: int = 50000):
+        self.db = db
+        self.kind = IMPORT_KINDS[kind]
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.state_path = self.path.with_name(self.path.name + ".import-state.json")
+        self.rejects_path = self.path.with_name(self.path.name + ".rejects.csv")
+        self.dialect = db.get_bind().dialect.name
+        self._company_ids: Optional[Dict[str, int]] = None
+    
+    def _signature(self) -> Dict[str, object]:
+        stat = self.path.stat()
+        return {"file": str(self.path.resolve()), "size": stat.st_size, "mtime": stat.st_mtime}
+    
+    def _load_checkpoint(self) -> int:
+        """Rows already committed by a previous run of the same file, 0 for a fresh import."""
+        if not self.state_path.exists():
+            return 0
+        state = json.loads(self.state_path.read_text())
+        if state.get("signature") != self._signature():
+            return 0
+        return int(state.get("rows_done", 0))
+    
+    def _save_checkpoint(self, rows_done: int) -> None:
+        temporary = self.state_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"signature": self._signature(), "rows_done": rows_done}))
+        os.replace(temporary, self.state_path)
+    
+    def _resolve_companies(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill company_id from the ticker column for files keyed by ticker, and
+        blank out IDs of companies that do not exist so validation rejects them.
+        """
+        if self._company_ids is None:
+            self._company_ids = dict(self.db.execute(select(CompanyDB.ticker, CompanyDB.id)).all())
+        if "company_id" not in frame.columns and "ticker" in frame.columns:
+            return frame.assign(company_id=frame["ticker"].map(self._company_ids))
+        if "company_id" in frame.columns:
+            known = pd.to_numeric(frame["company_id"], errors="coerce").isin(set(self._company_ids.values()))
+            return frame.assign(company_id=frame["company_id"].where(known))
+        return frame
+    
+    def _with_defaults(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill the Python-side column defaults of the table (e.g. is_active=True)
+        into the frame; COPY and INSERT ... SELECT would leave them NULL.
+        """
+        defaults = {
+            column.name: column.default.arg
+            for column in self.kind.table.columns
+            if column.default is not None and column.default.is_scalar
+        }
+        for name, default in defaults.items():
+            frame = frame.assign(**{name: frame[name].fillna(default) if name in frame.columns else default})
+        return frame
+    
+    def _write(self, frame: pd.DataFrame) -> int:
+        """
+        Write a validated chunk in the current transaction.
+        
+        Returns:
+            int: Rows inserted or updated, as reported by the database
+        """
+        frame = self._with_defaults(frame)
+        columns = list(frame.columns)
+        conflict = ", ".join(self.kind.conflict_columns)
+        updated = [column for column in columns if column not in self.kind.conflict_columns]
+        if self.kind.update_existing:
+            # One statement cannot update a row twice (PostgreSQL); the last row of a key wins
+            frame = frame.drop_duplicates(subset=list(self.kind.conflict_columns), keep="last")
+        if self.dialect == "postgresql":
+            # COPY into a per-transaction staging table, then one set-based insert
+            table = self.kind.table.name
+            column_list = ", ".join(columns)
+            buffer = io.StringIO()
+            frame.to_csv(buffer, index=False, header=False, na_rep="")
+            buffer.seek(0)
+            self.db.execute(text(f"CREATE TEMP TABLE import_staging (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+            cursor = self.db.connection().connection.cursor()
+            cursor.copy_expert(f"COPY import_staging ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+            if self.kind.update_existing:
+                assignments = [f"{column} = EXCLUDED.{column}" for column in updated]
+                if "updated_at" in self.kind.table.columns:
+                    assignments.append("updated_at = now()")
+                on_conflict = f"DO UPDATE SET {', '.join(assignments)}"
+            else:
+                on_conflict = "DO NOTHING"
+            result = self.db.execute(text(
+                f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM import_staging "
+                f"ON CONFLICT ({conflict}) {on_conflict}"
+            ))
+            return result.rowcount
+        
+        rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        if self.dialect == "sqlite":
+            stmt = sqlite.insert(self.kind.table)
+            if self.kind.update_existing:
+                assignments = {column: stmt.excluded[column] for column in updated}
+                if "updated_at" in self.kind.table.columns:
+                    assignments["updated_at"] = func.now()
+                stmt = stmt.on_conflict_do_update(index_elements=list(self.kind.conflict_columns), set_=assignments)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(self.kind.conflict_columns))
+        else:
+            stmt = insert(self.kind.table)
+        return self.db.execute(stmt, rows).rowcount
+    
+    def _index_companies(self, tickers: List[str]) -> None:
+        """
+        Add the companies of a committed chunk to the type-ahead and full-text
+        search indexes, BULK_BATCH_SIZE companies per read and bulk write.
+        """
+        search_index = get_search_index()
+        indexer = get_fulltext_indexer()
+        columns = [getattr(CompanyDB, column) for column in DOCUMENT_COLUMNS]
+        for start in range(0, len(tickers), settings.BULK_BATCH_SIZE):
+            chunk = tickers[start:start + settings.BULK_BATCH_SIZE]
+            documents = [
+                dict(zip(DOCUMENT_COLUMNS, row))
+                for row in self.db.execute(select(*columns).where(CompanyDB.ticker.in_(chunk)))
+            ]
+            for document in documents:
+                search_index.upsert(document["id"], document["ticker"], document["name"], document["exchange"])
+            indexer.submit(documents)
+    
+    def _reject(self, rejected: pd.DataFrame) -> None:
+        if rejected.empty:
+            return
+        header = not self.rejects_path.exists()
+        rejected.to_csv(self.rejects_path, mode="a", index=False, header=header, quoting=csv.QUOTE_MINIMAL)
+    
+    def run(self, on_progress: Optional[Callable[[ImportProgress], None]] = None) -> ImportProgress:
+        """
+        Import the file, resuming after the last committed chunk of a previous run.
+        
+        Args:
+            on_progress: Called with the counters after every chunk
+        
+        Returns:
+            ImportProgress: Final counters
+        """
+        progress = ImportProgress()
+        resume_from = self._load_checkpoint()
+        progress.rows_skipped = resume_from
+        if resume_from == 0:
+            self.rejects_path.unlink(missing_ok=True)
+        total, chunks = read_chunks(self.path, self.chunk_size)
+        progress.total_rows = total
+        started = time.perf_counter()
+        
+        rows_done = 0
+        for chunk in chunks:
+            chunk_start = rows_done
+            rows_done += len(chunk)
+            if rows_done <= resume_from:
+                continue
+            if chunk_start < resume_from:
+                chunk = chunk.iloc[resume_from - chunk_start:]
+            
+            resolved = self._resolve_companies(chunk) if self.kind.by_company else chunk
+            valid, rejected = validate_frame(resolved, self.kind)
+            
+            written = 0
+            try:
+                if not valid.empty:
+                    written = self._write(valid)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+            
+            if self.kind.by_company and not valid.empty:
+                invalidate_company_metrics(valid["company_id"].unique().tolist())
+            if self.kind.table is CompanyDB.__table__ and not valid.empty:
+                self._index_companies(valid["ticker"].unique().tolist())
+            # Rejected rows as they were in the file, without the resolved company_id
+            self._reject(chunk.loc[rejected.index].assign(reason=rejected["reason"]))
+            self._save_checkpoint(rows_done)
+            
+            progress.rows_read += len(chunk)
+            progress.rows_written += written
+            progress.rows_rejected += len(rejected)
+            progress.elapsed = time.perf_counter() - started
+            if on_progress:
+                on_progress(progress)
+        
+        if self.kind.table is FinancialMetricsDB.__table__:
+            FinancialMetricsRepository(self.db).rebuild_latest()
+        
+        self.state_path.unlink(missing_ok=True)
+        return progress
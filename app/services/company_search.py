@@ -0,0 +1,329 @@
+"""
+Type-ahead search over company names and tickers.
+
+CompanySearchIndex keeps every company's ticker and name in memory,
+folded to lowercase ASCII ("Łódź" -> "lodz", "Orlen S.A." -> "orlen s a"),
+in two structures:
+
+- a sorted list of keys (ticker, full name, name without spaces, each
+  name word) searched with bisect, for prefix matches: "micro" ->
+  Microsoft, "cdr" -> CDR (CD PROJEKT), "cd proj" -> CD PROJEKT
+- a trigram inverted index, for matches inside a name ("soft" ->
+  Microsoft) and for typos ("mircosoft" -> Microsoft)
+
+Results are ranked: exact ticker, ticker prefix, name prefix, word prefix,
+substring, then fuzzy matches by trigram similarity. A query costs a
+bisect plus a few posting-list lookups, well under a millisecond for tens
+of thousands of companies.
+
+The process-wide index is built on startup (rebuild_search_index) and kept
+current by CompanyRepository on create, update and delete. Every worker
+process holds its own copy and only sees its own writes until it is
+rebuilt; companies loaded outside the API (import_data.py) appear after a
+restart.
+
+With COMPANY_SEARCH_BACKEND=postgres, searches run in the database instead
+(pg_trgm + unaccent, see CompanyRepository.search), which suits
+deployments with many workers or companies written by other processes.
+"""
+
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database_models import CompanyDB
+
+# Letters NFKD does not decompose into a base letter plus accent
+_FOLD = str.maketrans({
+    "ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D",
+    "ß": "ss", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE",
+})
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Rank of each kind of match; fuzzy matches scale FUZZY by their similarity
+EXACT_TICKER = 1.0
+TICKER_PREFIX = 0.9
+NAME_PREFIX = 0.8
+WORD_PREFIX = 0.7
+SUBSTRING = 0.5
+FUZZY = 0.4
+# Share of the query's trigrams a fuzzy match must contain
+MIN_SIMILARITY = 0.5
+# Companies scored per fuzzy query, taken from the rarest trigrams first
+MAX_FUZZY_CANDIDATES = 1000
+# Sorted keys examined per prefix; bounds one- and two-letter queries
+MAX_PREFIX_KEYS = 1000
+
+
+def normalize(text: str) -> str:
+    """
+    Fold text for matching: strip diacritics, lowercase, and turn every
+    run of other characters into one space.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.translate(_FOLD))
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+    return _NON_ALNUM.sub(" ", ascii_text).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a normalized string with spaces removed, padded like pg_trgm."""
+    padded = f"  {text.replace(' ', '')} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One ranked search result."""
+    id: int
+    ticker: str
+    name: str
+    exchange: Optional[str]
+    score: float
+
+
+@dataclass(frozen=True)
+class _Entry:
+    id: int
+    ticker: str
+    name: str
+    exchange: Optional[str]
+    ticker_key: str
+    name_key: str
+    trigrams: frozenset
+
+
+class CompanySearchIndex:
+    """
+    In-memory prefix and trigram index of company tickers and names.
+    Safe to read and update from several threads.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, _Entry] = {}
+        # (key, company_id, score of a prefix match on this key), sorted
+        self._keys: List[Tuple[str, int, float]] = []
+        self._postings: Dict[str, Set[int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _keys_of(entry: _Entry) -> Set[Tuple[str, int, float]]:
+        keys = {(entry.ticker_key, entry.id, TICKER_PREFIX)}
+        if entry.name_key:
+            keys.add((entry.name_key, entry.id, NAME_PREFIX))
+            keys.add((entry.name_key.replace(" ", ""), entry.id, NAME_PREFIX))
+            keys.update((word, entry.id, WORD_PREFIX) for word in entry.name_key.split(" ")[1:])
+        return keys
+    
+    def _add(self, entry: _Entry) -> None:
+        self._entries[entry.id] = entry
+        for key in self._keys_of(entry):
+            insort(self._keys, key)
+        for gram in entry.trigrams:
+            self._postings.setdefault(gram, set()).add(entry.id)
+    
+    def _remove(self, company_id: int) -> None:
+        entry = self._entries.pop(company_id, None)
+        if entry is None:
+            return
+        for key in self._keys_of(entry):
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+        for gram in entry.trigrams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(company_id)
+                if not posting:
+                    del self._postings[gram]
+    
+    @staticmethod
+    def _entry(company_id: int, ticker: str, name: str, exchange: Optional[str]) -> _Entry:
+        ticker_key = normalize(ticker).replace(" ", "")
+        name_key = normalize(name)
+        return _Entry(
+            id=company_id,
+            ticker=ticker,
+            name=name,
+            exchange=exchange,
+            ticker_key=ticker_key,
+            name_key=name_key,
+            trigrams=frozenset(trigrams(name_key) | trigrams(ticker_key))
+        )
+    
+    def rebuild(self, companies: Iterable[Tuple[int, str, str, Optional[str]]]) -> None:
+        """
+        Replace the whole index.
+        
+        Args:
+            companies: (id, ticker, name, exchange) of every company
+        """
+        entries = [self._entry(*company) for company in companies]
+        keys: List[Tuple[str, int, float]] = []
+        postings: Dict[str, Set[int]] = {}
+        for entry in entries:
+            keys.extend(self._keys_of(entry))
+            for gram in entry.trigrams:
+                postings.setdefault(gram, set()).add(entry.id)
+        keys.sort()
+        with self._lock:
+            self._entries = {entry.id: entry for entry in entries}
+            self._keys = keys
+            self._postings = postings
+    
+    def upsert(self, company_id: int, ticker: str, name: str, exchange: Optional[str] = None) -> None:
+        """
+        Add a company or replace its indexed ticker, name and exchange.
+        """
+        entry = self._entry(company_id, ticker, name, exchange)
+        with self._lock:
+            self._remove(company_id)
+            self._add(entry)
+    
+    def remove(self, company_id: int) -> None:
+        """
+        Drop a company from the index (no-op if it is not indexed).
+        """
+        with self._lock:
+            self._remove(company_id)
+    
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """
+        Find companies matching a partial ticker or name.
+        
+        Args:
+            query: What the user typed
+            limit: Maximum number of results
+        
+        Returns:
+            List[SearchHit]: Best matches first; ties go to the shorter name
+        """
+        folded = normalize(query)
+        if not folded:
+            return []
+        compact = folded.replace(" ", "")
+        scores: Dict[int, float] = {}
+        
+        with self._lock:
+            # Prefix matches on ticker, name and name words
+            for prefix in {folded, compact}:
+                position = bisect_left(self._keys, (prefix,))
+                stop = min(len(self._keys), position + MAX_PREFIX_KEYS)
+                while position < stop and self._keys[position][0].startswith(prefix):
+                    key, company_id, score = self._keys[position]
+                    if score == TICKER_PREFIX and key == compact:
+                        score = EXACT_TICKER
+                    if score > scores.get(company_id, 0.0):
+                        scores[company_id] = score
+                    position += 1
+            
+            # Matches inside a name: every trigram of the query must be present
+            if len(compact) >= 3 and len(scores) < limit:
+                inner = sorted(
+                    (self._postings.get(compact[index:index + 3], set()) for index in range(len(compact) - 2)),
+                    key=len
+                )
+                candidates = set(inner[0])
+                for posting in inner[1:]:
+                    if not candidates:
+                        break
+                    candidates &= posting
+                for company_id in candidates - scores.keys():
+                    entry = self._entries[company_id]
+                    # Spaces are kept so a match cannot span two words of the name
+                    if folded in entry.name_key or compact in entry.ticker_key:
+                        scores[company_id] = SUBSTRING
+            
+            # Typos: share of the query's trigrams found in the company (like pg_trgm's
+            # word_similarity), over candidates from the query's rarest trigrams; only
+            # tried when nothing matched exactly
+            if len(compact) >= 4 and not scores:
+                query_grams = trigrams(compact)
+                candidates = set()
+                for gram in sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ()))):
+                    posting = self._postings.get(gram, ())
+                    if candidates and len(candidates) + len(posting) > MAX_FUZZY_CANDIDATES:
+                        break
+                    candidates.update(posting)
+                for company_id in candidates - scores.keys():
+                    similarity = len(query_grams & self._entries[company_id].trigrams) / len(query_grams)
+                    if similarity >= MIN_SIMILARITY:
+                        scores[company_id] = FUZZY * similarity
+            
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], len(self._entries[item[0]].name), self._entries[item[0]].ticker)
+            )[:limit]
+            return [
+                SearchHit(
+                    id=company_id,
+                    ticker=self._entries[company_id].ticker,
+                    name=self._entries[company_id].name,
+                    exchange=self._entries[company_id].exchange,
+                    score=round(score, 4)
+                )
+                for company_id, score in ranked
+            ]
+
+
+_index = CompanySearchIndex()
+
+
+def get_search_index() -> CompanySearchIndex:
+    return _index
+
+
+def rebuild_search_index(db: Session) -> int:
+    """
+    Load every company into the process-wide index.
+    
+    Args:
+        db: Database session
+    
+    Returns:
+        int: Number of companies indexed
+    """
+    rows = db.execute(
+        select(CompanyDB.id, CompanyDB.ticker, CompanyDB.name, CompanyDB.exchange).execution_options(
+            yield_per=settings.BULK_BATCH_SIZE
+        )
+    )
+    _index.rebuild(tuple(row) for row in rows)
+    return len(_index)
+
+
+# PostgreSQL search key: the same folding as normalize(), as an immutable
+# function so it can back an expression index (unaccent itself is only stable)
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION company_search_key(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+    $$ SELECT trim(regexp_replace(lower(public.unaccent('public.unaccent', $1)), '[^a-z0-9]+', ' ', 'g')) $$
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_companies_search_trgm ON companies
+    USING gin (company_search_key(ticker || ' ' || name) gin_trgm_ops)
+    """,
+)
+
+
+def ensure_search_indexes(engine: Engine) -> None:
+    """
+    Create the pg_trgm/unaccent extensions, the search key function and the
+    trigram index used by COMPANY_SEARCH_BACKEND=postgres. Idempotent.
+    """
+    with engine.begin() as connection:
+        for statement in POSTGRES_SEARCH_DDL:
+            connection.execute(text(statement))
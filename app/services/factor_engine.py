@@ -0,0 +1,172 @@
+"""
+Cross-sectional factor scores for the factor_scores table.
+
+For every period (period_type, period_end) and sector, each company's ratios
+are ranked against the other companies of the sector: a percentile rank in
+(0, 1] (1.0 = highest value, ties share their average rank) and a z-score
+against the sector mean and standard deviation. Companies without a sector
+form a group of their own.
+
+All periods are scored in one vectorized pass: the metrics are loaded into
+one pandas frame with a single query, and ranks and z-scores are groupby
+transforms over (period_type, period_end, sector). The scores of the
+recomputed periods are then replaced with one executemany INSERT per chunk,
+so reads (GET /companies/{id}/factors, GET /factors) are plain index scans.
+
+Run after loading new metrics; scores of periods that are not recomputed
+stay as they were.
+
+Usage:
+    python -m app.services.factor_engine                           # every period
+    python -m app.services.factor_engine --period-type annual      # annual periods only
+    python -m app.services.factor_engine --period-end 2023-12-31   # one period end
+"""
+
+import argparse
+import time
+from datetime import date, datetime, time as datetime_time, timedelta, timezone
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database_models import CompanyDB, FactorScoreDB, FinancialMetricsDB
+from app.models.factors import FactorRecomputeResult
+from app.repositories.financial_metrics_repository import METRIC_COLUMNS
+from app.services.financial_ratios import FUNDAMENTAL_COLUMNS
+
+# Ratios that are scored; absolute fundamentals only measure company size
+FACTOR_METRICS = [column for column in METRIC_COLUMNS if column not in FUNDAMENTAL_COLUMNS]
+
+GROUP_COLUMNS = ["period_type", "period_end", "sector"]
+
+
+def day_range(day: date):
+    """[start, end) of a calendar day in UTC, to match period_end whatever its time of day."""
+    start = datetime.combine(day, datetime_time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def compute_factors(frame: pd.DataFrame, metrics: Sequence[str] = FACTOR_METRICS) -> pd.DataFrame:
+    """
+    Percentile ranks and z-scores of every metric within its sector and period.
+    
+    Args:
+        frame: Columns company_id, period_type, period_end, sector and `metrics`
+        metrics: Metric columns to score
+    
+    Returns:
+        pd.DataFrame: One row per company, period and metric with a value:
+        period_type, period_end, company_id, metric, percentile, zscore, peers
+    """
+    metrics = list(metrics)
+    values = frame[metrics].astype("float64").replace([np.inf, -np.inf], np.nan)
+    grouped = values.groupby([frame[column] for column in GROUP_COLUMNS], dropna=False, sort=False)
+    
+    percentile = grouped.rank(method="average", pct=True)
+    peers = grouped.transform("count")
+    spread = grouped.transform("std")
+    zscore = (values - grouped.transform("mean")) / spread.where(spread > 0)
+    
+    # Flatten the company x metric matrices to the long table layout, keeping present values only
+    rows, columns = np.nonzero(values.notna().to_numpy())
+    return pd.DataFrame({
+        "period_type": frame["period_type"].to_numpy()[rows],
+        "period_end": frame["period_end"].to_numpy()[rows],
+        "company_id": frame["company_id"].to_numpy()[rows],
+        "metric": np.asarray(metrics, dtype=object)[columns],
+        "percentile": percentile.to_numpy()[rows, columns],
+        "zscore": zscore.to_numpy()[rows, columns],
+        "peers": peers.to_numpy()[rows, columns].astype(int),
+    })
+
+
+class FactorEngine:
+    """
+    Computes and stores factor scores in bulk.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def _period_filters(self, column, period_type: Optional[str], period_end: Optional[date]):
+        filters = []
+        if period_type is not None:
+            filters.append(column.table.c.period_type == period_type)
+        if period_end is not None:
+            start, end = day_range(period_end)
+            filters.extend([column >= start, column < end])
+        return filters
+    
+    def load_frame(self, period_type: Optional[str] = None, period_end: Optional[date] = None) -> pd.DataFrame:
+        """
+        Load the metrics to score, with each company's sector, in one query.
+        period_end values are kept as returned by the database so they can be
+        written back unchanged.
+        """
+        columns = ["company_id", "period_type", "period_end"]
+        query = select(
+            *(getattr(FinancialMetricsDB, column) for column in columns),
+            CompanyDB.sector,
+            *(getattr(FinancialMetricsDB, metric) for metric in FACTOR_METRICS)
+        ).join(CompanyDB, CompanyDB.id == FinancialMetricsDB.company_id).where(
+            *self._period_filters(FinancialMetricsDB.period_end, period_type, period_end)
+        )
+        frame = pd.DataFrame(self.db.execute(query).all(), columns=columns + ["sector"] + FACTOR_METRICS)
+        frame["period_end"] = frame["period_end"].astype(object)
+        return frame
+    
+    def recompute(self, period_type: Optional[str] = None, period_end: Optional[date] = None) -> FactorRecomputeResult:
+        """
+        Score every company in the selected periods and replace their stored scores.
+        
+        Args:
+            period_type: Only periods of this type (all types if None)
+            period_end: Only periods ending on this day (all periods if None)
+        
+        Returns:
+            FactorRecomputeResult: Periods, metrics rows and scores written
+        """
+        frame = self.load_frame(period_type, period_end)
+        records = []
+        if not frame.empty:
+            scores = compute_factors(frame)
+            # NaN z-scores (no spread) are stored as NULL
+            records = scores.astype(object).where(scores.notna(), None).to_dict("records")
+
+        self.db.execute(delete(FactorScoreDB).where(*self._period_filters(FactorScoreDB.period_end, period_type, period_end)))
+        batch_size = settings.BULK_BATCH_SIZE
+        for start in range(0, len(records), batch_size):
+            self.db.execute(insert(FactorScoreDB), records[start:start + batch_size])
+        self.db.commit()
+        
+        return FactorRecomputeResult(
+            periods=int(frame[["period_type", "period_end"]].drop_duplicates().shape[0]),
+            rows=len(frame),
+            scores=len(records)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute sector percentile ranks and z-scores of financial ratios")
+    parser.add_argument("--period-type", help="Only periods of this type, e.g. annual")
+    parser.add_argument("--period-end", type=date.fromisoformat, help="Only periods ending on this day (YYYY-MM-DD)")
+    args = parser.parse_args()
+    
+    from app.core.database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = FactorEngine(db).recompute(args.period_type, args.period_end)
+        elapsed = time.perf_counter() - started
+        print(f"Scored {result.rows} rows of {result.periods} periods, wrote {result.scores} scores in {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Derived-ratio computation for the financial_metrics table.
+
+Ratios and growth rates are derived from the raw fundamentals (revenue,
+net_income, total_assets, total_liabilities, total_equity) for the whole
+table at once: rows are loaded into one pandas frame, every ratio is a
+column operation, and changed rows are written back with one executemany
+UPDATE per chunk.
+
+Growth is year over year: each row is matched with the row of the same
+company and period_type whose period_end is one year earlier, so
+quarterly rows are compared with the same quarter of the previous year.
+
+Usage:
+    python -m app.services.financial_ratios                  # all companies
+    python -m app.services.financial_ratios --company-id 1   # single company
+"""
+
+import argparse
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate_company_metrics
+from app.core.config import settings
+from app.models.database_models import FinancialMetricsDB
+from app.models.financial_metrics import RatioRecomputeResult
+
+FUNDAMENTAL_COLUMNS = ["revenue", "net_income", "total_assets", "total_liabilities", "total_equity"]
+DERIVED_COLUMNS = ["roe", "roa", "net_margin", "debt_to_equity", "debt_to_assets", "revenue_growth", "net_income_growth"]
+
+# How far the previous-year period_end may drift (e.g. 52/53-week fiscal years)
+YOY_TOLERANCE = pd.Timedelta(days=20)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series, scale: float = 1.0) -> pd.Series:
+    """Element-wise numerator / denominator, NaN where the denominator is missing or zero."""
+    return numerator / denominator.where(denominator != 0) * scale
+
+
+def derive_ratios(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute derived ratio columns for a frame of financial_metrics rows.
+    
+    Percentages (roe, roa, net_margin, growth) are expressed in percent to
+    match the stored data; debt ratios are plain ratios.
+    
+    Args:
+        frame: Columns id, company_id, period_end, period_type and FUNDAMENTAL_COLUMNS
+    
+    Returns:
+        pd.DataFrame: Indexed like `frame`, with one column per DERIVED_COLUMNS entry
+    """
+    derived = pd.DataFrame(index=frame.index)
+    derived["roe"] = _ratio(frame["net_income"], frame["total_equity"], 100.0)
+    derived["roa"] = _ratio(frame["net_income"], frame["total_assets"], 100.0)
+    derived["net_margin"] = _ratio(frame["net_income"], frame["revenue"], 100.0)
+    derived["debt_to_equity"] = _ratio(frame["total_liabilities"], frame["total_equity"])
+    derived["debt_to_assets"] = _ratio(frame["total_liabilities"], frame["total_assets"])
+    
+    # Match every row with the same company/period_type one year earlier in a single asof join
+    current = frame[["company_id", "period_type", "period_end", "revenue", "net_income"]].copy()
+    current["row"] = frame.index
+    current["target"] = current["period_end"] - pd.DateOffset(years=1)
+    previous = frame[["company_id", "period_type", "period_end", "revenue", "net_income"]].rename(
+        columns={"period_end": "target", "revenue": "prev_revenue", "net_income": "prev_net_income"}
+    )
+    matched = pd.merge_asof(
+        current.sort_values("target"),
+        previous.sort_values("target"),
+        on="target",
+        by=["company_id", "period_type"],
+        direction="nearest",
+        tolerance=YOY_TOLERANCE,
+    ).set_index("row")
+    
+    # Growth is measured against the absolute base so a loss turning into a profit is positive
+    derived["revenue_growth"] = _ratio(matched["revenue"] - matched["prev_revenue"], matched["prev_revenue"].abs(), 100.0)
+    derived["net_income_growth"] = _ratio(matched["net_income"] - matched["prev_net_income"], matched["prev_net_income"].abs(), 100.0)
+    return derived
+
+
+class FinancialRatioService:
+    """
+    Recomputes derived ratios of financial_metrics rows in bulk.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def load_frame(self, company_ids: Optional[Sequence[int]] = None) -> pd.DataFrame:
+        """
+        Load the columns needed for derivation into a DataFrame with one query.
+        """
+        columns = ["id", "company_id", "period_end", "period_type"] + FUNDAMENTAL_COLUMNS + DERIVED_COLUMNS
+        query = select(*(getattr(FinancialMetricsDB, column) for column in columns))
+        if company_ids:
+            query = query.where(FinancialMetricsDB.company_id.in_(company_ids))
+        
+        frame = pd.DataFrame(self.db.execute(query).all(), columns=columns)
+        frame[FUNDAMENTAL_COLUMNS + DERIVED_COLUMNS] = frame[FUNDAMENTAL_COLUMNS + DERIVED_COLUMNS].astype(float)
+        # Postgres returns aware and SQLite naive datetimes; compare everything as naive UTC
+        frame["period_end"] = pd.to_datetime(frame["period_end"], utc=True).dt.tz_localize(None)
+        return frame
+    
+    def recompute(self, company_ids: Optional[Sequence[int]] = None) -> RatioRecomputeResult:
+        """
+        Derive ratios for the given companies and write back the rows that changed.
+        A ratio that cannot be derived (missing or zero inputs) keeps its stored value.
+        
+        Args:
+            company_ids: Companies to process (None for the whole table)
+        
+        Returns:
+            RatioRecomputeResult: Number of rows scanned and updated
+        
+        Raises:
+            ValueError: If the update violates a database constraint
+        """
+        frame = self.load_frame(company_ids)
+        if frame.empty:
+            return RatioRecomputeResult(scanned=0, updated=0)
+        
+        derived = derive_ratios(frame)
+        stored = frame[DERIVED_COLUMNS]
+        new = derived.where(derived.notna(), stored)
+        
+        changed = ~np.isclose(new.to_numpy(), stored.to_numpy(), equal_nan=True).all(axis=1)
+        changes = new[changed].astype(object).where(new[changed].notna(), None)
+        changes["id"] = frame.loc[changed, "id"]
+        rows = changes.to_dict("records")
+        
+        batch_size = settings.BULK_BATCH_SIZE
+        try:
+            for start in range(0, len(rows), batch_size):
+                # ORM bulk UPDATE by primary key, executed as executemany
+                self.db.execute(update(FinancialMetricsDB), rows[start:start + batch_size])
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            raise ValueError("Ratio recompute failed due to constraint violation")
+        invalidate_company_metrics(frame.loc[changed, "company_id"].unique().tolist())
+        
+        return RatioRecomputeResult(scanned=len(frame), updated=len(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Derive financial ratios and growth rates from fundamentals")
+    parser.add_argument("--company-id", type=int, action="append", help="Limit to a company (repeatable)")
+    args = parser.parse_args()
+    
+    from app.core.database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = FinancialRatioService(db).recompute(args.company_id)
+        elapsed = time.perf_counter() - started
+        print(f"Scanned {result.scanned} rows, updated {result.updated} in {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+"""
+Full-text search over company names, tickers and descriptions.
+
+Two interchangeable backends:
+
+- ElasticsearchIndex, used when ELASTICSEARCH_URL is set: documents are
+  written with the _bulk API into ELASTICSEARCH_COMPANY_INDEX (ASCII-folding
+  analyzer, sector/exchange as keywords), and searches return sector and
+  exchange facets from terms aggregations
+- LocalFulltextIndex otherwise: an in-process inverted index with BM25
+  ranking and the same facets, rebuilt from the database on startup, so the
+  endpoint works (and can be tested) offline
+
+Repository writes do not call the backend directly. They hand documents to
+the FulltextIndexer, which batches them on an asyncio queue and writes
+every FLUSH_SIZE documents or FLUSH_INTERVAL seconds in one bulk request
+from a worker thread, so a company write never waits on Elasticsearch.
+Without a running event loop (scripts), writes go to the backend at once.
+
+Usage:
+    python -m app.services.fulltext_search      # reindex every company into Elasticsearch
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database_models import CompanyDB
+from app.services.company_search import normalize
+
+logger = logging.getLogger(__name__)
+
+# Company columns stored in the search documents
+DOCUMENT_COLUMNS = ("id", "ticker", "name", "description", "sector", "industry", "exchange", "country")
+FACET_FIELDS = ("sector", "exchange")
+
+# Documents per bulk write, and seconds a queued write may wait for a fuller batch
+FLUSH_SIZE = 500
+FLUSH_INTERVAL = 0.5
+
+# Words too common to narrow a search
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to was were will with".split()
+)
+
+
+def company_document(company: Any) -> Dict[str, Any]:
+    """Search document of a CompanyDB row (or any object/dict with the same fields)."""
+    if isinstance(company, dict):
+        return {column: company.get(column) for column in DOCUMENT_COLUMNS}
+    return {column: getattr(company, column) for column in DOCUMENT_COLUMNS}
+
+
+def stem(word: str) -> str:
+    """Strip a plural ending ("fertilizers" -> "fertilizer"), like Elasticsearch's minimal_english stemmer."""
+    if len(word) > 4 and word.endswith("ies") and word[-4] not in "ae":
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and word[-2] not in "su":
+        return word[:-1]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Folded, singular words of a text without stop words (same folding as the type-ahead search)."""
+    if not text:
+        return []
+    return [stem(word) for word in normalize(text).split(" ") if word and word not in STOP_WORDS]
+
+
+@dataclass
+class FulltextHit:
+    id: int
+    ticker: str
+    name: str
+    sector: Optional[str]
+    exchange: Optional[str]
+    score: float
+
+
+@dataclass
+class FulltextResult:
+    total: int
+    hits: List[FulltextHit] = field(default_factory=list)
+    # Facet field -> value -> number of matching companies
+    facets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+class LocalFulltextIndex:
+    """
+    In-process inverted index with BM25 ranking. Name and ticker words
+    count NAME_BOOST times, so a company named after the query ranks above
+    one that only mentions it. All query words must match.
+    """
+    NAME_BOOST = 3
+    K1 = 1.2
+    B = 0.75
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._documents: Dict[int, Dict[str, Any]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+    
+    def __len__(self) -> int:
+        return len(self._documents)
+    
+    def _terms(self, document: Dict[str, Any]) -> Counter:
+        terms = Counter(tokenize(document.get("description")))
+        for word in tokenize(document.get("name")) + tokenize(document.get("ticker")):
+            terms[word] += self.NAME_BOOST
+        return terms
+    
+    def _remove(self, company_id: int) -> None:
+        document = self._documents.pop(company_id, None)
+        if document is None:
+            return
+        for term in self._terms(document):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(company_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(company_id)
+    
+    def _add(self, document: Dict[str, Any]) -> None:
+        terms = self._terms(document)
+        company_id = document["id"]
+        self._documents[company_id] = document
+        self._lengths[company_id] = sum(terms.values())
+        self._total_length += self._lengths[company_id]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[company_id] = count
+    
+    def bulk(self, upserts: Sequence[Dict[str, Any]] = (), deletes: Iterable[int] = ()) -> None:
+        """
+        Index or replace documents and remove deleted companies.
+        """
+        with self._lock:
+            for company_id in deletes:
+                self._remove(company_id)
+            for document in upserts:
+                self._remove(document["id"])
+                self._add(document)
+    
+    def rebuild(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replace the whole index.
+        """
+        with self._lock:
+            self._documents, self._lengths, self._postings, self._total_length = {}, {}, {}, 0
+            for document in documents:
+                self._add(document)
+    
+    def search(
+        self,
+        query: str,
+        sector: Optional[str] = None,
+        exchange: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> FulltextResult:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return FulltextResult(total=0, facets={facet: {} for facet in FACET_FIELDS})
+        
+        with self._lock:
+            postings = sorted((self._postings.get(term, {}) for term in terms), key=len)
+            matches: Set[int] = set(postings[0])
+            for posting in postings[1:]:
+                matches &= posting.keys()
+            if sector is not None:
+                matches = {i for i in matches if (self._documents[i]["sector"] or "").lower() == sector.lower()}
+            if exchange is not None:
+                matches = {i for i in matches if (self._documents[i]["exchange"] or "").lower() == exchange.lower()}
+            
+            count = len(self._documents)
+            average_length = self._total_length / count if count else 0.0
+            idfs = [math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5)) for posting in postings]
+            length_weight = self.K1 * self.B / average_length if average_length else 0.0
+            base_norm = self.K1 * (1 - self.B)
+            scores: Dict[int, float] = {}
+            for company_id in matches:
+                norm = base_norm + length_weight * self._lengths[company_id]
+                score = 0.0
+                for idf, posting in zip(idfs, postings):
+                    frequency = posting[company_id]
+                    score += idf * frequency * (self.K1 + 1) / (frequency + norm)
+                scores[company_id] = score
+            
+            facets = {
+                facet: dict(Counter(self._documents[i][facet] for i in matches if self._documents[i][facet]).most_common())
+                for facet in FACET_FIELDS
+            }
+            ranked = heapq.nsmallest(offset + limit, scores.items(), key=lambda item: (-item[1], item[0]))[offset:]
+            hits = [
+                FulltextHit(
+                    id=company_id,
+                    ticker=self._documents[company_id]["ticker"],
+                    name=self._documents[company_id]["name"],
+                    sector=self._documents[company_id]["sector"],
+                    exchange=self._documents[company_id]["exchange"],
+                    score=round(score, 4)
+                )
+                for company_id, score in ranked
+            ]
+        return FulltextResult(total=len(matches), hits=hits, facets=facets)
+
+
+class ElasticsearchIndex:
+    """
+    Company documents in an Elasticsearch index, written through the _bulk API.
+    """
+    MAPPINGS = {
+        "properties": {
+            "id": {"type": "integer"},
+            "ticker": {"type": "text", "analyzer": "folded", "fields": {"raw": {"type": "keyword"}}},
+            "name": {"type": "text", "analyzer": "folded"},
+            "description": {"type": "text", "analyzer": "folded"},
+            "sector": {"type": "keyword"},
+            "industry": {"type": "keyword"},
+            "exchange": {"type": "keyword"},
+            "country": {"type": "keyword"},
+        }
+    }
+    SETTINGS = {
+        "analysis": {
+            "analyzer": {
+                # Case-, diacritic- and plural-insensitive, like the local index
+                "folded": {"type": "custom", "tokenizer": "standard", "filter": ["lowercase", "asciifolding", "stop", "plural"]}
+            },
+            "filter": {"plural": {"type": "stemmer", "language": "minimal_english"}}
+        }
+    }
+    
+    def __init__(self, client, index: str):
+        self.client = client
+        self.index = index
+    
+    def ensure_index(self) -> None:
+        if not self.client.indices.exists(index=self.index):
+            self.client.indices.create(index=self.index, settings=self.SETTINGS, mappings=self.MAPPINGS)
+    
+    def bulk(self, upserts: Sequence[Dict[str, Any]] = (), deletes: Iterable[int] = (), refresh: bool = False) -> None:
+        """
+        Send index and delete actions in one _bulk request.
+        
+        Raises:
+            RuntimeError: If Elasticsearch rejected any action
+        """
+        operations: List[Dict[str, Any]] = []
+        for company_id in deletes:
+            operations.append({"delete": {"_index": self.index, "_id": company_id}})
+        for document in upserts:
+            operations.append({"index": {"_index": self.index, "_id": document["id"]}})
+            operations.append(document)
+        if not operations:
+            return
+        response = self.client.bulk(operations=operations, refresh=refresh)
+        if response.get("errors"):
+            failed = [
+                item for item in response["items"]
+                for action, outcome in item.items()
+                if outcome.get("error") and not (action == "delete" and outcome.get("status") == 404)
+            ]
+            if failed:
+                raise RuntimeError(f"{len(failed)} bulk actions failed, first: {failed[0]}")
+    
+    def rebuild(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index every document, FLUSH_SIZE per _bulk request.
+        """
+        self.ensure_index()
+        batch: List[Dict[str, Any]] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) == FLUSH_SIZE:
+                self.bulk(batch)
+                batch = []
+        self.bulk(batch, refresh=True)
+    
+    def search(
+        self,
+        query: str,
+        sector: Optional[str] = None,
+        exchange: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> FulltextResult:
+        filters = [{"term": {facet: value}} for facet, value in (("sector", sector), ("exchange", exchange)) if value is not None]
+        response = self.client.search(
+            index=self.index,
+            query={
+                "bool": {
+                    "must": {
+                        "multi_match": {
+                            "query": query,
+                            "fields": [f"ticker^{LocalFulltextIndex.NAME_BOOST}", f"name^{LocalFulltextIndex.NAME_BOOST}", "description"],
+                            "operator": "and",
+                        }
+                    },
+                    "filter": filters,
+                }
+            },
+            aggs={facet: {"terms": {"field": facet, "size": 50}} for facet in FACET_FIELDS},
+            source=["ticker", "name", "sector", "exchange"],
+            size=limit,
+            from_=offset,
+            track_total_hits=True,
+        )
+        hits = [
+            FulltextHit(
+                id=int(hit["_id"]),
+                ticker=hit["_source"]["ticker"],
+                name=hit["_source"]["name"],
+                sector=hit["_source"].get("sector"),
+                exchange=hit["_source"].get("exchange"),
+                score=round(hit["_score"] or 0.0, 4)
+            )
+            for hit in response["hits"]["hits"]
+        ]
+        facets = {
+            facet: {bucket["key"]: bucket["doc_count"] for bucket in response["aggregations"][facet]["buckets"]}
+            for facet in FACET_FIELDS
+        }
+        return FulltextResult(total=response["hits"]["total"]["value"], hits=hits, facets=facets)
+
+
+class FulltextIndexer:
+    """
+    Batches index updates from repository writes onto an asyncio queue and
+    applies them in bulk. Later updates of a company replace earlier ones
+    in the same batch.
+    """
+    
+    def __init__(self, backend):
+        self.backend = backend
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    def submit(self, upserts: Sequence[Dict[str, Any]] = (), deletes: Iterable[int] = ()) -> None:
+        """
+        Queue documents to index and company IDs to remove. Safe to call from
+        any thread; applied immediately when the indexer is not running.
+        """
+        items = [("upsert", document["id"], document) for document in upserts]
+        items += [("delete", company_id, None) for company_id in deletes]
+        if not items:
+            return
+        if self._loop is None or self._loop.is_closed():
+            self._write(items)
+            return
+        for item in items:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+    
+    def _write(self, items) -> None:
+        # Last action per company wins
+        latest = {company_id: (action, document) for action, company_id, document in items}
+        upserts = [document for action, document in latest.values() if action == "upsert"]
+        deletes = [company_id for company_id, (action, _) in latest.items() if action == "delete"]
+        try:
+            self.backend.bulk(upserts, deletes)
+        except Exception as e:
+            # The database stays the source of truth; a reindex repairs the drift
+            logger.error("Full-text index update of %d companies failed: %s", len(latest), e)
+    
+    async def start(self) -> None:
+        """
+        Start the background writer on the running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Write what is still queued and stop the background writer.
+        """
+        if self._worker is None:
+            return
+        # Queued like submit() does, so documents submitted before stop() are written first
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+        await self._worker
+        self._loop = self._queue = self._worker = None
+    
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < FLUSH_SIZE:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await asyncio.to_thread(self._write, batch)
+
+
+_indexer: Optional[FulltextIndexer] = None
+_indexer_lock = threading.Lock()
+
+
+def _create_backend():
+    if settings.ELASTICSEARCH_URL:
+        from elasticsearch import Elasticsearch
+        
+        return ElasticsearchIndex(Elasticsearch(settings.ELASTICSEARCH_URL), settings.ELASTICSEARCH_COMPANY_INDEX)
+    return LocalFulltextIndex()
+
+
+def get_fulltext_indexer() -> FulltextIndexer:
+    """
+    Return the process-wide indexer, creating its backend on first use.
+    """
+    global _indexer
+    if _indexer is None:
+        with _indexer_lock:
+            if _indexer is None:
+                _indexer = FulltextIndexer(_create_backend())
+    return _indexer
+
+
+def get_fulltext_index():
+    """Backend searched by GET /companies/fulltext."""
+    return get_fulltext_indexer().backend
+
+
+def iter_company_documents(db: Session) -> Iterable[Dict[str, Any]]:
+    """Stream the search document of every company."""
+    columns = [getattr(CompanyDB, column) for column in DOCUMENT_COLUMNS]
+    rows = db.execute(select(*columns).execution_options(yield_per=settings.BULK_BATCH_SIZE))
+    for row in rows:
+        yield dict(zip(DOCUMENT_COLUMNS, row))
+
+
+def prepare_fulltext_index(db: Session) -> Optional[int]:
+    """
+    Startup step: fill the local index from the database, or make sure the
+    Elasticsearch index exists (a full Elasticsearch reindex is run from the
+    command line).
+    
+    Returns:
+        int or None: Companies indexed locally, None for Elasticsearch
+    """
+    backend = get_fulltext_index()
+    if isinstance(backend, LocalFulltextIndex):
+        backend.rebuild(iter_company_documents(db))
+        return len(backend)
+    backend.ensure_index()
+    return None
+
+
+def main():
+    from app.core.database import SessionLocal
+    
+    backend = get_fulltext_index()
+    if not isinstance(backend, ElasticsearchIndex):
+        print("ELASTICSEARCH_URL is not set; the local index is rebuilt on every API startup")
+        return
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        backend.rebuild(iter_company_documents(db))
+        print(f"Reindexed companies into {backend.index} in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Streaming serializers for financial metrics exports.
+
+Each writer takes the column names and an iterator of row batches (as
+produced by a yield_per cursor) and yields one encoded chunk per batch, so
+memory stays flat however many rows are exported.
+
+Formats:
+    ndjson  - one JSON object per line
+    csv     - header line, then one line per row
+    parquet - one row group per batch (requires pyarrow)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Integer
+
+# Media type of each supported export format
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Datetimes as ISO 8601 strings, everything else unchanged."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_ndjson(columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps({column: _plain(value) for column, value in zip(columns, row)}) + "\n"
+            for row in batch
+        ).encode("utf-8")
+
+
+def iter_csv(columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands written bytes out in chunks.
+    tell() keeps counting from the start of the file, as the Parquet
+    writer needs absolute offsets for the footer.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def arrow_type(column_type):
+    """Arrow type used to store values of a SQLAlchemy column type."""
+    import pyarrow as pa
+    
+    if isinstance(column_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us", tz="UTC") if column_type.timezone else pa.timestamp("us")
+    return pa.string()
+
+
+def iter_parquet(columns: Sequence[str], column_types: Sequence[Any], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """
+    Parquet needs a fixed schema up front, so the SQLAlchemy column types
+    are passed in; a batch where a column is all NULL still gets the right type.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([(column, arrow_type(column_type)) for column, column_type in zip(columns, column_types)])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) as writer:
+        for batch in batches:
+            arrays = [pa.array([row[index] for row in batch], type=field.type) for index, field in enumerate(schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,252 @@
+"""
+Columnar snapshot store for analytics.
+
+Exports financial_metrics and historical_data to Parquet datasets under
+PARQUET_STORE_PATH, partitioned hive-style by exchange and year:
+
+    <root>/financial_metrics/exchange=NASDAQ/year=2023/part-0.parquet
+    <root>/historical_data/exchange=NYSE/year=2024/part-0.parquet
+
+Each row also carries the company's ticker. Rows are streamed from a
+yield_per cursor straight into the dataset writer. Every export goes to a
+new version directory (<root>/.financial_metrics.<ns>) and <root>/<dataset>
+is a symlink that is replaced atomically once the version is complete, so
+readers never see a half-written export; the previous version is kept for
+readers that opened it before the swap, older ones are removed.
+
+Reads go through pyarrow datasets on a memory-mapped local filesystem:
+only the requested columns of the partitions that pass the exchange/year
+filters are read, e.g. a pe_ratio time series touches three columns
+instead of the whole table.
+
+Usage:
+    python -m app.services.parquet_store                      # export both datasets
+    python -m app.services.parquet_store --dataset metrics    # financial_metrics only
+"""
+
+import argparse
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+from sqlalchemy import Table, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database_models import CompanyDB, FinancialMetricsDB, HistoricalDataDB
+from app.services.metrics_export import arrow_type
+
+METRICS_DATASET = "financial_metrics"
+PRICES_DATASET = "historical_data"
+
+# Partition directories; companies without an exchange go to exchange=UNKNOWN
+PARTITIONING = ds.partitioning(pa.schema([("exchange", pa.string()), ("year", pa.int32())]), flavor="hive")
+UNKNOWN_EXCHANGE = "UNKNOWN"
+
+
+class ParquetSnapshotStore:
+    """
+    Writes and reads the Parquet snapshots of one store root.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.PARQUET_STORE_PATH)
+    
+    def export_metrics(self, db: Session) -> int:
+        """
+        Write a new financial_metrics snapshot, partitioned by the year of period_end.
+        
+        Returns:
+            int: Number of rows written
+        """
+        return self._export(db, METRICS_DATASET, FinancialMetricsDB.__table__, "period_end")
+    
+    def export_prices(self, db: Session) -> int:
+        """
+        Write a new historical_data snapshot, partitioned by the year of the bar date.
+        
+        Returns:
+            int: Number of rows written
+        """
+        return self._export(db, PRICES_DATASET, HistoricalDataDB.__table__, "date")
+    
+    def _export(self, db: Session, name: str, table: Table, date_column: str) -> int:
+        columns = list(table.columns) + [
+            CompanyDB.ticker,
+            func.coalesce(CompanyDB.exchange, UNKNOWN_EXCHANGE).label("exchange"),
+        ]
+        query = select(*columns).join(CompanyDB, CompanyDB.id == table.c.company_id).execution_options(
+            yield_per=settings.BULK_BATCH_SIZE
+        )
+        
+        row_schema = pa.schema(
+            [(column.key, arrow_type(column.type)) for column in table.columns]
+            + [("ticker", pa.string()), ("exchange", pa.string())]
+        )
+        schema = row_schema.append(pa.field("year", pa.int32()))
+        date_index = row_schema.get_field_index(date_column)
+        written = [0]
+        
+        def batches() -> Iterator[pa.RecordBatch]:
+            for partition in db.execute(query).partitions():
+                arrays = [pa.array([row[index] for row in partition], type=field.type) for index, field in enumerate(row_schema)]
+                arrays.append(pc.year(arrays[date_index]).cast(pa.int32()))
+                written[0] += len(partition)
+                yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+        
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = self.root / f".{name}.{time.time_ns()}"
+        ds.write_dataset(
+            batches(),
+            version,
+            schema=schema,
+            format="parquet",
+            partitioning=PARTITIONING,
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        if not version.exists():
+            # No rows, so no partition was written; keep an empty snapshot with the schema
+            version.mkdir()
+            pq.write_table(row_schema.remove(row_schema.get_field_index("exchange")).empty_table(), version / "part-0.parquet")
+        
+        self._publish(name, version)
+        return written[0]
+    
+    def _publish(self, name: str, version: Path) -> None:
+        """
+        Point <root>/<name> at a finished version with an atomic symlink
+        replace, then remove all versions but the new and the previous one.
+        """
+        target = self.root / name
+        previous = None
+        if target.is_symlink():
+            previous = self.root / os.readlink(target)
+        elif target.exists():
+            # Snapshot written as a plain directory by an older release; turn it into a version
+            previous = self.root / f".{name}.0"
+            target.rename(previous)
+        
+        link = self.root / f".{name}.link"
+        link.unlink(missing_ok=True)
+        link.symlink_to(version.name, target_is_directory=True)
+        os.replace(link, target)
+        
+        for path in self.root.glob(f".{name}.*"):
+            if path.is_dir() and not path.is_symlink() and path not in (version, previous):
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def dataset(self, name: str) -> ds.Dataset:
+        """
+        Open a snapshot as a pyarrow dataset on a memory-mapped local filesystem.
+        
+        Raises:
+            FileNotFoundError: If the snapshot has not been exported yet
+        """
+        path = self.root / name
+        if not path.exists():
+            raise FileNotFoundError(f"No {name} snapshot in {self.root}; run python -m app.services.parquet_store")
+        return ds.dataset(
+            str(path.resolve()),
+            format="parquet",
+            partitioning=PARTITIONING,
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+        )
+    
+    def read(
+        self,
+        name: str,
+        columns: Optional[Sequence[str]] = None,
+        exchanges: Optional[Sequence[str]] = None,
+        years: Optional[Sequence[int]] = None,
+        filter: Optional[ds.Expression] = None
+    ) -> pa.Table:
+        """
+        Read columns of a snapshot into an Arrow table.
+        
+        Args:
+            name: METRICS_DATASET or PRICES_DATASET
+            columns: Columns to read (all if None)
+            exchanges: Only read these exchange partitions
+            years: Only read these year partitions
+            filter: Additional row filter, e.g. ds.field("period_type") == "annual"
+        
+        Returns:
+            pa.Table: The selected rows and columns
+        """
+        expression = filter
+        if exchanges is not None:
+            expression = _and(expression, ds.field("exchange").isin(list(exchanges)))
+        if years is not None:
+            expression = _and(expression, ds.field("year").isin(list(years)))
+        return self.dataset(name).to_table(columns=list(columns) if columns is not None else None, filter=expression)
+    
+    def read_metrics(self, columns: Optional[Sequence[str]] = None, **kwargs) -> pd.DataFrame:
+        """
+        Read columns of the financial_metrics snapshot into a DataFrame. See read().
+        """
+        return self.read(METRICS_DATASET, columns, **kwargs).to_pandas()
+    
+    def read_prices(self, columns: Optional[Sequence[str]] = None, **kwargs) -> pd.DataFrame:
+        """
+        Read columns of the historical_data snapshot into a DataFrame. See read().
+        """
+        return self.read(PRICES_DATASET, columns, **kwargs).to_pandas()
+    
+    def metrics_timeseries(self, metric: str, period_type: str = "annual", **kwargs) -> pd.DataFrame:
+        """
+        One metric for every ticker as a wide frame: period_end rows, ticker columns.
+        Only the ticker, period_end, period_type and metric columns are read.
+        """
+        table = self.read(
+            METRICS_DATASET,
+            ["ticker", "period_end", metric],
+            filter=ds.field("period_type") == period_type,
+            **kwargs
+        )
+        return table.to_pandas().pivot(index="period_end", columns="ticker", values=metric).sort_index()
+    
+    def prices_timeseries(self, column: str = "close_price", **kwargs) -> pd.DataFrame:
+        """
+        One price column for every ticker as a wide frame: date rows, ticker columns.
+        """
+        table = self.read(PRICES_DATASET, ["ticker", "date", column], **kwargs)
+        return table.to_pandas().pivot(index="date", columns="ticker", values=column).sort_index()
+
+
+def _and(left: Optional[ds.Expression], right: ds.Expression) -> ds.Expression:
+    return right if left is None else left & right
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export financial metrics and price history to the Parquet snapshot store")
+    parser.add_argument("--dataset", choices=["metrics", "prices", "all"], default="all")
+    parser.add_argument("--root", default=None, help=f"Store root (default: {settings.PARQUET_STORE_PATH})")
+    args = parser.parse_args()
+    
+    from app.core.database import SessionLocal
+    
+    store = ParquetSnapshotStore(args.root)
+    exports = {"metrics": store.export_metrics, "prices": store.export_prices}
+    db = SessionLocal()
+    try:
+        for dataset, export in exports.items():
+            if args.dataset not in (dataset, "all"):
+                continue
+            started = time.perf_counter()
+            rows = export(db)
+            elapsed = time.perf_counter() - started
+            print(f"{dataset}: wrote {rows} rows to {store.root} in {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Technical indicator engine for the historical_data table.
+
+Indicators (SMA 20/50/200, RSI 14, MACD 12/26/9) are computed over whole
+close-price arrays with NumPy/pandas instead of row by row, and written
+back with one executemany UPDATE per batch of companies.
+
+Incremental mode only computes bars newer than the last processed bar:
+SMAs are recomputed from the previous 199 closes, while EMA and RSI
+continue from the state saved in the indicator_state table. Bars
+backfilled on or before the saved state (late imports, gap repairs) change
+the number of processed bars, and such companies are recomputed in full.
+
+Usage:
+    python -m app.services.technical_indicators                  # incremental, all companies
+    python -m app.services.technical_indicators --full           # recompute everything
+    python -m app.services.technical_indicators --company-id 1   # single company
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.database_models import HistoricalDataDB, IndicatorStateDB
+
+SMA_WINDOWS = (20, 50, 200)
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+# Closes needed before the first new bar to recompute the longest SMA
+HISTORY_BARS = max(SMA_WINDOWS) - 1
+
+# Companies loaded into memory per query (~5k daily bars each)
+COMPANY_BATCH_SIZE = 100
+
+
+@dataclass
+class IndicatorState:
+    """Recursive indicator state after the last processed bar."""
+    bars_seen: int
+    last_close: float
+    ema_fast: float
+    ema_slow: float
+    macd_signal: float
+    avg_gain: Optional[float]
+    avg_loss: Optional[float]
+
+
+def _ema(values: np.ndarray, alpha: float, seed: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average y[t] = alpha * x[t] + (1 - alpha) * y[t-1].
+    Without a seed the series starts at x[0]; with a seed it continues from y[-1] = seed.
+    """
+    if seed is None:
+        return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    seeded = np.concatenate(([seed], values))
+    return pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+
+def compute_indicators(
+    closes: np.ndarray,
+    history: Optional[np.ndarray] = None,
+    state: Optional[IndicatorState] = None
+) -> Tuple[Dict[str, np.ndarray], IndicatorState]:
+    """
+    Compute all indicators for a run of consecutive closes.
+    
+    Args:
+        closes: Close prices of the bars to compute, oldest first
+        history: Up to HISTORY_BARS closes preceding `closes` (incremental mode)
+        state: State after the last bar of `history` (incremental mode); RSI can
+            only be continued from a state that already has RSI averages
+    
+    Returns:
+        Tuple of column name -> values (NaN where there is not enough history yet)
+        and the state after the last bar of `closes`
+    """
+    closes = np.asarray(closes, dtype=float)
+    history = np.asarray(history if history is not None else [], dtype=float)
+    offset = state.bars_seen if state else 0
+    # Position of each bar since the first bar of the company
+    position = offset + np.arange(len(closes))
+    
+    columns: Dict[str, np.ndarray] = {}
+    
+    # Simple moving averages over history + new bars
+    window = pd.Series(np.concatenate((history, closes)))
+    for n in SMA_WINDOWS:
+        columns[f"sma_{n}"] = window.rolling(n).mean().to_numpy()[len(history):]
+    
+    # MACD: difference of two EMAs, signal line is an EMA of MACD
+    ema_fast = _ema(closes, 2.0 / (MACD_FAST + 1), state.ema_fast if state else None)
+    ema_slow = _ema(closes, 2.0 / (MACD_SLOW + 1), state.ema_slow if state else None)
+    macd = ema_fast - ema_slow
+    signal = _ema(macd, 2.0 / (MACD_SIGNAL + 1), state.macd_signal if state else None)
+    columns["macd"] = np.where(position >= MACD_SLOW - 1, macd, np.nan)
+    columns["macd_signal"] = np.where(position >= MACD_SLOW + MACD_SIGNAL - 2, signal, np.nan)
+    columns["macd_hist"] = columns["macd"] - columns["macd_signal"]
+    
+    # RSI with Wilder smoothing: seeded with the mean of the first RSI_PERIOD changes
+    previous = np.concatenate(([state.last_close] if state else [np.nan], closes[:-1]))
+    change = closes - previous
+    gain = np.clip(change, 0, None)
+    loss = np.clip(-change, 0, None)
+    avg_gain = np.full(len(closes), np.nan)
+    avg_loss = np.full(len(closes), np.nan)
+    alpha = 1.0 / RSI_PERIOD
+    if state and state.avg_gain is not None:
+        avg_gain = _ema(gain, alpha, state.avg_gain)
+        avg_loss = _ema(loss, alpha, state.avg_loss)
+    elif offset == 0 and len(closes) > RSI_PERIOD:
+        # Bar RSI_PERIOD is the first with RSI_PERIOD price changes behind it
+        avg_gain[RSI_PERIOD] = gain[1:RSI_PERIOD + 1].mean()
+        avg_loss[RSI_PERIOD] = loss[1:RSI_PERIOD + 1].mean()
+        avg_gain[RSI_PERIOD + 1:] = _ema(gain[RSI_PERIOD + 1:], alpha, avg_gain[RSI_PERIOD])
+        avg_loss[RSI_PERIOD + 1:] = _ema(loss[RSI_PERIOD + 1:], alpha, avg_loss[RSI_PERIOD])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    columns["rsi_14"] = np.where(avg_loss == 0, 100.0, rsi)
+    columns["rsi_14"][np.isnan(avg_gain)] = np.nan
+    
+    new_state = IndicatorState(
+        bars_seen=offset + len(closes),
+        last_close=float(closes[-1]),
+        ema_fast=float(ema_fast[-1]),
+        ema_slow=float(ema_slow[-1]),
+        macd_signal=float(signal[-1]),
+        avg_gain=None if np.isnan(avg_gain[-1]) else float(avg_gain[-1]),
+        avg_loss=None if np.isnan(avg_loss[-1]) else float(avg_loss[-1]),
+    )
+    return columns, new_state
+
+
+class TechnicalIndicatorService:
+    """
+    Computes technical indicator columns of historical_data in bulk.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def recompute(self, company_ids: Optional[Sequence[int]] = None, incremental: bool = True) -> int:
+        """
+        Compute indicators for the given companies and write them back.
+        
+        Args:
+            company_ids: Companies to process (None for every company with price data)
+            incremental: Only compute bars after the saved state; companies
+                without saved state are always computed in full
+        
+        Returns:
+            int: Number of bars updated
+        """
+        if company_ids is None:
+            company_ids = list(self.db.scalars(select(HistoricalDataDB.company_id).distinct()))
+        
+        updated = 0
+        for start in range(0, len(company_ids), COMPANY_BATCH_SIZE):
+            updated += self._recompute_batch(list(company_ids[start:start + COMPANY_BATCH_SIZE]), incremental)
+            self.db.commit()
+        return updated
+    
+    def _recompute_batch(self, company_ids: List[int], incremental: bool) -> int:
+        """
+        Compute and write indicators for one batch of companies.
+        """
+        states = {
+            s.company_id: s
+            for s in self.db.scalars(select(IndicatorStateDB).where(IndicatorStateDB.company_id.in_(company_ids)))
+        }
+        # A state without RSI averages (too few bars so far) is cheaper to redo than to continue
+        resume = [
+            cid for cid in company_ids
+            if incremental and cid in states and states[cid].avg_gain is not None
+        ]
+        # Bars inserted or removed up to the saved state invalidate it
+        processed = self._count_processed(resume)
+        resume = [cid for cid in resume if processed.get(cid, 0) == states[cid].bars_seen]
+        from_scratch = [cid for cid in company_ids if cid not in resume]
+        
+        tails = self._load_closes(from_scratch)
+        tails.update(self._load_closes(resume, after_state=True))
+        histories = self._load_history(resume)
+        
+        rows = []
+        for company_id, (dates, closes) in tails.items():
+            if not len(closes):
+                continue
+            db_state = states.get(company_id) if company_id in resume else None
+            state = IndicatorState(
+                bars_seen=db_state.bars_seen,
+                last_close=db_state.last_close,
+                ema_fast=db_state.ema_fast,
+                ema_slow=db_state.ema_slow,
+                macd_signal=db_state.macd_signal,
+                avg_gain=db_state.avg_gain,
+                avg_loss=db_state.avg_loss,
+            ) if db_state else None
+            
+            columns, new_state = compute_indicators(closes, histories.get(company_id), state)
+            
+            frame = pd.DataFrame(columns)
+            frame = frame.astype(object).where(frame.notna(), None)
+            frame["company_id"] = company_id
+            frame["date"] = dates
+            rows.extend(frame.to_dict("records"))
+            
+            self._save_state(states.get(company_id), company_id, dates[-1], new_state)
+        
+        if rows:
+            # ORM bulk UPDATE by primary key: one executemany for the whole batch
+            self.db.execute(update(HistoricalDataDB), rows)
+        return len(rows)
+    
+    def _load_closes(self, company_ids: List[int], after_state: bool = False) -> Dict[int, Tuple[list, np.ndarray]]:
+        """
+        Load (dates, closes) per company in one query, optionally only bars after the saved state.
+        """
+        if not company_ids:
+            return {}
+        query = select(HistoricalDataDB.company_id, HistoricalDataDB.date, HistoricalDataDB.close_price).where(
+            HistoricalDataDB.company_id.in_(company_ids)
+        )
+        if after_state:
+            query = query.join(IndicatorStateDB, IndicatorStateDB.company_id == HistoricalDataDB.company_id).where(
+                HistoricalDataDB.date > IndicatorStateDB.last_date
+            )
+        query = query.order_by(HistoricalDataDB.company_id, HistoricalDataDB.date)
+        
+        result = {company_id: ([], np.empty(0)) for company_id in company_ids}
+        frame = pd.DataFrame(self.db.execute(query).all(), columns=["company_id", "date", "close"])
+        for company_id, group in frame.groupby("company_id", sort=False):
+            result[int(company_id)] = (group["date"].tolist(), group["close"].to_numpy(dtype=float))
+        return result
+    
+    def _count_processed(self, company_ids: List[int]) -> Dict[int, int]:
+        """
+        Count the stored bars up to the saved state of each company in one grouped query.
+        """
+        if not company_ids:
+            return {}
+        query = select(HistoricalDataDB.company_id, func.count()).join(
+            IndicatorStateDB, IndicatorStateDB.company_id == HistoricalDataDB.company_id
+        ).where(
+            HistoricalDataDB.company_id.in_(company_ids),
+            HistoricalDataDB.date <= IndicatorStateDB.last_date
+        ).group_by(HistoricalDataDB.company_id)
+        return dict(self.db.execute(query).all())
+    
+    def _load_history(self, company_ids: List[int]) -> Dict[int, np.ndarray]:
+        """
+        Load the last HISTORY_BARS closes up to the saved state of each company in one windowed query.
+        """
+        if not company_ids:
+            return {}
+        row_number = func.row_number().over(
+            partition_by=HistoricalDataDB.company_id,
+            order_by=HistoricalDataDB.date.desc()
+        ).label("rn")
+        inner = select(
+            HistoricalDataDB.company_id, HistoricalDataDB.date, HistoricalDataDB.close_price, row_number
+        ).join(IndicatorStateDB, IndicatorStateDB.company_id == HistoricalDataDB.company_id).where(
+            HistoricalDataDB.company_id.in_(company_ids),
+            HistoricalDataDB.date <= IndicatorStateDB.last_date
+        ).subquery()
+        query = select(inner.c.company_id, inner.c.close_price).where(
+            inner.c.rn <= HISTORY_BARS
+        ).order_by(inner.c.company_id, inner.c.date)
+        
+        frame = pd.DataFrame(self.db.execute(query).all(), columns=["company_id", "close"])
+        return {
+            int(company_id): group["close"].to_numpy(dtype=float)
+            for company_id, group in frame.groupby("company_id", sort=False)
+        }
+    
+    def _save_state(self, db_state: Optional[IndicatorStateDB], company_id: int, last_date, state: IndicatorState) -> None:
+        """
+        Store the state after the last computed bar; flushed with the batch commit.
+        """
+        if db_state is None:
+            db_state = IndicatorStateDB(company_id=company_id)
+            self.db.add(db_state)
+        db_state.last_date = last_date
+        db_state.bars_seen = state.bars_seen
+        db_state.last_close = state.last_close
+        db_state.ema_fast = state.ema_fast
+        db_state.ema_slow = state.ema_slow
+        db_state.macd_signal = state.macd_signal
+        db_state.avg_gain = state.avg_gain
+        db_state.avg_loss = state.avg_loss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute technical indicators for historical price data")
+    parser.add_argument("--full", action="store_true", help="Recompute all bars instead of only new ones")
+    parser.add_argument("--company-id", type=int, action="append", help="Limit to a company (repeatable)")
+    args = parser.parse_args()
+    
+    from app.core.database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        updated = TechnicalIndicatorService(db).recompute(args.company_id, incremental=not args.full)
+        elapsed = time.perf_counter() - started
+        print(f"Updated indicators for {updated} bars in {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
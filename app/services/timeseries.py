@@ -0,0 +1,256 @@
+"""
+Aligned time series of financial metrics and prices for many tickers.
+
+A query names tickers and fields (financial_metrics and/or historical_data
+columns). Each table is read with one query for all tickers, and the rows
+are pivoted in pandas into a date x (field, ticker) frame, optionally:
+
+- ttm: each ticker's last four quarters are summed first (trailing twelve
+  months from quarterly metrics); a sum spanning a missing quarter is NaN
+- resampled to daily, weekly, monthly, quarterly or annual buckets with an
+  aggregation (last, first, mean, sum, min, max)
+- forward-filled, so slow fields (annual metrics) line up with fast ones
+  (daily prices) on the common index
+
+Rows from a short lookback before `start` are read as well, so the first
+dates of the result carry the value in force at that time instead of
+starting empty.
+
+The result is returned as columnar JSON (one value list per field and
+ticker) or as an Arrow IPC stream in long (date, ticker) layout.
+"""
+
+import io
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.database_models import CompanyDB, FinancialMetricsDB, HistoricalDataDB
+from app.models.timeseries import TimeseriesQuery
+from app.repositories.financial_metrics_repository import METRIC_COLUMNS
+from app.repositories.historical_data_repository import PRICE_COLUMNS
+
+PRICE_FIELDS = [column for column in PRICE_COLUMNS if column != "date"]
+
+# Bucket of each frequency, labelled with its end date (weeks end on Friday)
+FREQUENCIES = {
+    "daily": pd.offsets.Day(),
+    "weekly": pd.offsets.Week(weekday=4),
+    "monthly": pd.offsets.MonthEnd(),
+    "quarterly": pd.offsets.QuarterEnd(),
+    "annual": pd.offsets.YearEnd(),
+}
+
+# Periods summed by the ttm aggregation
+TTM_PERIODS = 4
+
+# Longest distance between the first and last quarter end of a ttm sum: four
+# consecutive quarters end ~9 months apart, with a gap they are 12 months apart
+TTM_MAX_SPAN = timedelta(days=300)
+
+# How far before `start` rows are read, per source: enough for an annual
+# value (or four quarters) and for a price across a long weekend
+LOOKBACK = {"metrics": timedelta(days=370), "prices": timedelta(days=10)}
+
+# Largest result (dates x fields x tickers) a query may produce
+MAX_CELLS = 5_000_000
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[pd.Timestamp]:
+    """Compare everything as naive UTC, like the pandas frames below."""
+    if value is None:
+        return None
+    stamp = pd.Timestamp(value)
+    return stamp.tz_convert("UTC").tz_localize(None) if stamp.tzinfo is not None else stamp
+
+
+@dataclass
+class TimeseriesResult:
+    # Date index, (field, ticker) columns in request order
+    frame: pd.DataFrame
+    missing_tickers: List[str] = field(default_factory=list)
+
+
+class TimeseriesService:
+    """
+    Runs time-series queries over financial_metrics and historical_data.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    @staticmethod
+    def split_fields(query: TimeseriesQuery) -> Tuple[List[str], List[str]]:
+        """
+        Split the requested fields by source table.
+        
+        Returns:
+            Tuple[List[str], List[str]]: Metric fields, price fields
+        
+        Raises:
+            ValueError: If a field is unknown, or ttm is requested for prices
+                or for metrics that are not quarterly
+        """
+        unknown = [name for name in query.fields if name not in METRIC_COLUMNS and name not in PRICE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        metric_fields = [name for name in dict.fromkeys(query.fields) if name in METRIC_COLUMNS]
+        price_fields = [name for name in dict.fromkeys(query.fields) if name in PRICE_FIELDS]
+        if query.aggregation == "ttm" and price_fields:
+            raise ValueError(f"ttm only applies to financial metrics, not to {', '.join(price_fields)}")
+        if query.aggregation == "ttm" and query.period_type != "quarterly":
+            raise ValueError(f"ttm sums four quarters and requires period_type=quarterly, not {query.period_type}")
+        return metric_fields, price_fields
+    
+    def _load(self, model, date_column, fields: Sequence[str], query: TimeseriesQuery, lookback: timedelta, *filters) -> pd.DataFrame:
+        """
+        Read the fields of all tickers from one table in one query, as a long
+        frame with ticker, date and one column per field.
+        """
+        date_attr = getattr(model, date_column)
+        conditions = [CompanyDB.ticker.in_(query.tickers), *filters]
+        if query.start is not None:
+            conditions.append(date_attr >= query.start - lookback)
+        if query.end is not None:
+            conditions.append(date_attr <= query.end)
+        rows = self.db.execute(
+            select(CompanyDB.ticker, date_attr, *(getattr(model, name) for name in fields))
+            .join(CompanyDB, CompanyDB.id == model.company_id)
+            .where(*conditions)
+            .order_by(CompanyDB.ticker, date_attr)
+        ).all()
+        frame = pd.DataFrame(rows, columns=["ticker", "date", *fields])
+        frame["date"] = pd.to_datetime(frame["date"], utc=True).dt.tz_localize(None)
+        frame[list(fields)] = frame[list(fields)].astype("float64")
+        return frame
+    
+    def query(self, query: TimeseriesQuery) -> TimeseriesResult:
+        """
+        Run a time-series query.
+        
+        Args:
+            query: Tickers, fields, date range, frequency and aggregation
+        
+        Returns:
+            TimeseriesResult: Aligned frame and the tickers without any data
+        
+        Raises:
+            ValueError: If a field is unknown, ttm is combined with price
+                fields or non-quarterly metrics, or the result would exceed MAX_CELLS
+        """
+        metric_fields, price_fields = self.split_fields(query)
+        tickers = list(dict.fromkeys(query.tickers))
+        
+        wide_frames = []
+        for fields, model, date_column, source, filters in (
+            (metric_fields, FinancialMetricsDB, "period_end", "metrics", (FinancialMetricsDB.period_type == query.period_type,)),
+            (price_fields, HistoricalDataDB, "date", "prices", ()),
+        ):
+            if not fields:
+                continue
+            long = self._load(model, date_column, fields, query, LOOKBACK[source], *filters)
+            if query.aggregation == "ttm":
+                long[fields] = self._ttm(long, fields)
+            wide_frames.append(long.pivot(index="date", columns="ticker", values=fields))
+        
+        wide = pd.concat(wide_frames, axis=1).sort_index()
+        present = set(wide.columns.get_level_values(1))
+        found = [ticker for ticker in tickers if ticker in present]
+        columns = pd.MultiIndex.from_product([metric_fields + price_fields, found])
+        wide = wide.reindex(columns=columns)
+        
+        if query.frequency is not None and not wide.empty:
+            offset = FREQUENCIES[query.frequency]
+            buckets = len(pd.date_range(wide.index.min(), wide.index.max() + offset, freq=offset))
+            self._check_size(buckets, len(columns))
+            resampler = wide.resample(offset)
+            if query.aggregation == "sum":
+                # An empty bucket would sum to 0; keep it missing like the other aggregations
+                wide = resampler.sum(min_count=1)
+            else:
+                wide = getattr(resampler, "last" if query.aggregation == "ttm" else query.aggregation)()
+        else:
+            self._check_size(len(wide.index), len(columns))
+        
+        if query.ffill:
+            wide = wide.ffill()
+        
+        start, end = _naive_utc(query.start), _naive_utc(query.end)
+        if start is not None:
+            wide = wide[wide.index >= start]
+        if end is not None:
+            wide = wide[wide.index <= end]
+        return TimeseriesResult(frame=wide, missing_tickers=[ticker for ticker in tickers if ticker not in present])
+    
+    @staticmethod
+    def _ttm(long: pd.DataFrame, fields: Sequence[str]) -> pd.DataFrame:
+        """
+        Rolling sum over each ticker's own last four quarters, before dates
+        are aligned across tickers. Sums whose quarters are further apart
+        than TTM_MAX_SPAN (a quarter is missing) are NaN.
+        """
+        by_ticker = long.groupby("ticker", sort=False)
+        sums = by_ticker[list(fields)].rolling(TTM_PERIODS, min_periods=TTM_PERIODS).sum().reset_index(level=0, drop=True)
+        span = long["date"] - by_ticker["date"].shift(TTM_PERIODS - 1)
+        return sums.where(span <= TTM_MAX_SPAN)
+    
+    @staticmethod
+    def _check_size(dates: int, columns: int) -> None:
+        if dates * columns > MAX_CELLS:
+            raise ValueError(
+                f"Result would have {dates} dates x {columns} columns; narrow the date range, "
+                f"tickers or fields, or use a coarser frequency (limit {MAX_CELLS} values)"
+            )
+
+
+def to_columnar(result: TimeseriesResult, query: TimeseriesQuery) -> Dict:
+    """
+    Columnar payload of the TimeseriesResponse model: one list per field and ticker.
+    """
+    frame = result.frame
+    values = frame.astype(object).where(frame.notna(), None)
+    columns: Dict[str, Dict[str, list]] = {}
+    for (name, ticker), column in values.items():
+        columns.setdefault(name, {})[ticker] = column.tolist()
+    return {
+        "index": [stamp.date() for stamp in frame.index],
+        "frequency": query.frequency,
+        "aggregation": query.aggregation,
+        "columns": columns,
+        "missing_tickers": result.missing_tickers,
+    }
+
+
+def to_arrow(result: TimeseriesResult) -> bytes:
+    """
+    Arrow IPC stream of the result in long layout: date, ticker and one
+    column per field, for every date where a ticker has a value.
+    """
+    import pyarrow as pa
+    
+    frame = result.frame
+    if frame.columns.empty:
+        long = pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "ticker": pd.Series(dtype=object)})
+    else:
+        long = frame.stack(level=1, future_stack=True).dropna(how="all")
+        long.index = long.index.set_names(["date", "ticker"])
+        long = long.reset_index()
+    table = pa.Table.from_pandas(long, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Bulk import script for Investment AI Companion.
+Loads vendor dumps (CSV or Parquet) of companies, fundamentals and daily
+prices in chunks. See app/services/bulk_import.py for the details.
+
+Usage:
+    python import_data.py companies companies.csv
+    python import_data.py metrics fundamentals.parquet
+    python import_data.py prices ohlcv.csv --chunk-size 100000
+
+Metrics and price files can reference companies by company_id or ticker.
+Metrics rows that are already stored are updated with the file's values.
+Rejected rows are written to <file>.rejects.csv. If an import stops, run the
+same command again to continue after the last committed chunk.
+"""
+
+import argparse
+import sys
+
+# Add the project root to Python path
+sys.path.append('.')
+
+from app.core.database import SessionLocal
+from app.core.init_db import init_db
+from app.services.bulk_import import IMPORT_KINDS, BulkImporter, ImportProgress
+
+def print_progress(progress: ImportProgress):
+    done = progress.rows_skipped + progress.rows_read
+    total = f"/{progress.total_rows:,} ({done / progress.total_rows:.0%})" if progress.total_rows else ""
+    print(
+        f"\r  {done:,}{total} rows | {progress.rows_rejected:,} rejected | "
+        f"{progress.rows_per_second:,.0f} rows/s ({progress.rows_per_second * 60:,.0f} rows/min)",
+        end="",
+        flush=True
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import data into Investment AI Companion')
+    parser.add_argument('kind', choices=sorted(IMPORT_KINDS), help='What the file contains')
+    parser.add_argument('path', help='CSV or Parquet file')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='Rows per chunk/transaction')
+    args = parser.parse_args()
+    
+    print(f"📥 Importing {args.kind} from {args.path}...")
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        importer = BulkImporter(db, args.kind, args.path, chunk_size=args.chunk_size)
+        progress = importer.run(on_progress=print_progress)
+        print()
+        if progress.rows_skipped:
+            print(f"⏩ Resumed after {progress.rows_skipped:,} rows committed by a previous run")
+        print(f"✅ {progress.rows_written:,} rows loaded in {progress.elapsed:.1f}s")
+        if args.kind == "companies" and progress.rows_written:
+            print("💡 Restart a running API server to make the new companies searchable")
+        if progress.rows_rejected:
+            print(f"⚠️  {progress.rows_rejected:,} rows rejected, see {importer.rejects_path}")
+    except Exception as e:
+        print(f"\n❌ Import failed: {e}")
+        print("💡 Fix the problem and run the same command again to resume")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
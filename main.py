@@ -4,10 +4,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from typing import Dict
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import SessionLocal, async_engine, engine
 from app.models.database_models import Base
 from app.api.companies import router as companies_router
 from app.api.financial_metrics import router as financial_metrics_router
+from app.api.historical_data import router as historical_data_router
+from app.api.metrics import router as metrics_router
+from app.api.screener import router as screener_router
+from app.api.refresh import router as refresh_router
+from app.api.analytics import router as analytics_router
+from app.api.factors import router as factors_router
+from app.api.timeseries import router as timeseries_router
+from app.repositories.financial_metrics_repository import FinancialMetricsRepository
+from app.services.company_search import ensure_search_indexes, rebuild_search_index
+from app.services.fulltext_search import get_fulltext_indexer, prepare_fulltext_index
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -39,6 +49,59 @@ async def startup_event():
         print(f"❌ Error creating database tables: {e}")
         # In production, you might want to exit here if the database is critical
         # For development, we'll continue and let the app start
+    
+    try:
+        # Fill the latest-metrics snapshot on databases created before it was maintained
+        db = SessionLocal()
+        try:
+            rebuilt = FinancialMetricsRepository(db).ensure_latest()
+        finally:
+            db.close()
+        if rebuilt is not None:
+            print(f"✅ Latest financial metrics snapshot rebuilt ({rebuilt} rows)")
+    except Exception as e:
+        print(f"❌ Error checking latest financial metrics snapshot: {e}")
+    
+    try:
+        # Company type-ahead search (GET /companies/search)
+        if settings.COMPANY_SEARCH_BACKEND == "postgres":
+            ensure_search_indexes(engine)
+            print("✅ Company search trigram index verified!")
+        else:
+            db = SessionLocal()
+            try:
+                indexed = rebuild_search_index(db)
+            finally:
+                db.close()
+            print(f"✅ Company search index built ({indexed} companies)")
+    except Exception as e:
+        print(f"❌ Error preparing company search: {e}")
+
+    try:
+        # Full-text search (GET /companies/fulltext) and its batched index writer
+        await get_fulltext_indexer().start()
+        db = SessionLocal()
+        try:
+            indexed = prepare_fulltext_index(db)
+        finally:
+            db.close()
+        if indexed is None:
+            print(f"✅ Elasticsearch index {settings.ELASTICSEARCH_COMPANY_INDEX} verified!")
+        else:
+            print(f"✅ Full-text search index built ({indexed} companies)")
+    except Exception as e:
+        print(f"❌ Error preparing full-text search: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Write pending search index updates and close pooled connections when
+    the application stops.
+    """
+    await get_fulltext_indexer().stop()
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -78,8 +141,22 @@ async def test_config() -> Dict:
     
     return config_status
 
+if settings.DATABASE_ASYNC:
+    # Registered first so the async read routes take precedence over their sync twins
+    from app.api.async_endpoints import companies_router as async_companies_router
+    from app.api.async_endpoints import financial_metrics_router as async_financial_metrics_router
+    app.include_router(async_companies_router, prefix=settings.API_V1_STR)
+    app.include_router(async_financial_metrics_router, prefix=settings.API_V1_STR)
+
 app.include_router(companies_router, prefix=settings.API_V1_STR)
 app.include_router(financial_metrics_router, prefix=settings.API_V1_STR)
+app.include_router(historical_data_router, prefix=settings.API_V1_STR)
+app.include_router(metrics_router, prefix=settings.API_V1_STR)
+app.include_router(screener_router, prefix=settings.API_V1_STR)
+app.include_router(refresh_router, prefix=settings.API_V1_STR)
+app.include_router(analytics_router, prefix=settings.API_V1_STR)
+app.include_router(factors_router, prefix=settings.API_V1_STR)
+app.include_router(timeseries_router, prefix=settings.API_V1_STR)
 
 if __name__ == "__main__":
     uvicorn.run(
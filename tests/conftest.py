@@ -0,0 +1,66 @@
+import os
+
+# The app creates its engine at import time; point it at SQLite instead of the default PostgreSQL URL
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.cache import LRUCache, set_cache
+from app.core.config import settings
+from app.core.database import Base, enable_sqlite_foreign_keys, get_db
+from app.services import company_search, fulltext_search
+from main import app
+
+
+@pytest.fixture(autouse=True)
+def cache():
+    """Empty in-process response cache for every test, so IDs reused across test databases never hit."""
+    cache = LRUCache(settings.CACHE_MAX_ENTRIES)
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+@pytest.fixture(autouse=True)
+def search_indexes(monkeypatch):
+    """Fresh process-wide type-ahead and local full-text indexes for every test."""
+    monkeypatch.setattr(company_search, "_index", company_search.CompanySearchIndex())
+    monkeypatch.setattr(fulltext_search, "_indexer", fulltext_search.FulltextIndexer(fulltext_search.LocalFulltextIndex()))
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite database shared by every connection of the test."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    enable_sqlite_foreign_keys(engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine):
+    """TestClient whose requests use the test database; startup tasks are not run."""
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,77 @@
+import pytest
+
+URL = "/api/v1/analytics/aggregates"
+
+
+@pytest.fixture
+def companies(client):
+    """Four technology companies with pe_ratio 10-40, one energy company, and one without metrics."""
+    ids = {}
+    for ticker, sector, pe_ratio in (("T1", "Tech", 10.0), ("T2", "Tech", 20.0), ("T3", "Tech", 30.0), ("T4", "Tech", 40.0), ("E1", "Energy", 5.0), ("E2", "Energy", None)):
+        company = client.post("/api/v1/companies/", json={"name": ticker, "ticker": ticker, "sector": sector}).json()
+        ids[ticker] = company["id"]
+        if pe_ratio is not None:
+            client.post("/api/v1/financial-metrics/bulk-upsert", json=[
+                # An older period that the latest one hides
+                {"company_id": company["id"], "period_type": "annual", "period_end": "2022-12-31T00:00:00Z", "pe_ratio": 1000.0},
+                {"company_id": company["id"], "period_type": "annual", "period_end": "2023-12-31T00:00:00Z", "pe_ratio": pe_ratio, "roe": 0.1},
+            ])
+    return ids
+
+
+def aggregates(client, **params):
+    response = client.get(URL, params={"metrics": "pe_ratio", **params})
+    assert response.status_code == 200
+    return {group["group"]: group for group in response.json()["groups"]}
+
+
+def test_statistics_of_latest_periods_per_sector(client, companies):
+    groups = aggregates(client, metrics="pe_ratio,roe", stat="count,mean,median,p25,min,max,stddev")
+    
+    assert list(groups) == ["Tech", "Energy"]
+    tech = groups["Tech"]["metrics"]["pe_ratio"]
+    assert groups["Tech"]["companies"] == 4
+    assert tech["count"] == 4 and tech["min"] == 10.0 and tech["max"] == 40.0
+    assert tech["mean"] == pytest.approx(25.0)
+    assert tech["median"] == pytest.approx(25.0)
+    assert tech["p25"] == pytest.approx(17.5)
+    assert tech["stddev"] == pytest.approx(12.9099, abs=1e-4)
+    energy = groups["Energy"]["metrics"]["pe_ratio"]
+    # One value: no spread
+    assert (groups["Energy"]["companies"], energy["count"], energy["stddev"]) == (1, 1, None)
+
+
+def test_metrics_writes_invalidate_cached_aggregates(client, companies):
+    assert aggregates(client)["Energy"]["metrics"]["pe_ratio"]["median"] == 5.0
+    
+    client.post("/api/v1/financial-metrics/bulk-upsert", json=[
+        {"company_id": companies["E2"], "period_type": "annual", "period_end": "2023-12-31T00:00:00Z", "pe_ratio": 7.0}
+    ])
+    
+    energy = aggregates(client)["Energy"]
+    assert energy["companies"] == 2
+    assert energy["metrics"]["pe_ratio"]["median"] == 6.0
+
+
+def test_sector_change_and_delete_invalidate_cached_aggregates(client, companies):
+    before = aggregates(client, stat="count,median")["Energy"]["metrics"]["pe_ratio"]
+    
+    client.put(f"/api/v1/companies/{companies['T4']}", json={"sector": "Energy"})
+    moved = aggregates(client, stat="count,median")["Energy"]["metrics"]["pe_ratio"]
+    
+    client.delete(f"/api/v1/companies/{companies['E1']}")
+    deleted = aggregates(client, stat="count,median")["Energy"]["metrics"]["pe_ratio"]
+    
+    assert (before["count"], moved["count"], deleted["count"]) == (1, 2, 1)
+    assert deleted["median"] == 40.0
+
+
+@pytest.mark.parametrize("params", [
+    {"group_by": "ticker"},
+    {"metrics": "pe_ratio,bogus"},
+    {"stat": "median,mode"},
+])
+def test_invalid_parameters_are_rejected(client, params):
+    response = client.get(URL, params={"metrics": "pe_ratio", **params})
+    
+    assert response.status_code == 400
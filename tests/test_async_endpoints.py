@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api import async_endpoints, companies, financial_metrics
+from app.core.cache import RedisCache, set_cache
+from app.core.database import Base, enable_sqlite_foreign_keys, get_async_db, get_db
+
+PREFIX = "/api/v1"
+
+
+@pytest.fixture
+def clients(tmp_path):
+    """
+    A sync-only app and an app with the async read routers in front, as
+    main.py builds it with DATABASE_ASYNC=true, both on the same SQLite file.
+    """
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    enable_sqlite_foreign_keys(engine)
+    Base.metadata.create_all(bind=engine)
+    # Every TestClient request runs on a new event loop, so async connections are not pooled
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    enable_sqlite_foreign_keys(async_engine.sync_engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+    
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+    
+    apps = {}
+    for mode in ("sync", "async"):
+        app = FastAPI()
+        if mode == "async":
+            app.include_router(async_endpoints.companies_router, prefix=PREFIX)
+            app.include_router(async_endpoints.financial_metrics_router, prefix=PREFIX)
+        app.include_router(companies.router, prefix=PREFIX)
+        app.include_router(financial_metrics.router, prefix=PREFIX)
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        apps[mode] = TestClient(app)
+    yield apps
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded(clients):
+    client = clients["sync"]
+    ids = []
+    for ticker in ("AAA", "BBB", "CCC"):
+        company = client.post(f"{PREFIX}/companies/", json={"name": f"Company {ticker}", "ticker": ticker}).json()
+        ids.append(company["id"])
+        for year in (2021, 2022, 2023):
+            response = client.post(f"{PREFIX}/financial-metrics/", json={
+                "company_id": company["id"], "period_end": f"{year}-12-31T00:00:00Z", "period_type": "annual",
+                "revenue": 1000 * year, "roe": 0.1
+            })
+            assert response.status_code == 201
+    return ids
+
+
+def read_paths(ids):
+    return [
+        "/companies/?limit=2",
+        f"/companies/?ids={ids[2]},{ids[0]},999&tickers=BBB,ZZZ",
+        "/companies/with-metrics?last_n=2",
+        f"/companies/{ids[0]}",
+        "/companies/ticker/BBB",
+        "/financial-metrics/?limit=4&fields=roe",
+        f"/financial-metrics/latest?company_id={ids[0]}&company_id={ids[1]}",
+        f"/financial-metrics/company/{ids[1]}?limit=2",
+    ]
+
+
+def test_async_routes_return_the_same_responses_as_sync(clients, seeded):
+    for path in read_paths(seeded):
+        sync_response = clients["sync"].get(PREFIX + path)
+        async_response = clients["async"].get(PREFIX + path)
+        
+        assert sync_response.status_code == async_response.status_code == 200, path
+        assert async_response.content == sync_response.content, path
+        for header in ("X-Next-Cursor", "X-Missing-Ids", "X-Missing-Tickers"):
+            assert async_response.headers.get(header) == sync_response.headers.get(header), (path, header)
+
+
+def test_async_routes_follow_cursors_and_report_errors(clients, seeded):
+    client = clients["async"]
+    first = client.get(f"{PREFIX}/financial-metrics/company/{seeded[0]}", params={"limit": 2})
+    second = client.get(
+        f"{PREFIX}/financial-metrics/company/{seeded[0]}",
+        params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]}
+    )
+    
+    periods = [row["period_end"][:4] for row in first.json() + second.json()]
+    assert periods == ["2023", "2022", "2021"]
+    assert client.get(f"{PREFIX}/companies/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get(f"{PREFIX}/financial-metrics/", params={"fields": "nope"}).status_code == 400
+    assert client.get(f"{PREFIX}/companies/999").status_code == 404
+    assert client.get(f"{PREFIX}/financial-metrics/999").status_code == 404
+
+
+def test_routes_not_served_async_fall_through_to_sync(clients, seeded):
+    client = clients["async"]
+    
+    assert client.get(f"{PREFIX}/financial-metrics/export").status_code == 200
+    assert client.get(f"{PREFIX}/companies/search", params={"q": "AAA"}).status_code == 200
+    assert client.put(f"{PREFIX}/companies/{seeded[0]}", json={"sector": "Energy"}).json()["sector"] == "Energy"
+
+
+class RecordingRedis:
+    """redis-py client stand-in that records whether it is called on an event loop thread."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def _record(self, name):
+        try:
+            asyncio.get_running_loop()
+            self.calls.append((name, True))
+        except RuntimeError:
+            self.calls.append((name, False))
+    
+    def hget(self, key, field):
+        self._record("hget")
+        return None
+    
+    def pipeline(self):
+        return self
+    
+    def hset(self, key, field, value):
+        self._record("hset")
+    
+    def expire(self, key, ttl):
+        pass
+    
+    def execute(self):
+        pass
+
+
+def test_async_routes_call_redis_off_the_event_loop(clients, seeded):
+    redis = RecordingRedis()
+    set_cache(RedisCache(redis))
+    
+    assert clients["async"].get(f"{PREFIX}/companies/{seeded[0]}").status_code == 200
+    assert clients["async"].get(f"{PREFIX}/financial-metrics/company/{seeded[0]}").status_code == 200
+    
+    assert [name for name, _ in redis.calls] == ["hget", "hset", "hget", "hset"]
+    assert not any(on_loop for _, on_loop in redis.calls)
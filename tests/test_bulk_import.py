@@ -0,0 +1,114 @@
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy import select
+
+from app.models.database_models import CompanyDB, FinancialMetricsDB
+from app.services.bulk_import import BulkImporter
+from app.services.company_search import get_search_index
+from app.services.fulltext_search import get_fulltext_index
+
+
+def write_csv(tmp_path, name, rows):
+    path = tmp_path / name
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def companies_file(tmp_path):
+    return write_csv(tmp_path, "companies.csv", [
+        {"name": f"Company {index}", "ticker": f"TK{index}", "website": "https://example.com", "description": "Cloud software"}
+        for index in range(5)
+    ])
+
+
+def test_imports_in_chunks_and_fills_defaults(db, companies_file):
+    reports = []
+    
+    progress = BulkImporter(db, "companies", str(companies_file), chunk_size=2).run(
+        on_progress=lambda progress: reports.append(progress.rows_read)
+    )
+    
+    assert reports == [2, 4, 5]
+    assert progress.rows_written == 5
+    companies = db.scalars(select(CompanyDB).order_by(CompanyDB.ticker)).all()
+    assert [company.ticker for company in companies] == [f"TK{index}" for index in range(5)]
+    # Python-side defaults that a plain INSERT ... SELECT would leave NULL
+    assert all(company.is_active is True and company.currency == "USD" for company in companies)
+    assert not companies_file.with_name("companies.csv.import-state.json").exists()
+
+
+def test_reimporting_companies_skips_stored_rows(db, companies_file):
+    BulkImporter(db, "companies", str(companies_file)).run()
+    
+    progress = BulkImporter(db, "companies", str(companies_file)).run()
+    
+    assert progress.rows_read == 5
+    assert progress.rows_written == 0
+
+
+def test_imported_companies_are_searchable(db, companies_file):
+    BulkImporter(db, "companies", str(companies_file)).run()
+    
+    assert len(get_search_index()) == 5
+    assert get_search_index().search("TK3")[0].ticker == "TK3"
+    assert len(get_fulltext_index().search("cloud").hits) == 5
+
+
+def test_rejects_keep_the_file_columns(db, tmp_path):
+    db.add(CompanyDB(name="Company A", ticker="AAA"))
+    db.commit()
+    path = write_csv(tmp_path, "metrics.csv", [
+        {"ticker": "AAA", "period_end": "2023-12-31", "period_type": "annual", "pe_ratio": "10"},
+        {"ticker": "AAA", "period_end": "not a date", "period_type": "annual", "pe_ratio": "11"},
+        {"ticker": "ZZZ", "period_end": "2023-12-31", "period_type": "annual", "pe_ratio": "12"},
+    ])
+    
+    progress = BulkImporter(db, "metrics", str(path)).run()
+    
+    assert (progress.rows_written, progress.rows_rejected) == (1, 2)
+    rejects = pd.read_csv(path.with_name("metrics.csv.rejects.csv"), dtype=str)
+    assert list(rejects.columns) == ["ticker", "period_end", "period_type", "pe_ratio", "reason"]
+    assert rejects["reason"].tolist() == ["invalid period_end", "missing company_id"]
+
+
+def test_reimporting_metrics_updates_values(db, tmp_path):
+    db.add(CompanyDB(name="Company A", ticker="AAA"))
+    db.commit()
+    row = {"ticker": "AAA", "period_end": "2023-12-31", "period_type": "annual", "pe_ratio": "10", "roe": "0.2"}
+    BulkImporter(db, "metrics", str(write_csv(tmp_path, "first.csv", [row]))).run()
+    
+    # The corrected file carries pe_ratio only; other stored values are kept
+    corrected = {key: value for key, value in row.items() if key != "roe"}
+    progress = BulkImporter(db, "metrics", str(write_csv(tmp_path, "second.csv", [{**corrected, "pe_ratio": "20"}]))).run()
+    
+    assert progress.rows_written == 1
+    db.expire_all()
+    metrics = db.scalars(select(FinancialMetricsDB)).one()
+    assert (metrics.pe_ratio, metrics.roe) == (20.0, 0.2)
+
+
+def test_resumes_after_the_last_checkpoint(db, companies_file):
+    importer = BulkImporter(db, "companies", str(companies_file), chunk_size=2)
+    # A previous run committed the first two rows and stopped
+    importer._save_checkpoint(2)
+    assert json.loads(importer.state_path.read_text())["rows_done"] == 2
+    
+    progress = importer.run()
+    
+    assert progress.rows_skipped == 2
+    assert progress.rows_read == 3
+    assert db.scalars(select(CompanyDB.ticker).order_by(CompanyDB.ticker)).all() == ["TK2", "TK3", "TK4"]
+
+
+def test_changed_file_starts_over(db, companies_file):
+    importer = BulkImporter(db, "companies", str(companies_file))
+    importer._save_checkpoint(2)
+    companies_file.write_text(companies_file.read_text() + "Company 5,TK5,https://example.com,Cloud software\n")
+    
+    progress = importer.run()
+    
+    assert progress.rows_skipped == 0
+    assert progress.rows_written == 6
@@ -0,0 +1,116 @@
+from sqlalchemy import update
+
+from app.core import cache as cache_module
+from app.core.cache import LRUCache, company_key
+from app.models.database_models import CompanyDB
+
+URL = "/api/v1/companies/"
+
+
+def create_company(client, ticker="AAA", name="Company A"):
+    response = client.post(URL, json={"name": name, "ticker": ticker})
+    assert response.status_code == 201
+    return response.json()
+
+
+def rename_in_database(db, company_id, name):
+    """Change a company behind the repository's back, so only a cache miss can see it."""
+    db.execute(update(CompanyDB).where(CompanyDB.id == company_id).values(name=name))
+    db.commit()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+
+def test_company_reads_are_served_from_cache(client, db, cache):
+    company = create_company(client)
+    client.get(f"{URL}{company['id']}")
+    client.get(f"{URL}ticker/AAA")
+    
+    rename_in_database(db, company["id"], "Renamed")
+    
+    assert client.get(f"{URL}{company['id']}").json()["name"] == "Company A"
+    assert client.get(f"{URL}ticker/AAA").json()["name"] == "Company A"
+    assert cache.get(company_key(company["id"]), "body") is not None
+
+
+def test_update_invalidates_id_and_ticker_entries(client, db):
+    company = create_company(client)
+    client.get(f"{URL}{company['id']}")
+    client.get(f"{URL}ticker/AAA")
+    
+    response = client.put(f"{URL}{company['id']}", json={"name": "Updated", "ticker": "BBB"})
+    assert response.status_code == 200
+    
+    assert client.get(f"{URL}{company['id']}").json()["name"] == "Updated"
+    assert client.get(f"{URL}ticker/AAA").status_code == 404
+    assert client.get(f"{URL}ticker/BBB").json()["name"] == "Updated"
+
+
+def test_delete_invalidates(client):
+    company = create_company(client)
+    client.get(f"{URL}{company['id']}")
+    client.get(f"{URL}ticker/AAA")
+    
+    assert client.delete(f"{URL}{company['id']}").status_code == 204
+    
+    assert client.get(f"{URL}{company['id']}").status_code == 404
+    assert client.get(f"{URL}ticker/AAA").status_code == 404
+
+
+def test_create_invalidates_ticker_entry(client, db):
+    company = create_company(client)
+    client.get(f"{URL}ticker/AAA")
+    # Removed without the repository, so the cached ticker entry is stale
+    db.query(CompanyDB).filter(CompanyDB.id == company["id"]).delete()
+    db.commit()
+    
+    replacement = create_company(client, name="Company B")
+    
+    assert client.get(f"{URL}ticker/AAA").json()["id"] == replacement["id"]
+
+
+def test_metrics_writes_invalidate_company_pages(client):
+    company = create_company(client)
+    url = f"/api/v1/financial-metrics/company/{company['id']}"
+    assert client.get(url).json() == []
+    
+    client.post("/api/v1/financial-metrics/", json={
+        "company_id": company["id"], "period_type": "annual", "period_end": "2023-12-31T00:00:00Z", "pe_ratio": 10.0
+    })
+    assert len(client.get(url).json()) == 1
+    
+    client.post("/api/v1/financial-metrics/bulk-upsert", json=[
+        {"company_id": company["id"], "period_type": "annual", "period_end": "2022-12-31T00:00:00Z", "pe_ratio": 9.0}
+    ])
+    assert len(client.get(url).json()) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    cache = LRUCache(max_entries=10)
+    cache.set("key", "body", b"value", ttl=60)
+    
+    clock.now += 59
+    assert cache.get("key", "body") == b"value"
+    clock.now += 2
+    assert cache.get("key", "body") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "body", b"a", ttl=60)
+    cache.set("b", "body", b"b", ttl=60)
+    cache.get("a", "body")
+    
+    cache.set("c", "body", b"c", ttl=60)
+    
+    assert cache.get("a", "body") == b"a"
+    assert cache.get("b", "body") is None
+    assert cache.get("c", "body") == b"c"
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.data_collectors.base import SourceError
+from app.data_collectors.scheduler import CollectorScheduler, load_targets
+from app.data_collectors.sources import YahooChartSource
+from app.data_collectors.writer import CollectorWriter
+from app.models.database_models import CompanyDB, HistoricalDataDB
+
+BARS = 5
+
+
+def chart_payload(bars: int = BARS, **overrides):
+    """Chart API response with `bars` daily bars ending yesterday."""
+    start = datetime.now(timezone.utc).replace(hour=14, minute=30, second=0, microsecond=0) - timedelta(days=bars)
+    quote = {
+        "open": [10.0] * bars,
+        "high": [11.0] * bars,
+        "low": [9.0] * bars,
+        "close": [10.5] * bars,
+        "volume": [1000] * bars,
+    }
+    quote.update(overrides)
+    return {"chart": {"result": [{
+        "timestamp": [int((start + timedelta(days=day)).timestamp()) for day in range(bars)],
+        "indicators": {"quote": [quote], "adjclose": [{"adjclose": [10.4] * bars}]},
+    }], "error": None}}
+
+
+# Responses per ticker, one per request; the last one repeats
+SCRIPTS = {
+    "OK": [200],
+    "THROTTLED": [429, 200],
+    "FLAKY": [500, 500, 200],
+    "DOWN": [500],
+    "UNKNOWN": [404],
+    "NOVOLUME": ["no-volume"],
+    "SHORT": ["short"],
+    "NEGATIVE": ["bad-value"],
+}
+
+
+class ChartStub(BaseHTTPRequestHandler):
+    requests: Counter = Counter()
+    
+    def log_message(self, *args):
+        pass
+    
+    def do_GET(self):
+        ticker = urlparse(self.path).path.rsplit("/", 1)[1]
+        script = SCRIPTS[ticker]
+        step = script[min(self.requests[ticker], len(script) - 1)]
+        self.requests[ticker] += 1
+        
+        if step == 429:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.05")
+            self.end_headers()
+            return
+        if isinstance(step, int) and step != 200:
+            self.send_response(step)
+            self.end_headers()
+            return
+        
+        payload = chart_payload()
+        quote = payload["chart"]["result"][0]["indicators"]["quote"][0]
+        if step == "no-volume":
+            del quote["volume"]
+        elif step == "short":
+            quote["close"] = quote["close"][:2]
+        elif step == "bad-value":
+            quote["volume"] = ["lots"] * BARS
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def chart_server():
+    ChartStub.requests = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChartStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def targets(db):
+    db.add_all([CompanyDB(name=f"{ticker} Inc", ticker=ticker) for ticker in SCRIPTS])
+    db.commit()
+    return load_targets(db)
+
+
+def test_scheduler_retries_throttling_and_isolates_bad_payloads(engine, db, chart_server, targets):
+    source = YahooChartSource(base_url=chart_server, rate_per_second=1000, burst=100, max_concurrency=4)
+    scheduler = CollectorScheduler(
+        [source], CollectorWriter(sessionmaker(bind=engine)), max_retries=3, backoff_base=0.01, flush_interval=0.1
+    )
+    
+    report = asyncio.run(scheduler.run(targets))
+    
+    assert report.fetched == 3
+    assert set(report.failed) == {"yahoo:DOWN", "yahoo:UNKNOWN", "yahoo:NOVOLUME", "yahoo:SHORT", "yahoo:NEGATIVE"}
+    assert "HTTP 500" in report.failed["yahoo:DOWN"]
+    assert "HTTP 404" in report.failed["yahoo:UNKNOWN"]
+    assert "volume" in report.failed["yahoo:NOVOLUME"]
+    
+    # 429 and 500 are retried (DOWN until max_retries), 404 and malformed payloads are not
+    assert ChartStub.requests["THROTTLED"] == 2
+    assert ChartStub.requests["FLAKY"] == 3
+    assert ChartStub.requests["DOWN"] == 4
+    assert ChartStub.requests["UNKNOWN"] == 1
+    assert ChartStub.requests["NOVOLUME"] == 1
+    assert report.retries == 1 + 2 + 3
+    
+    assert report.written.prices_inserted == 3 * BARS
+    assert report.written.companies_updated == 3
+    stored = dict(db.execute(
+        select(CompanyDB.ticker, func.count()).join(HistoricalDataDB).group_by(CompanyDB.ticker)
+    ).all())
+    assert stored == {"OK": BARS, "THROTTLED": BARS, "FLAKY": BARS}
+
+
+@pytest.mark.parametrize("payload", [
+    chart_payload(volume=None),
+    chart_payload(close=[10.5]),
+    chart_payload(low=["low"] * BARS),
+    {"chart": {"result": []}},
+    {"chart": "unavailable"},
+    [],
+])
+def test_parse_chart_raises_source_error_on_malformed_payload(payload):
+    with pytest.raises(SourceError):
+        YahooChartSource.parse_chart(1, payload)
+
+
+def test_parse_chart_skips_days_without_close():
+    bars = YahooChartSource.parse_chart(1, chart_payload(close=[10.5, None, 10.5, None, 10.5]))
+    
+    assert len(bars) == 3
+    assert [float(bar.close_price) for bar in bars] == [10.5] * 3
+    assert all(bar.volume == 1000 and float(bar.adjusted_close) == 10.4 for bar in bars)
+
@@ -0,0 +1,121 @@
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.company import Company
+from app.models.database_models import CompanyDB
+
+URL = "/api/v1/companies/"
+
+
+def test_bulk_create_conflicts_only_on_ticker(client):
+    client.post(URL, json={"name": "Co 0", "ticker": "OLD"})
+    
+    response = client.post(URL + "bulk", json=[
+        {"name": "Co 0", "ticker": "NEW"},
+        {"name": "Co 1", "ticker": "OLD"},
+        {"name": "Co 2", "ticker": "NEW"},
+        {"name": "Co 3", "ticker": "THIRD"},
+    ])
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created_count"] == 2
+    assert [(conflict["index"], conflict["ticker"]) for conflict in body["conflicts"]] == [(1, "OLD"), (2, "NEW")]
+    tickers = {company["ticker"]: company["name"] for company in client.get(URL, params={"limit": 10}).json()}
+    assert tickers == {"OLD": "Co 0", "NEW": "Co 0", "THIRD": "Co 3"}
+
+
+def test_bulk_create_matches_single_create(client):
+    client.post(URL, json={"name": "Co 0", "ticker": "OLD"})
+    
+    single = client.post(URL, json={"name": "Co 0", "ticker": "ONE"})
+    bulk = client.post(URL + "bulk", json=[{"name": "Co 0", "ticker": "TWO"}])
+    
+    assert single.status_code == 201
+    assert bulk.json()["created_count"] == 1
+
+
+def walk(client, url, limit, **params):
+    """Follow X-Next-Cursor until the last page; returns every page's rows."""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(url, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_cursor_pages_cover_every_company_once(client):
+    created = [client.post(URL, json={"name": f"Co {index}", "ticker": f"TK{index}"}).json()["id"] for index in range(5)]
+    
+    pages = walk(client, URL, limit=2)
+    
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [company["id"] for page in pages for company in page] == created
+
+
+def test_cursor_is_stable_while_rows_change(client):
+    created = [client.post(URL, json={"name": f"Co {index}", "ticker": f"TK{index}"}).json()["id"] for index in range(4)]
+    first = client.get(URL, params={"limit": 2})
+    
+    # A row of the page already read disappears and a new row arrives
+    client.delete(f"{URL}{created[0]}")
+    added = client.post(URL, json={"name": "Co 4", "ticker": "TK4"}).json()["id"]
+    rest = client.get(URL, params={"limit": 10, "cursor": first.headers["X-Next-Cursor"]})
+    
+    assert [company["id"] for company in rest.json()] == created[2:] + [added]
+
+
+def test_invalid_cursor_is_rejected(client):
+    # Not base64/JSON, and a well-formed token without an id
+    for cursor in ("not-a-cursor!", "eyJ4IjoxfQ"):
+        response = client.get(URL, params={"cursor": cursor})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+def test_batch_lookup_keeps_request_order(client):
+    ids = [client.post(URL, json={"name": f"Co {index}", "ticker": f"TK{index}"}).json()["id"] for index in range(4)]
+    
+    response = client.get(URL, params={"ids": f"{ids[2]},{ids[0]}", "tickers": "TK3, TK1"})
+    
+    assert response.status_code == 200
+    assert [company["id"] for company in response.json()] == [ids[2], ids[0], ids[3], ids[1]]
+    assert "X-Missing-Ids" not in response.headers
+    assert "X-Missing-Tickers" not in response.headers
+
+
+def test_batch_lookup_returns_each_company_once(client):
+    ids = [client.post(URL, json={"name": f"Co {index}", "ticker": f"TK{index}"}).json()["id"] for index in range(2)]
+    
+    # The same company asked for twice by ID and once more by ticker
+    response = client.get(URL, params={"ids": f"{ids[1]},{ids[0]},{ids[1]}", "tickers": "TK0,TK0"})
+    
+    assert [company["id"] for company in response.json()] == [ids[1], ids[0]]
+
+
+def test_batch_lookup_reports_missing_keys(client):
+    company_id = client.post(URL, json={"name": "Co 0", "ticker": "TK0"}).json()["id"]
+    
+    response = client.get(URL, params={"ids": f"9999,{company_id},9998,9999", "tickers": "NOPE,TK0,NOPE"})
+    
+    assert [company["id"] for company in response.json()] == [company_id]
+    assert response.headers["X-Missing-Ids"] == "9999,9998"
+    assert response.headers["X-Missing-Tickers"] == "NOPE"
+    assert client.get(URL, params={"ids": "1,x"}).status_code == 400
+
+
+def test_write_responses_match_response_model_json(client, db):
+    created = client.post(URL, json={"name": "Łódź Spółka", "ticker": "LDZ", "exchange": "GPW", "currency": "PLN"})
+    updated = client.put(f"{URL}{created.json()['id']}", json={"sector": "Energia"})
+    
+    assert created.status_code == 201
+    assert created.headers["content-type"] == "application/json"
+    assert updated.status_code == 200
+    # The bytes FastAPI produced when these routes returned the model through response_model
+    row = db.get(CompanyDB, created.json()["id"])
+    assert updated.content == JSONResponse(jsonable_encoder(Company.model_validate(row))).body
+    assert updated.json()["name"] == "Łódź Spółka" and updated.json()["sector"] == "Energia"
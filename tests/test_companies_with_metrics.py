@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.models.database_models import CompanyDB, FinancialMetricsDB
+
+URL = "/api/v1/companies/with-metrics"
+
+
+@contextmanager
+def count_statements(engine):
+    """Count the SQL statements executed on the engine inside the block."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def companies(db):
+    """Five companies with three annual and two quarterly periods each."""
+    companies = [CompanyDB(name=f"Company {index}", ticker=f"TK{index}") for index in range(5)]
+    db.add_all(companies)
+    db.flush()
+    for company in companies:
+        for year in (2021, 2022, 2023):
+            db.add(FinancialMetricsDB(
+                company_id=company.id,
+                period_type="annual",
+                period_end=datetime(year, 12, 31, tzinfo=timezone.utc),
+                pe_ratio=float(year - 2000)
+            ))
+        for month in (3, 6):
+            db.add(FinancialMetricsDB(
+                company_id=company.id,
+                period_type="quarterly",
+                period_end=datetime(2024, month, 30, tzinfo=timezone.utc)
+            ))
+    db.commit()
+    return companies
+
+
+def test_statement_count_does_not_grow_with_page_size(client, engine, companies):
+    counts = {}
+    for limit in (1, 2, 3, 5):
+        with count_statements(engine) as statements:
+            response = client.get(URL, params={"limit": limit})
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+        counts[limit] = len(statements)
+    
+    # One query for the page of companies, one windowed query for all their metrics
+    assert counts == {1: 2, 2: 2, 3: 2, 5: 2}
+
+
+def test_statement_count_with_period_filter(client, engine, companies):
+    counts = set()
+    for limit in (1, 3):
+        with count_statements(engine) as statements:
+            response = client.get(URL, params={"limit": limit, "period_type": "annual", "last_n": 2})
+        assert response.status_code == 200
+        counts.add(len(statements))
+    assert counts == {2}
+
+
+def test_embeds_last_n_periods_newest_first(client, companies):
+    response = client.get(URL, params={"limit": 2, "period_type": "annual", "last_n": 2})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert [company["ticker"] for company in body] == ["TK0", "TK1"]
+    for company in body:
+        periods = [metrics["period_end"][:4] for metrics in company["financial_metrics"]]
+        assert periods == ["2023", "2022"]
+        assert all(metrics["company_id"] == company["id"] for metrics in company["financial_metrics"])
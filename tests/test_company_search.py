@@ -0,0 +1,117 @@
+import pytest
+
+from app.services.company_search import (
+    EXACT_TICKER,
+    NAME_PREFIX,
+    SUBSTRING,
+    TICKER_PREFIX,
+    WORD_PREFIX,
+    CompanySearchIndex,
+    normalize,
+)
+
+URL = "/api/v1/companies/"
+
+COMPANIES = [
+    (1, "MSFT", "Microsoft Corporation", "NASDAQ"),
+    (2, "CDR", "CD PROJEKT", "GPW"),
+    (3, "ZAB", "Żabka Group", "GPW"),
+    (4, "LDZ", "Łódzkie Zakłady Chemiczne", "GPW"),
+    (5, "TFO", "Tfofnso Ftvih", "GPW"),
+    (6, "MIC", "Micron Technology", "NASDAQ"),
+    (7, "SOFT", "Softbank Group", "TSE"),
+]
+
+
+@pytest.fixture
+def index():
+    index = CompanySearchIndex()
+    index.rebuild(COMPANIES)
+    return index
+
+
+def tickers(hits):
+    return [hit.ticker for hit in hits]
+
+
+def test_normalize_folds_polish_diacritics_and_punctuation():
+    assert normalize("Łódź") == "lodz"
+    assert normalize("Zakłady Azotowe S.A.") == "zaklady azotowe s a"
+    assert normalize("ŻABKA  ść") == "zabka sc"
+
+
+def test_name_prefix_finds_company(index):
+    hits = index.search("micro")
+    
+    # Equal scores: the shorter name first
+    assert tickers(hits) == ["MIC", "MSFT"]
+    assert {hit.score for hit in hits} == {NAME_PREFIX}
+
+
+def test_ticker_finds_company_by_its_name(index):
+    hits = index.search("cdr")
+    
+    assert hits[0].name == "CD PROJEKT"
+    assert hits[0].score == EXACT_TICKER
+    assert index.search("cd proj")[0].ticker == "CDR"
+    assert index.search("cdproj")[0].ticker == "CDR"
+
+
+def test_diacritics_are_ignored_in_queries_and_names(index):
+    assert tickers(index.search("zabka")) == ["ZAB"]
+    assert tickers(index.search("Żabka")) == ["ZAB"]
+    assert tickers(index.search("lodzkie")) == ["LDZ"]
+    assert tickers(index.search("zaklady")) == ["LDZ"]
+
+
+def test_ranking_order(index):
+    hits = index.search("soft")
+    
+    # Each company once, at its best match: exact ticker above a match inside a name
+    assert [(hit.ticker, hit.score) for hit in hits] == [("SOFT", EXACT_TICKER), ("MSFT", SUBSTRING)]
+    assert [(hit.ticker, hit.score) for hit in index.search("group")] == [("ZAB", WORD_PREFIX), ("SOFT", WORD_PREFIX)]
+    assert index.search("mi")[0].score == TICKER_PREFIX
+
+
+def test_substring_does_not_span_words(index):
+    # "Tfofnso Ftvih" contains "so ft" but not the word fragment "soft"
+    assert "TFO" not in tickers(index.search("soft"))
+    assert "TFO" in tickers(index.search("nso ft"))
+
+
+def test_typos_match_by_trigram_similarity(index):
+    hits = index.search("mircosoft")
+    
+    assert hits[0].ticker == "MSFT"
+    assert hits[0].score < SUBSTRING
+
+
+def test_upsert_and_remove(index):
+    index.upsert(1, "MSFT", "Macrohard", "NASDAQ")
+    index.remove(2)
+    
+    assert "MSFT" not in tickers(index.search("microsoft"))
+    assert tickers(index.search("macro")) == ["MSFT"]
+    assert index.search("cdr") == []
+    assert len(index) == len(COMPANIES) - 1
+
+
+def test_search_endpoint_follows_company_writes(client):
+    created = client.post(URL, json={"name": "Microsoft Corporation", "ticker": "MSFT", "exchange": "NASDAQ"}).json()
+    
+    hits = client.get(URL + "search", params={"q": "micro"}).json()
+    assert [(hit["id"], hit["ticker"], hit["exchange"]) for hit in hits] == [(created["id"], "MSFT", "NASDAQ")]
+    
+    client.put(f"{URL}{created['id']}", json={"name": "Macrohard"})
+    assert client.get(URL + "search", params={"q": "micro"}).json() == []
+    assert client.get(URL + "search", params={"q": "macro"}).json()[0]["id"] == created["id"]
+    
+    client.delete(f"{URL}{created['id']}")
+    assert client.get(URL + "search", params={"q": "macro"}).json() == []
+
+
+def test_search_endpoint_limits_results(client):
+    client.post(URL + "bulk", json=[{"name": f"Alpha {number}", "ticker": f"ALP{number}"} for number in range(5)])
+    
+    assert len(client.get(URL + "search", params={"q": "alpha", "limit": 3}).json()) == 3
+    assert client.get(URL + "search", params={"q": ""}).status_code == 422
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.database_models import CompanyDB, FactorScoreDB, FinancialMetricsDB
+
+PERIOD_END = datetime(2023, 12, 31, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def companies(db):
+    """Three technology companies with pe_ratio 10, 20, 30 and one lone energy company."""
+    companies = [
+        CompanyDB(name="Tech A", ticker="TA", sector="Technology"),
+        CompanyDB(name="Tech B", ticker="TB", sector="Technology"),
+        CompanyDB(name="Tech C", ticker="TC", sector="Technology"),
+        CompanyDB(name="Energy A", ticker="EA", sector="Energy"),
+    ]
+    db.add_all(companies)
+    db.flush()
+    for company, pe_ratio in zip(companies, (10.0, 20.0, 30.0, 5.0)):
+        db.add(FinancialMetricsDB(company_id=company.id, period_type="annual", period_end=PERIOD_END, pe_ratio=pe_ratio))
+    db.commit()
+    return companies
+
+
+def test_ranks_and_zscores_within_sector(client, companies):
+    recompute = client.post("/api/v1/factors/recompute")
+    assert recompute.status_code == 200
+    
+    response = client.get("/api/v1/factors", params={"period_end": "2023-12-31", "metrics": "pe_ratio"})
+    
+    assert response.status_code == 200
+    scores = {item["ticker"]: item["factors"]["pe_ratio"] for item in response.json()}
+    assert [scores[ticker]["percentile"] for ticker in ("TA", "TB", "TC")] == pytest.approx([1 / 3, 2 / 3, 1.0])
+    # Sector mean 20, sample standard deviation 10
+    assert [scores[ticker]["zscore"] for ticker in ("TA", "TB", "TC")] == pytest.approx([-1.0, 0.0, 1.0])
+    assert scores["TA"]["peers"] == 3
+    # A sector of one has a rank but no spread
+    assert scores["EA"] == {"percentile": 1.0, "zscore": None, "peers": 1}
+
+
+def test_company_factors_and_unknown_metric(client, companies):
+    client.post("/api/v1/factors/recompute")
+    
+    response = client.get(f"/api/v1/companies/{companies[2].id}/factors", params={"metrics": "pe_ratio"})
+    unknown = client.get("/api/v1/factors", params={"period_end": "2023-12-31", "metrics": "revenue"})
+    
+    assert response.status_code == 200
+    assert response.json()[0]["factors"]["pe_ratio"]["percentile"] == 1.0
+    assert unknown.status_code == 400
+
+
+def test_deleting_company_deletes_its_scores(client, db, companies):
+    client.post("/api/v1/factors/recompute")
+    
+    assert client.delete(f"/api/v1/companies/{companies[0].id}").status_code == 204
+    
+    remaining = db.scalars(select(FactorScoreDB.company_id).distinct()).all()
+    assert companies[0].id not in remaining
+    assert db.scalar(select(func.count()).select_from(FactorScoreDB)) > 0
@@ -0,0 +1,171 @@
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.database_models import FinancialMetricsDB
+from app.models.financial_metrics import FinancialMetrics
+
+URL = "/api/v1/financial-metrics/"
+
+
+def metrics(company_id, year, **values):
+    return {"company_id": company_id, "period_type": "annual", "period_end": f"{year}-12-31T00:00:00Z", **values}
+
+
+@pytest.fixture
+def company(client):
+    return client.post("/api/v1/companies/", json={"name": "Company A", "ticker": "AAA"}).json()
+
+
+def test_bulk_upsert_counts_inserted_updated_and_unchanged(client, company):
+    first = client.post(URL + "bulk-upsert", json=[
+        metrics(company["id"], 2021, pe_ratio=10.0),
+        metrics(company["id"], 2022, pe_ratio=11.0),
+    ])
+    second = client.post(URL + "bulk-upsert", json=[
+        metrics(company["id"], 2021, pe_ratio=10.0),
+        metrics(company["id"], 2022, pe_ratio=12.0),
+        metrics(company["id"], 2023, pe_ratio=13.0),
+    ])
+    
+    assert first.json() == {"inserted": 2, "updated": 0, "unchanged": 0, "missing_company_ids": []}
+    assert second.json() == {"inserted": 1, "updated": 1, "unchanged": 1, "missing_company_ids": []}
+    stored = {row["period_end"][:4]: row["pe_ratio"] for row in client.get(f"{URL}company/{company['id']}").json()}
+    assert stored == {"2021": "10.0", "2022": "12.0", "2023": "13.0"}
+
+
+def test_bulk_upsert_last_row_of_a_key_wins(client, company):
+    response = client.post(URL + "bulk-upsert", json=[
+        metrics(company["id"], 2023, pe_ratio=10.0),
+        metrics(company["id"], 2023, pe_ratio=20.0),
+    ])
+    
+    assert response.json()["inserted"] == 1
+    assert client.get(f"{URL}company/{company['id']}").json()[0]["pe_ratio"] == "20.0"
+
+
+def test_bulk_upsert_skips_unknown_companies(client, company):
+    response = client.post(URL + "bulk-upsert", json=[
+        metrics(company["id"], 2023, pe_ratio=10.0),
+        metrics(9999, 2023, pe_ratio=10.0),
+        metrics(9998, 2023, pe_ratio=10.0),
+    ])
+    
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 1, "updated": 0, "unchanged": 0, "missing_company_ids": [9998, 9999]}
+
+
+def test_company_metrics_cursor_walks_newest_first(client, company):
+    # Two rows share 2023-12-31 (annual and quarterly); the cursor breaks the tie on id
+    client.post(URL + "bulk-upsert", json=[
+        metrics(company["id"], 2021), metrics(company["id"], 2023), metrics(company["id"], 2022),
+        {**metrics(company["id"], 2023), "period_type": "quarterly"},
+    ])
+    
+    rows, cursor = [], None
+    while True:
+        response = client.get(f"{URL}company/{company['id']}", params={"limit": 1, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        rows += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    
+    assert [row["period_end"][:4] for row in rows] == ["2023", "2023", "2022", "2021"]
+    assert len({row["id"] for row in rows}) == 4
+
+
+def test_metrics_list_cursor_and_invalid_cursor(client, company):
+    client.post(URL + "bulk-upsert", json=[metrics(company["id"], year) for year in range(2019, 2024)])
+    
+    first = client.get(URL, params={"limit": 3})
+    second = client.get(URL, params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+    
+    ids = [row["id"] for row in first.json() + second.json()]
+    assert ids == sorted(ids) and len(set(ids)) == 5
+    assert "X-Next-Cursor" not in second.headers
+    assert client.get(URL, params={"cursor": "garbage!"}).status_code == 400
+    assert client.get(f"{URL}company/{company['id']}", params={"cursor": "garbage!"}).status_code == 400
+
+
+KEYS = {"id", "company_id", "period_end", "period_type"}
+
+
+@pytest.mark.parametrize("path", ["", "company/{company_id}", "latest"])
+def test_fields_projects_the_requested_columns(client, company, path):
+    client.post(URL + "bulk-upsert", json=[
+        metrics(company["id"], 2022, pe_ratio=10.0, roe=0.1, revenue=100.0),
+        metrics(company["id"], 2023, pe_ratio=11.0, roe=0.2, revenue=200.0),
+    ])
+    url = URL + path.format(company_id=company["id"])
+    
+    full = client.get(url).json()
+    projected = client.get(url, params={"fields": "pe_ratio, roe,pe_ratio"}).json()
+    
+    assert len(projected) == len(full) > 0
+    assert all(set(row) == KEYS | {"pe_ratio", "roe"} for row in projected)
+    # Projected values are encoded like the full model's
+    assert projected == [{key: row[key] for key in KEYS | {"pe_ratio", "roe"}} for row in full]
+
+
+@pytest.mark.parametrize("path", ["", "company/{company_id}", "latest"])
+def test_fields_rejects_unknown_names(client, company, path):
+    url = URL + path.format(company_id=company["id"])
+    
+    response = client.get(url, params={"fields": "pe_ratio,nope,created"})
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: nope, created"
+
+
+def test_company_metrics_cache_is_keyed_by_fields(client, company):
+    client.post(URL + "bulk-upsert", json=[metrics(company["id"], 2023, pe_ratio=10.0, roe=0.1)])
+    url = f"{URL}company/{company['id']}"
+    
+    assert "roe" in client.get(url).json()[0]
+    assert set(client.get(url, params={"fields": "pe_ratio"}).json()[0]) == KEYS | {"pe_ratio"}
+    assert "roe" in client.get(url).json()[0]
+
+
+def test_batch_returns_companies_in_request_order(client):
+    ids = [client.post("/api/v1/companies/", json={"name": f"Co {index}", "ticker": f"TK{index}"}).json()["id"] for index in range(3)]
+    client.post(URL + "bulk-upsert", json=[
+        metrics(company_id, year, pe_ratio=float(company_id * 10 + year % 10))
+        for company_id in ids for year in (2022, 2023)
+    ])
+    
+    response = client.post(URL + "batch", json={"company_ids": [ids[2], 9999, ids[0], ids[2], 9998, 9999]})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["company_id"] for item in body["items"]] == [ids[2], ids[0]]
+    assert body["missing_company_ids"] == [9999, 9998]
+    assert [row["period_end"][:4] for row in body["items"][0]["metrics"]] == ["2023", "2022"]
+    assert all(row["company_id"] == ids[0] for row in body["items"][1]["metrics"])
+
+
+def test_batch_latest_only(client):
+    ids = [client.post("/api/v1/companies/", json={"name": f"Co {index}", "ticker": f"TK{index}"}).json()["id"] for index in range(2)]
+    client.post(URL + "bulk-upsert", json=[
+        metrics(ids[0], 2022), metrics(ids[0], 2023), {**metrics(ids[0], 2024), "period_type": "quarterly"},
+    ])
+    
+    body = client.post(URL + "batch", json={"company_ids": [ids[1], ids[0]], "latest_only": True}).json()
+    
+    # A company without metrics is still listed, with no rows
+    assert [(item["company_id"], len(item["metrics"])) for item in body["items"]] == [(ids[1], 0), (ids[0], 1)]
+    assert body["items"][1]["metrics"][0]["period_end"][:4] == "2023"
+    assert body["missing_company_ids"] == []
+
+
+def test_write_responses_match_response_model_json(client, db, company):
+    created = client.post(URL, json=metrics(company["id"], 2023, revenue=1234.5, pe_ratio=12.25, roe=None))
+    updated = client.put(f"{URL}{created.json()['id']}", json={"pe_ratio": 13.5})
+    fetched = client.get(f"{URL}{created.json()['id']}")
+    
+    assert created.status_code == 201
+    assert created.headers["content-type"] == "application/json"
+    # The bytes FastAPI produced when these routes returned the model through response_model
+    row = db.get(FinancialMetricsDB, created.json()["id"])
+    assert updated.content == fetched.content == JSONResponse(jsonable_encoder(FinancialMetrics.model_validate(row))).body
+    assert updated.json()["pe_ratio"] == "13.5"
@@ -0,0 +1,149 @@
+import math
+
+import pandas as pd
+import pytest
+
+from app.services import financial_ratios
+from app.services.financial_ratios import derive_ratios
+
+URL = "/api/v1/financial-metrics/"
+
+
+def frame(*rows):
+    """Frame of financial_metrics rows: (company_id, period_type, period_end, revenue, net_income, assets, liabilities, equity)."""
+    return pd.DataFrame(
+        [
+            {
+                "id": index + 1, "company_id": company_id, "period_type": period_type,
+                "period_end": pd.Timestamp(period_end), "revenue": revenue, "net_income": net_income,
+                "total_assets": assets, "total_liabilities": liabilities, "total_equity": equity,
+            }
+            for index, (company_id, period_type, period_end, revenue, net_income, assets, liabilities, equity) in enumerate(rows)
+        ]
+    ).astype({"revenue": float, "net_income": float, "total_assets": float, "total_liabilities": float, "total_equity": float})
+
+
+def test_ratio_formulas():
+    derived = derive_ratios(frame((1, "annual", "2023-12-31", 1000, 150, 2000, 500, 1500)))
+    
+    row = derived.iloc[0]
+    assert row["roe"] == pytest.approx(10.0)
+    assert row["roa"] == pytest.approx(7.5)
+    assert row["net_margin"] == pytest.approx(15.0)
+    assert row["debt_to_equity"] == pytest.approx(500 / 1500)
+    assert row["debt_to_assets"] == pytest.approx(0.25)
+
+
+def test_zero_and_missing_denominators_give_nan():
+    derived = derive_ratios(frame(
+        (1, "annual", "2022-12-31", 0, 100, 0, 100, 0),
+        (1, "annual", "2023-12-31", 500, 100, None, 100, 200),
+    ))
+    
+    first, second = derived.iloc[0], derived.iloc[1]
+    for column in ("roe", "roa", "net_margin", "debt_to_equity", "debt_to_assets"):
+        assert math.isnan(first[column]), column
+    assert math.isnan(second["roa"]) and math.isnan(second["debt_to_assets"])
+    assert second["roe"] == pytest.approx(50.0)
+    # Growth from a zero base is undefined too
+    assert math.isnan(second["revenue_growth"])
+    assert second["net_income_growth"] == pytest.approx(0.0)
+
+
+def test_growth_matches_previous_year_within_tolerance():
+    derived = derive_ratios(frame(
+        (1, "annual", "2021-12-31", 1000, -50, 1, 1, 1),
+        # 52/53-week fiscal year: one day short of a full year, still matched
+        (1, "annual", "2022-12-30", 1200, 100, 1, 1, 1),
+        # Next period ends 25 days early: outside the tolerance, no growth
+        (1, "annual", "2023-12-05", 1500, 120, 1, 1, 1),
+    ))
+    
+    assert math.isnan(derived.iloc[0]["revenue_growth"])
+    assert derived.iloc[1]["revenue_growth"] == pytest.approx(20.0)
+    # A loss turning into a profit is growth, measured against the absolute base
+    assert derived.iloc[1]["net_income_growth"] == pytest.approx(300.0)
+    assert math.isnan(derived.iloc[2]["revenue_growth"])
+
+
+def test_growth_compares_same_quarter_same_company_and_period_type():
+    derived = derive_ratios(frame(
+        (1, "quarterly", "2022-03-31", 100, 10, 1, 1, 1),
+        (1, "quarterly", "2022-06-30", 400, 10, 1, 1, 1),
+        (1, "annual", "2022-03-31", 900, 10, 1, 1, 1),
+        (2, "quarterly", "2022-03-31", 50, 10, 1, 1, 1),
+        (1, "quarterly", "2023-03-31", 150, 10, 1, 1, 1),
+        (2, "quarterly", "2023-03-31", 100, 10, 1, 1, 1),
+    ))
+    
+    assert derived.iloc[4]["revenue_growth"] == pytest.approx(50.0)
+    assert derived.iloc[5]["revenue_growth"] == pytest.approx(100.0)
+
+
+def create(client, company_id, year, **values):
+    response = client.post(URL, json={
+        "company_id": company_id, "period_type": "annual", "period_end": f"{year}-12-31T00:00:00Z", **values
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def companies(client):
+    return [
+        client.post("/api/v1/companies/", json={"name": f"Company {ticker}", "ticker": ticker}).json()["id"]
+        for ticker in ("AAA", "BBB")
+    ]
+
+
+def test_recompute_endpoint_updates_changed_rows_only(client, companies):
+    company_id = companies[0]
+    create(client, company_id, 2022, revenue=1000, net_income=100, total_assets=2000, total_liabilities=1000, total_equity=1000)
+    create(client, company_id, 2023, revenue=1100, net_income=110, total_assets=2000, total_liabilities=1000, total_equity=1000)
+    
+    first = client.post(URL + "recompute-ratios")
+    second = client.post(URL + "recompute-ratios")
+    
+    assert first.status_code == 200
+    assert first.json() == {"scanned": 2, "updated": 2}
+    assert second.json() == {"scanned": 2, "updated": 0}
+    latest = client.get(f"{URL}company/{company_id}").json()[0]
+    assert float(latest["roe"]) == pytest.approx(11.0)
+    assert float(latest["debt_to_equity"]) == pytest.approx(1.0)
+    assert float(latest["revenue_growth"]) == pytest.approx(10.0)
+
+
+def test_recompute_keeps_stored_value_when_ratio_cannot_be_derived(client, companies):
+    company_id = companies[0]
+    created = create(client, company_id, 2023, revenue=0, net_income=50, total_assets=1000, total_equity=0, roe=12.5, net_margin=4.0)
+    
+    assert client.post(URL + "recompute-ratios").json() == {"scanned": 1, "updated": 1}
+    
+    row = client.get(f"{URL}{created['id']}").json()
+    assert float(row["roe"]) == 12.5
+    assert float(row["net_margin"]) == 4.0
+    assert float(row["roa"]) == pytest.approx(5.0)
+
+
+def test_recompute_is_limited_to_requested_companies(client, companies):
+    for company_id in companies:
+        create(client, company_id, 2023, net_income=10, total_equity=100)
+    
+    response = client.post(URL + "recompute-ratios", params={"company_id": companies[1]})
+    
+    assert response.json() == {"scanned": 1, "updated": 1}
+    assert client.get(f"{URL}company/{companies[0]}").json()[0]["roe"] is None
+
+
+@pytest.mark.parametrize("error, status_code", [
+    (ValueError("Ratio recompute failed due to constraint violation"), 409),
+    (RuntimeError("connection lost"), 500),
+])
+def test_recompute_endpoint_errors(client, monkeypatch, error, status_code):
+    def fail(self, company_ids=None):
+        raise error
+    monkeypatch.setattr(financial_ratios.FinancialRatioService, "recompute", fail)
+    
+    response = client.post(URL + "recompute-ratios")
+    
+    assert response.status_code == status_code
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from app.services import fulltext_search
+from app.services.fulltext_search import FulltextIndexer, LocalFulltextIndex
+
+DOCUMENTS = [
+    {"id": 1, "ticker": "SOLR", "name": "Solar Power Corp", "description": "Builds solar farms", "sector": "Energy", "exchange": "NYSE"},
+    {"id": 2, "ticker": "GRID", "name": "Grid Utilities", "description": "Buys power from solar farms and wind farms", "sector": "Utilities", "exchange": "NYSE"},
+    {"id": 3, "ticker": "WIND", "name": "Windmill AG", "description": "Wind turbines and solar panels", "sector": "Energy", "exchange": "XETRA"},
+    {"id": 4, "ticker": "BANK", "name": "Zürich Bank", "description": "Retail banking", "sector": "Financials", "exchange": "SIX"},
+]
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.calls = []
+    
+    def bulk(self, upserts=(), deletes=()):
+        self.calls.append(([document["id"] for document in upserts], list(deletes)))
+
+
+@pytest.fixture
+def index():
+    index = LocalFulltextIndex()
+    index.rebuild(DOCUMENTS)
+    return index
+
+
+def test_name_matches_rank_above_description_matches(index):
+    result = index.search("solar")
+    
+    assert result.total == 3
+    assert [hit.ticker for hit in result.hits][0] == "SOLR"
+    assert result.hits[0].score > result.hits[1].score
+
+
+def test_every_word_must_match_and_plurals_fold(index):
+    assert [hit.id for hit in index.search("wind farm").hits] == [2]
+    assert index.search("zurich banks").hits[0].ticker == "BANK"
+    assert index.search("the and").total == 0
+
+
+def test_facets_and_filters(index):
+    result = index.search("solar")
+    energy = index.search("solar", sector="energy")
+    nyse = index.search("solar", exchange="NYSE", limit=1, offset=1)
+    
+    assert result.facets == {"sector": {"Energy": 2, "Utilities": 1}, "exchange": {"NYSE": 2, "XETRA": 1}}
+    assert sorted(hit.id for hit in energy.hits) == [1, 3]
+    assert energy.facets["sector"] == {"Energy": 2}
+    assert nyse.total == 2
+    assert [hit.id for hit in nyse.hits] == [2]
+
+
+def test_bulk_replaces_and_removes_documents(index):
+    index.bulk([{**DOCUMENTS[0], "description": "Makes batteries"}], deletes=[3])
+    
+    assert len(index) == 3
+    assert [hit.id for hit in index.search("farms").hits] == [2]
+    assert [hit.id for hit in index.search("batteries").hits] == [1]
+    assert index.search("turbines").total == 0
+
+
+def test_indexer_writes_at_once_without_event_loop():
+    backend = RecordingBackend()
+    
+    FulltextIndexer(backend).submit(DOCUMENTS[:2], deletes=[4])
+    
+    assert backend.calls == [([1, 2], [4])]
+
+
+def test_indexer_coalesces_a_batch_last_write_wins():
+    backend = RecordingBackend()
+    indexer = FulltextIndexer(backend)
+    
+    async def run():
+        await indexer.start()
+        indexer.submit([DOCUMENTS[0], DOCUMENTS[1]])
+        indexer.submit(deletes=[1])
+        indexer.submit([DOCUMENTS[2]], deletes=[2])
+        await indexer.stop()
+    
+    asyncio.run(run())
+    
+    assert backend.calls == [([3], [1, 2])]
+
+
+def test_indexer_flushes_every_flush_size_documents(monkeypatch):
+    monkeypatch.setattr(fulltext_search, "FLUSH_SIZE", 2)
+    backend = RecordingBackend()
+    indexer = FulltextIndexer(backend)
+    
+    async def run():
+        await indexer.start()
+        indexer.submit(DOCUMENTS + [{**DOCUMENTS[0], "id": 5}])
+        await indexer.stop()
+    
+    asyncio.run(run())
+    
+    assert backend.calls == [([1, 2], []), ([3, 4], []), ([5], [])]
+
+
+def test_endpoint_searches_companies_written_through_the_api(client):
+    client.post("/api/v1/companies/", json={"name": "Solar Power Corp", "ticker": "SOLR", "description": "Solar farms", "sector": "Energy"})
+    client.post("/api/v1/companies/", json={"name": "Grid Utilities", "ticker": "GRID", "description": "Solar power resale", "sector": "Utilities"})
+    
+    response = client.get("/api/v1/companies/fulltext", params={"q": "solar", "sector": "Utilities"})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert body["hits"][0]["ticker"] == "GRID"
+    assert body["facets"]["sector"] == {"Utilities": 1}
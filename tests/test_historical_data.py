@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.database_models import HistoricalDataDB, IndicatorStateDB
+
+
+def bar(day, hour=0, close=10.0):
+    return {
+        "date": datetime(2024, 1, day, hour, tzinfo=timezone.utc).isoformat(),
+        "open_price": close, "high_price": close, "low_price": close, "close_price": close, "volume": 100
+    }
+
+
+@pytest.fixture
+def company(client):
+    response = client.post("/api/v1/companies/", json={"name": "Company A", "ticker": "AAA"})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_append_skips_stored_dates(client, company):
+    url = f"/api/v1/companies/{company['id']}/prices"
+    
+    first = client.post(url, json=[bar(2), bar(3)])
+    second = client.post(url, json=[bar(3), bar(4)])
+    
+    assert first.json() == {"inserted": 2, "skipped": 0}
+    assert second.json() == {"inserted": 1, "skipped": 1}
+
+
+def test_range_accepts_dates_and_covers_whole_days(client, company):
+    url = f"/api/v1/companies/{company['id']}/prices"
+    client.post(url, json=[bar(2), bar(3, hour=21), bar(4), bar(5)])
+    
+    response = client.get(url, params={"start": "2024-01-03", "end": "2024-01-04"})
+    
+    assert response.status_code == 200
+    assert [row["date"][:10] for row in response.json()] == ["2024-01-03", "2024-01-04"]
+
+
+def test_deleting_company_deletes_its_prices_and_indicator_state(client, db, company):
+    client.post(f"/api/v1/companies/{company['id']}/prices", json=[bar(day) for day in range(2, 7)])
+    db.add(IndicatorStateDB(
+        company_id=company["id"], last_date=datetime(2024, 1, 6, tzinfo=timezone.utc), bars_seen=5,
+        last_close=10.0, ema_fast=10.0, ema_slow=10.0, macd_signal=0.0
+    ))
+    db.commit()
+    
+    assert client.delete(f"/api/v1/companies/{company['id']}").status_code == 204
+    
+    assert db.scalar(select(func.count()).select_from(HistoricalDataDB)) == 0
+    assert db.scalar(select(func.count()).select_from(IndicatorStateDB)) == 0
+    # The next company may reuse the rowid and must start without history
+    replacement = client.post("/api/v1/companies/", json={"name": "Company B", "ticker": "BBB"}).json()
+    assert client.get(f"/api/v1/companies/{replacement['id']}/prices").json() == []
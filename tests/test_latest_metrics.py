@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.models.database_models import FinancialMetricsDB, LatestFinancialMetricsDB
+
+URL = "/api/v1/financial-metrics/"
+
+
+def metrics(company_id, year, period_type="annual", **values):
+    return {"company_id": company_id, "period_type": period_type, "period_end": f"{year}-12-31T00:00:00Z", **values}
+
+
+def snapshot(db):
+    """(company_id, period_type) -> year of the period the snapshot points at, checked against its metrics row."""
+    db.expire_all()
+    result = {}
+    for row in db.scalars(select(LatestFinancialMetricsDB)):
+        assert row.metrics.period_end == row.period_end
+        result[(row.company_id, row.period_type)] = row.period_end.year
+    return result
+
+
+@pytest.fixture
+def companies(client):
+    return [
+        client.post("/api/v1/companies/", json={"name": f"Company {index}", "ticker": f"TK{index}"}).json()["id"]
+        for index in range(2)
+    ]
+
+
+def test_create_keeps_the_newest_period(client, db, companies):
+    first, second = companies
+    client.post(URL, json=metrics(first, 2022))
+    client.post(URL, json=metrics(first, 2023))
+    client.post(URL, json=metrics(first, 2021))
+    client.post(URL, json=metrics(first, 2020, period_type="quarterly"))
+    client.post(URL, json=metrics(second, 2019))
+    
+    assert snapshot(db) == {(first, "annual"): 2023, (first, "quarterly"): 2020, (second, "annual"): 2019}
+
+
+def test_delete_falls_back_to_the_previous_period(client, db, companies):
+    first, _ = companies
+    client.post(URL, json=metrics(first, 2022))
+    latest = client.post(URL, json=metrics(first, 2023)).json()
+    
+    client.delete(f"{URL}{latest['id']}")
+    assert snapshot(db) == {(first, "annual"): 2022}
+    
+    remaining = client.get(f"{URL}company/{first}").json()[0]
+    client.delete(f"{URL}{remaining['id']}")
+    assert snapshot(db) == {}
+
+
+def test_bulk_upsert_moves_the_snapshot_and_updates_show_through(client, db, companies):
+    first, second = companies
+    client.post(URL + "bulk-upsert", json=[metrics(first, 2022, pe_ratio=10.0), metrics(second, 2022, pe_ratio=10.0)])
+    client.post(URL + "bulk-upsert", json=[metrics(first, 2023, pe_ratio=11.0), metrics(second, 2022, pe_ratio=12.0)])
+    
+    assert snapshot(db) == {(first, "annual"): 2023, (second, "annual"): 2022}
+    latest = {row["company_id"]: row["pe_ratio"] for row in client.get(URL + "latest").json()}
+    assert latest == {first: "11.0", second: "12.0"}
+
+
+def test_company_delete_removes_its_snapshot_rows(client, db, companies):
+    first, second = companies
+    client.post(URL + "bulk-upsert", json=[metrics(first, 2023), metrics(second, 2023)])
+    
+    client.delete(f"/api/v1/companies/{first}")
+    
+    assert snapshot(db) == {(second, "annual"): 2023}
+
+
+def test_rebuild_matches_incremental_maintenance(client, db, companies):
+    first, second = companies
+    client.post(URL + "bulk-upsert", json=[
+        metrics(first, 2021), metrics(first, 2023), metrics(first, 2022, period_type="quarterly"), metrics(second, 2020)
+    ])
+    maintained = snapshot(db)
+    # Rows written behind the repository's back are picked up by a rebuild
+    db.add(FinancialMetricsDB(company_id=second, period_type="annual", period_end=datetime(2024, 12, 31, tzinfo=timezone.utc)))
+    db.execute(delete(LatestFinancialMetricsDB))
+    db.commit()
+    
+    response = client.post(URL + "latest/rebuild")
+    
+    assert response.json() == {"rows": 3}
+    assert snapshot(db) == {**maintained, (second, "annual"): 2024}
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import DateTime, Float, Integer, String
+
+from app.services.metrics_export import iter_csv, iter_ndjson, iter_parquet
+
+URL = "/api/v1/financial-metrics/export"
+
+
+@pytest.fixture
+def companies(client):
+    ids = []
+    for ticker in ("AAA", "BBB"):
+        company_id = client.post("/api/v1/companies/", json={"name": f"Company {ticker}", "ticker": ticker}).json()["id"]
+        ids.append(company_id)
+        rows = [
+            {"company_id": company_id, "period_type": period_type, "period_end": f"{year}-{month}T00:00:00Z", "revenue": float(year), "roe": None}
+            for year in (2022, 2023)
+            for period_type, month in (("annual", "12-31"), ("quarterly", "06-30"))
+        ]
+        assert client.post("/api/v1/financial-metrics/bulk-upsert", json=rows).status_code == 200
+    return ids
+
+
+def test_ndjson_export(client, companies):
+    response = client.get(URL)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="financial_metrics.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 8
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert rows[0]["company_id"] == companies[0]
+    assert rows[0]["period_end"].startswith("2022-12-31T00:00:00")
+    assert rows[0]["revenue"] == 2022.0
+    assert rows[0]["roe"] is None
+
+
+def test_csv_export(client, companies):
+    response = client.get(URL, params={"format": "csv", "fields": "revenue"})
+    
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "company_id", "period_end", "period_type", "revenue"]
+    assert len(rows) == 9
+    assert rows[1][3:] == ["annual", "2022.0"]
+
+
+def test_parquet_export(client, companies):
+    response = client.get(URL, params={"format": "parquet"})
+    
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 8
+    assert table.schema.field("id").type == pa.int64()
+    assert table.schema.field("revenue").type == pa.float64()
+    assert table.schema.field("period_end").type == pa.timestamp("us", tz="UTC")
+    # An all-NULL column keeps its declared type
+    assert table.schema.field("roe").type == pa.float64()
+    assert table.column("roe").null_count == 8
+
+
+def test_export_filters(client, companies):
+    params = {
+        "company_id": companies[1], "period_type": "annual",
+        "start": "2023-01-01T00:00:00Z", "end": "2023-12-31T00:00:00Z", "fields": "revenue"
+    }
+    
+    rows = [json.loads(line) for line in client.get(URL, params=params).text.splitlines()]
+    
+    assert len(rows) == 1
+    assert set(rows[0]) == {"id", "company_id", "period_end", "period_type", "revenue"}
+    assert (rows[0]["company_id"], rows[0]["period_type"], rows[0]["revenue"]) == (companies[1], "annual", 2023.0)
+
+
+def test_export_rejects_unknown_fields(client, companies):
+    response = client.get(URL, params={"fields": "revenue,nope"})
+    
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("format", ["ndjson", "csv", "parquet"])
+def test_empty_export(client, format):
+    response = client.get(URL, params={"format": format, "fields": "revenue"})
+    
+    assert response.status_code == 200
+    if format == "ndjson":
+        assert response.content == b""
+    elif format == "csv":
+        assert response.text == "id,company_id,period_end,period_type,revenue\n"
+    else:
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 0
+        assert table.column_names == ["id", "company_id", "period_end", "period_type", "revenue"]
+
+
+def test_writers_emit_one_chunk_per_batch():
+    columns = ["id", "name", "value"]
+    batches = [[(1, "a", 1.5), (2, "b", None)], [(3, "c", 2.5)]]
+    
+    assert len(list(iter_ndjson(columns, batches))) == 2
+    csv_chunks = list(iter_csv(columns, batches))
+    assert len(csv_chunks) == 2
+    assert b"".join(csv_chunks).decode().count("id,name,value") == 1
+    
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(iter_parquet(columns, [Integer(), String(), Float()], batches))))
+    assert parquet.metadata.num_row_groups == 2
+    assert parquet.read().to_pylist()[1] == {"id": 2, "name": "b", "value": None}
+    
+    naive = pq.read_table(io.BytesIO(b"".join(iter_parquet(["at"], [DateTime()], []))))
+    assert naive.schema.field("at").type == pa.timestamp("us")
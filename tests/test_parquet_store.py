@@ -0,0 +1,132 @@
+import os
+from datetime import datetime, timezone
+
+import pyarrow.dataset as ds
+import pytest
+
+from app.models.database_models import CompanyDB, FinancialMetricsDB, HistoricalDataDB
+from app.services.parquet_store import METRICS_DATASET, PRICES_DATASET, ParquetSnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ParquetSnapshotStore(str(tmp_path / "store"))
+
+
+@pytest.fixture
+def companies(db):
+    companies = [
+        CompanyDB(name="Company A", ticker="AAA", exchange="NASDAQ"),
+        CompanyDB(name="Company B", ticker="BBB", exchange="NYSE"),
+        CompanyDB(name="Company C", ticker="CCC"),
+    ]
+    db.add_all(companies)
+    db.commit()
+    for index, company in enumerate(companies):
+        for year in (2022, 2023):
+            db.add(FinancialMetricsDB(
+                company_id=company.id, period_type="annual", period_end=datetime(year, 12, 31, tzinfo=timezone.utc),
+                revenue=float(year), pe_ratio=10.0 * (index + 1) + year - 2022
+            ))
+            db.add(FinancialMetricsDB(
+                company_id=company.id, period_type="quarterly", period_end=datetime(year, 6, 30, tzinfo=timezone.utc),
+                revenue=year / 4
+            ))
+            db.add(HistoricalDataDB(
+                company_id=company.id, date=datetime(year, 1, 2, tzinfo=timezone.utc), open_price=1.0,
+                high_price=1.0, low_price=1.0, close_price=float(index + year), volume=100
+            ))
+    db.commit()
+    return companies
+
+
+def test_export_round_trip(db, store, companies):
+    assert store.export_metrics(db) == 12
+    assert store.export_prices(db) == 6
+    
+    metrics = store.read_metrics()
+    assert len(metrics) == 12
+    assert set(metrics["ticker"]) == {"AAA", "BBB", "CCC"}
+    # Companies without an exchange land in the UNKNOWN partition
+    assert set(metrics["exchange"]) == {"NASDAQ", "NYSE", "UNKNOWN"}
+    assert set(metrics["year"]) == {2022, 2023}
+    row = metrics[(metrics["ticker"] == "BBB") & (metrics["period_type"] == "annual") & (metrics["year"] == 2023)]
+    assert row["revenue"].tolist() == [2023.0]
+    assert row["pe_ratio"].tolist() == [21.0]
+    
+    prices = store.read_prices(["ticker", "date", "close_price"])
+    assert list(prices.columns) == ["ticker", "date", "close_price"]
+    assert sorted(prices["close_price"]) == [2022.0, 2023.0, 2023.0, 2024.0, 2024.0, 2025.0]
+
+
+def test_partition_pruning(db, store, companies):
+    store.export_metrics(db)
+    
+    nasdaq = store.read_metrics(["ticker", "year"], exchanges=["NASDAQ"])
+    assert set(nasdaq["ticker"]) == {"AAA"}
+    assert len(nasdaq) == 4
+    
+    recent = store.read_metrics(["ticker", "year"], exchanges=["NYSE", "UNKNOWN"], years=[2023])
+    assert sorted(recent["ticker"]) == ["BBB", "BBB", "CCC", "CCC"]
+    assert set(recent["year"]) == {2023}
+    
+    # Only the files of the matching partitions are scanned
+    dataset = store.dataset(METRICS_DATASET)
+    fragments = list(dataset.get_fragments(filter=(ds.field("exchange") == "NASDAQ") & (ds.field("year") == 2022)))
+    assert len(fragments) == 1
+    assert "exchange=NASDAQ" in fragments[0].path and "year=2022" in fragments[0].path
+
+
+def test_metrics_timeseries(db, store, companies):
+    store.export_metrics(db)
+    
+    frame = store.metrics_timeseries("pe_ratio", years=[2023])
+    
+    assert list(frame.columns) == ["AAA", "BBB", "CCC"]
+    assert len(frame) == 1
+    assert frame.iloc[0].tolist() == [11.0, 21.0, 31.0]
+
+
+def test_empty_snapshot(db, store):
+    assert store.export_metrics(db) == 0
+    
+    metrics = store.read_metrics(["ticker", "revenue"])
+    assert len(metrics) == 0
+    assert list(metrics.columns) == ["ticker", "revenue"]
+    assert len(store.read_metrics(exchanges=["NASDAQ"], years=[2023])) == 0
+
+
+def test_missing_snapshot(store):
+    with pytest.raises(FileNotFoundError):
+        store.read_prices()
+
+
+def test_publish_keeps_current_and_previous_version(db, store, companies):
+    versions = []
+    for _ in range(3):
+        store.export_metrics(db)
+        link = store.root / METRICS_DATASET
+        assert link.is_symlink()
+        versions.append(os.readlink(link))
+    
+    assert len(set(versions)) == 3
+    remaining = sorted(path.name for path in store.root.glob(f".{METRICS_DATASET}.*"))
+    assert remaining == sorted(versions[1:])
+    assert len(store.read_metrics()) == 12
+    
+    # Exporting the other dataset leaves these versions alone
+    store.export_prices(db)
+    assert sorted(path.name for path in store.root.glob(f".{METRICS_DATASET}.*")) == remaining
+    assert (store.root / PRICES_DATASET).is_symlink()
+
+
+def test_publish_replaces_plain_directory(db, store, companies):
+    store.root.mkdir(parents=True)
+    (store.root / METRICS_DATASET).mkdir()
+    
+    store.export_metrics(db)
+    
+    assert (store.root / METRICS_DATASET).is_symlink()
+    # The old snapshot is kept as the previous version
+    assert (store.root / f".{METRICS_DATASET}.0").is_dir()
+    assert len(store.read_metrics()) == 12
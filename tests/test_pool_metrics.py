@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core import pool_metrics
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_pool
+
+COUNTERS = {"connects", "checkouts", "checkins", "invalidations", "timeouts", "wait_count", "wait_avg_ms", "wait_max_ms"}
+GAUGES = {"size", "checked_out", "checked_in", "overflow", "max_overflow", "timeout_s"}
+
+
+@pytest.fixture
+def pool_engine(tmp_path, monkeypatch):
+    """File SQLite engine on an instrumented QueuePool, registered as the only pool."""
+    monkeypatch.setattr(pool_metrics, "pool_stats", {})
+    monkeypatch.setattr(pool_metrics, "_pools", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=1)
+    instrument_pool("sync", engine.pool)
+    yield engine
+    engine.dispose()
+
+
+def query(engine, times=1):
+    for _ in range(times):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+
+def test_db_pool_endpoint_shape(client, pool_engine):
+    query(pool_engine, 3)
+    
+    response = client.get("/api/v1/metrics/db-pool")
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["pid"] == os.getpid()
+    status = body["pools"]["sync"]
+    assert set(status) == {"pool_class"} | GAUGES | COUNTERS
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert (status["size"], status["max_overflow"], status["checked_out"]) == (2, 1, 0)
+    assert (status["checkouts"], status["checkins"], status["wait_count"]) == (3, 3, 3)
+    # Connections are reused from the pool after the first checkout
+    assert status["connects"] == 1
+
+
+def test_counters_survive_engine_dispose(pool_engine):
+    query(pool_engine, 2)
+    old_pool = pool_engine.pool
+    
+    # dispose() replaces the pool through recreate()
+    pool_engine.dispose()
+    query(pool_engine)
+    
+    assert pool_engine.pool is not old_pool
+    assert pool_metrics._pools["sync"] is pool_engine.pool
+    status = pool_metrics.pool_status()["pools"]["sync"]
+    assert (status["checkouts"], status["checkins"], status["wait_count"]) == (3, 3, 3)
+    assert status["connects"] == 2
+
+
+def test_checkout_timeout_is_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(pool_metrics, "pool_stats", {})
+    monkeypatch.setattr(pool_metrics, "_pools", {})
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01
+    )
+    instrument_pool("sync", engine.pool)
+    
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    
+    status = pool_metrics.pool_status()["pools"]["sync"]
+    assert (status["timeouts"], status["wait_count"]) == (1, 2)
+    assert status["wait_max_ms"] >= 10
+    engine.dispose()
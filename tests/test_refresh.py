@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.data_collectors.planner import RefreshPlanner
+from app.models.database_models import CompanyDB, RefreshStateDB
+from app.repositories.refresh_repository import RefreshRepository
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def companies(db):
+    """
+    Price refresh state of six companies:
+    LATE tier 1 refreshed 5h ago (due after 4h), FRESH tier 1 refreshed 1h ago,
+    MID tier 2 refreshed 13h ago (due after 12h), NEW tier 3 never refreshed,
+    GONE inactive, FAIL tier 3 whose last attempt failed 5 minutes ago.
+    """
+    specs = {
+        "LATE": dict(tier=1, refreshed_at=NOW - timedelta(hours=5), cost_ms=600.0),
+        "FRESH": dict(tier=1, refreshed_at=NOW - timedelta(hours=1)),
+        "MID": dict(tier=2, refreshed_at=NOW - timedelta(hours=13), cost_ms=600.0),
+        "NEW": dict(tier=3),
+        "GONE": dict(tier=3),
+        "FAIL": dict(tier=3, attempted_at=NOW - timedelta(minutes=5), consecutive_failures=1),
+    }
+    companies = {ticker: CompanyDB(name=ticker, ticker=ticker, is_active=ticker != "GONE") for ticker in specs}
+    db.add_all(companies.values())
+    db.commit()
+    RefreshRepository(db).sync_companies("prices")
+    for ticker, values in specs.items():
+        state = db.get(RefreshStateDB, (companies[ticker].id, "prices"))
+        for name, value in values.items():
+            setattr(state, name, value)
+    db.commit()
+    return {ticker: company.id for ticker, company in companies.items()}
+
+
+def test_plan_picks_due_active_companies_most_urgent_first(db, companies):
+    plan = RefreshPlanner(db).plan("prices")
+    
+    assert [target.ticker for target in plan.targets] == ["LATE", "MID", "NEW"]
+    assert plan.estimated_cost_ms == 600.0 + 600.0 + 500.0
+    assert plan.deferred == 0
+
+
+def test_plan_defers_companies_over_budget(db, companies):
+    plan = RefreshPlanner(db).plan("prices", budget_seconds=1.0)
+    
+    assert [target.ticker for target in plan.targets] == ["LATE"]
+    assert plan.deferred == 2
+
+
+def test_record_marks_refreshes_and_failures(db, companies):
+    RefreshRepository(db).record("prices", {companies["LATE"]: 200.0, companies["NEW"]: 900.0}, failed_company_ids=[companies["NEW"]])
+    
+    db.expire_all()
+    late = db.get(RefreshStateDB, (companies["LATE"], "prices"))
+    new = db.get(RefreshStateDB, (companies["NEW"], "prices"))
+    assert late.consecutive_failures == 0 and late.refreshed_at is not None
+    # Moving average of the measured cost
+    assert late.cost_ms == pytest.approx(600.0 * 0.7 + 200.0 * 0.3)
+    assert (new.consecutive_failures, new.refreshed_at, new.cost_ms) == (1, None, 900.0)
+    assert [target.ticker for target in RefreshPlanner(db).plan("prices").targets] == ["MID"]
+
+
+def test_sync_adds_rows_for_new_companies_only(db, companies):
+    db.add(CompanyDB(name="LATER", ticker="LATER"))
+    db.commit()
+    
+    assert RefreshRepository(db).sync_companies("prices") == 1
+    assert len(db.scalars(select(RefreshStateDB).where(RefreshStateDB.data_type == "prices")).all()) == 7
+
+
+def test_status_reports_backlog_per_tier(client, companies):
+    response = client.get("/api/v1/refresh/status")
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["active_companies"] == 5
+    assert body["companies_without_data"] == 5
+    tiers = {(tier["data_type"], tier["tier"]): tier for tier in body["tiers"]}
+    assert set(tiers) == {("prices", 1), ("prices", 2), ("prices", 3)}
+    large, small = tiers[("prices", 1)], tiers[("prices", 3)]
+    assert (large["companies"], large["stale"], large["never_refreshed"], large["failing"]) == (2, 1, 0, 0)
+    assert large["max_lag_seconds"] == pytest.approx(5 * 3600, abs=60)
+    assert large["backlog_cost_seconds"] == 0.6
+    assert (small["companies"], small["stale"], small["never_refreshed"], small["failing"]) == (2, 2, 2, 1)
+    assert small["max_lag_seconds"] is None
@@ -0,0 +1,48 @@
+import pytest
+
+URL = "/api/v1/screener"
+
+
+@pytest.fixture
+def companies(client):
+    """Three companies whose latest annual pe_ratio is 10, 20 and 30."""
+    for index, pe_ratio in enumerate((10.0, 20.0, 30.0)):
+        company = client.post("/api/v1/companies/", json={
+            "name": f"Company {index}", "ticker": f"TK{index}", "sector": "Technology" if index else "Energy"
+        }).json()
+        response = client.post("/api/v1/financial-metrics/bulk-upsert", json=[
+            {"company_id": company["id"], "period_type": "annual", "period_end": "2022-12-31T00:00:00Z", "pe_ratio": 99.0},
+            {"company_id": company["id"], "period_type": "annual", "period_end": "2023-12-31T00:00:00Z", "pe_ratio": pe_ratio},
+        ])
+        assert response.status_code == 200
+
+
+def screen(client, *filters, **options):
+    return client.post(URL, json={"filters": list(filters), "fields": ["pe_ratio"], **options})
+
+
+def test_filters_latest_period(client, companies):
+    response = screen(client, {"field": "pe_ratio", "op": "lt", "value": 25}, {"field": "sector", "op": "eq", "value": "Technology"})
+    
+    assert response.status_code == 200
+    assert [(row["ticker"], row["metrics"]["pe_ratio"]) for row in response.json()] == [("TK1", "20.0")]
+
+
+def test_between_and_sort(client, companies):
+    response = screen(client, {"field": "pe_ratio", "op": "between", "value": [10, 30]}, sort=[{"field": "pe_ratio", "direction": "desc"}])
+    
+    assert [row["ticker"] for row in response.json()] == ["TK2", "TK1", "TK0"]
+
+
+@pytest.mark.parametrize("screen_filter", [
+    {"field": "pe_ratio", "op": "lt", "value": "abc"},
+    {"field": "pe_ratio", "op": "eq", "value": True},
+    {"field": "pe_ratio", "op": "in", "value": [10, "20"]},
+    {"field": "pe_ratio", "op": "between", "value": ["a", "z"]},
+    {"field": "sector", "op": "eq", "value": 5},
+    {"field": "unknown", "op": "eq", "value": 5},
+])
+def test_invalid_operands_are_rejected(client, companies, screen_filter):
+    response = screen(client, screen_filter)
+    
+    assert response.status_code == 400
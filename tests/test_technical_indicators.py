@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.models.database_models import CompanyDB, HistoricalDataDB, IndicatorStateDB
+from app.services.technical_indicators import TechnicalIndicatorService
+
+INDICATORS = ["sma_20", "sma_50", "sma_200", "rsi_14", "macd", "macd_signal", "macd_hist"]
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def company(db):
+    company = CompanyDB(name="Company A", ticker="AAA")
+    db.add(company)
+    db.commit()
+    return company
+
+
+def add_bars(db, company, days):
+    # Deterministic random walk, so every indicator sees gains and losses
+    closes = 100 + np.cumsum(np.random.default_rng(7).normal(0, 1, 400))
+    for day in days:
+        close = float(closes[day])
+        db.add(HistoricalDataDB(
+            company_id=company.id, date=START + timedelta(days=day), open_price=close, high_price=close,
+            low_price=close, close_price=close, volume=100
+        ))
+    db.commit()
+
+
+def indicator_values(db, company):
+    db.expire_all()
+    bars = db.scalars(
+        select(HistoricalDataDB).where(HistoricalDataDB.company_id == company.id).order_by(HistoricalDataDB.date)
+    ).all()
+    return np.array([[getattr(bar, name) for name in INDICATORS] for bar in bars], dtype=float)
+
+
+def assert_same_as_full_recompute(db, company):
+    incremental = indicator_values(db, company)
+    TechnicalIndicatorService(db).recompute([company.id], incremental=False)
+    full = indicator_values(db, company)
+    np.testing.assert_allclose(incremental, full, rtol=1e-9, equal_nan=True)
+
+
+def test_incremental_matches_full_recompute(db, company):
+    service = TechnicalIndicatorService(db)
+    add_bars(db, company, range(250))
+    assert service.recompute([company.id]) == 250
+    
+    add_bars(db, company, range(250, 300))
+    
+    assert service.recompute([company.id]) == 50
+    assert db.get(IndicatorStateDB, company.id).bars_seen == 300
+    values = indicator_values(db, company)
+    assert not np.isnan(values[-1]).any()
+    assert_same_as_full_recompute(db, company)
+
+
+def test_incremental_without_new_bars_updates_nothing(db, company):
+    service = TechnicalIndicatorService(db)
+    add_bars(db, company, range(60))
+    service.recompute([company.id])
+    
+    assert service.recompute([company.id]) == 0
+
+
+def test_backfilled_bar_triggers_full_recompute(db, company):
+    service = TechnicalIndicatorService(db)
+    add_bars(db, company, [day for day in range(250) if day != 100])
+    service.recompute([company.id])
+    
+    # A late import fills the gap before the saved state, plus one new bar
+    add_bars(db, company, [100, 250])
+    
+    assert service.recompute([company.id]) == 251
+    assert db.get(IndicatorStateDB, company.id).bars_seen == 251
+    values = indicator_values(db, company)
+    assert not np.isnan(values[100, INDICATORS.index("sma_20")])
+    assert_same_as_full_recompute(db, company)
+
+
+def test_short_history_leaves_long_indicators_empty(db, company):
+    add_bars(db, company, range(30))
+    
+    TechnicalIndicatorService(db).recompute([company.id])
+    
+    values = indicator_values(db, company)
+    assert np.isnan(values[:, INDICATORS.index("sma_50")]).all()
+    assert np.isnan(values[18, INDICATORS.index("sma_20")])
+    assert not np.isnan(values[19, INDICATORS.index("sma_20")])
+    assert np.isnan(values[13, INDICATORS.index("rsi_14")])
+    assert not np.isnan(values[14, INDICATORS.index("rsi_14")])
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.database_models import CompanyDB, FinancialMetricsDB, HistoricalDataDB
+
+URL = "/api/v1/timeseries/query"
+
+
+def utc(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def company(db):
+    company = CompanyDB(name="Company A", ticker="AAA")
+    db.add(company)
+    db.commit()
+    return company
+
+
+def add_metrics(db, company, period_type, period_ends, revenue=1000.0):
+    for period_end in period_ends:
+        db.add(FinancialMetricsDB(company_id=company.id, period_type=period_type, period_end=period_end, revenue=revenue))
+    db.commit()
+
+
+def add_prices(db, company, closes):
+    for day, close in closes.items():
+        db.add(HistoricalDataDB(
+            company_id=company.id, date=day, open_price=close, high_price=close,
+            low_price=close, close_price=close, volume=100
+        ))
+    db.commit()
+
+
+def test_ttm_requires_quarterly_metrics(client, db, company):
+    add_metrics(db, company, "annual", [utc(year, 12, 31) for year in range(2018, 2024)])
+    
+    response = client.post(URL, json={"tickers": ["AAA"], "fields": ["revenue"], "aggregation": "ttm"})
+    
+    assert response.status_code == 400
+    assert "quarterly" in response.json()["detail"]
+
+
+def test_ttm_sums_four_consecutive_quarters(client, db, company):
+    add_metrics(db, company, "quarterly", [utc(2023, 3, 31), utc(2023, 6, 30), utc(2023, 9, 30), utc(2023, 12, 31)], revenue=250.0)
+    
+    response = client.post(URL, json={
+        "tickers": ["AAA"], "fields": ["revenue"], "period_type": "quarterly", "aggregation": "ttm", "ffill": False
+    })
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["index"][-1] == "2023-12-31"
+    assert body["columns"]["revenue"]["AAA"] == [None, None, None, 1000.0]
+
+
+def test_ttm_is_missing_when_a_quarter_is_missing(client, db, company):
+    # Q2 2023 is missing: the four rows up to 2023-09-30 span fifteen months
+    add_metrics(db, company, "quarterly", [
+        utc(2022, 6, 30), utc(2022, 9, 30), utc(2022, 12, 31), utc(2023, 3, 31), utc(2023, 9, 30)
+    ], revenue=250.0)
+    
+    response = client.post(URL, json={
+        "tickers": ["AAA"], "fields": ["revenue"], "period_type": "quarterly", "aggregation": "ttm", "ffill": False
+    })
+    
+    assert response.status_code == 200
+    body = response.json()
+    values = dict(zip(body["index"], body["columns"]["revenue"]["AAA"]))
+    assert values["2023-03-31"] == 1000.0
+    assert values["2023-09-30"] is None
+
+
+def test_resample_weekly_last_and_forward_fill(client, db, company):
+    # Mon 2024-01-01 .. Fri 2024-01-05, nothing in the week of 2024-01-12, one bar on 2024-01-15
+    add_prices(db, company, {
+        utc(2024, 1, 1): 10.0, utc(2024, 1, 3): 11.0, utc(2024, 1, 5): 12.0, utc(2024, 1, 15): 13.0
+    })
+    query = {"tickers": ["AAA"], "fields": ["close_price"], "frequency": "weekly", "aggregation": "last"}
+    
+    filled = client.post(URL, json=query).json()
+    unfilled = client.post(URL, json={**query, "ffill": False}).json()
+    
+    assert filled["index"] == ["2024-01-05", "2024-01-12", "2024-01-19"]
+    assert filled["columns"]["close_price"]["AAA"] == [12.0, 12.0, 13.0]
+    assert unfilled["columns"]["close_price"]["AAA"] == [12.0, None, 13.0]
+
+
+def test_unknown_tickers_are_reported(client, db, company):
+    add_prices(db, company, {utc(2024, 1, 2): 10.0})
+    
+    response = client.post(URL, json={"tickers": ["AAA", "ZZZ"], "fields": ["close_price"]})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["columns"]["close_price"]) == ["AAA"]
+    assert body["missing_tickers"] == ["ZZZ"]